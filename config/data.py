@@ -105,3 +105,4 @@ BAR_METRICS_DISKS = _get_config_var("bar_metrics_disks")
 METRICS_VISIBLE = _get_config_var("metrics_visible")
 METRICS_SMALL_VISIBLE = _get_config_var("metrics_small_visible")
 SELECTED_MONITORS = _get_config_var("selected_monitors")
+OVERVIEW_WINDOW_PREVIEWS = _get_config_var("overview_window_previews")
@@ -106,6 +106,10 @@ DEFAULTS = {
     "selected_monitors": [],
     # Startup behavior
     "caffeine_on_start": False,
+    # Serve metrics over a local UNIX socket ($XDG_RUNTIME_DIR/yz-shell/metrics.sock)
+    "metrics_exporter": False,
+    # Live window thumbnails in the overview, captured through Hyprland's toplevel export
+    "overview_window_previews": True,
     # Calendar
     "calendar_start_monday": False,
 }
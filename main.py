@@ -49,6 +49,17 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"Failed to auto-start yz-inhibit: {e}")
 
+    # Serve the bar's already collected metrics for Prometheus or scripts
+    if config.get("metrics_exporter", False):
+        from modules.metrics import shared_provider
+        from services.metrics_exporter import MetricsExporter
+
+        metrics_exporter = MetricsExporter(
+            shared_provider.snapshot,
+            os.path.join(GLib.get_user_runtime_dir(), APP_NAME, "metrics.sock"),
+        )
+        metrics_exporter.start()
+
     # Initialize multi-monitor services
     try:
         from utils.monitor_manager import get_monitor_manager
@@ -4,7 +4,6 @@ import subprocess
 import sys
 import tempfile
 
-from fabric.utils import idle_add, remove_handler
 from fabric.utils.helpers import get_relative_path
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
@@ -15,6 +14,7 @@ from fabric.widgets.scrolledwindow import ScrolledWindow
 from gi.repository import Gdk, GdkPixbuf, GLib
 
 import modules.icons as icons
+from widgets.virtual_list import VirtualList
 
 
 class ClipHistory(Box):
@@ -31,12 +31,10 @@ class ClipHistory(Box):
         
         self.notch = kwargs["notch"]
         self.selected_index = -1
-        self._arranger_handler = 0
         self.clipboard_items = []
         self._loading = False
         self._pending_updates = False
 
-        self.viewport = Box(name="viewport", spacing=4, orientation="v")
         self.search_entry = Entry(
             name="search-entry",
             placeholder="Search Clipboard History...",
@@ -55,10 +53,34 @@ class ClipHistory(Box):
             v_expand=True,
             h_align="fill",
             v_align="fill",
-            child=self.viewport,
             propagate_width=False,
             propagate_height=False,
         )
+        self.viewport = VirtualList(
+            self.scrolled_window,
+            create_row=self.create_clipboard_item,
+            bind_row=self.bind_clipboard_item,
+            row_kind=lambda item: "image" if self.is_image_data(self._item_content(item)) else "text",
+            placeholder=Box(
+                name="no-clip-container",
+                orientation="v",
+                h_align="center",
+                v_align="center",
+                h_expand=True,
+                v_expand=True,
+                children=[
+                    Label(
+                        name="no-clip",
+                        markup=icons.clipboard,
+                        h_align="center",
+                        v_align="center",
+                    ),
+                ],
+            ),
+            name="viewport",
+            spacing=4,
+        )
+        self.scrolled_window.add(self.viewport)
 
         self.header_box = Box(
             name="header_box",
@@ -96,7 +118,7 @@ class ClipHistory(Box):
 
     def close(self):
         """Close the clipboard history panel"""
-        self.viewport.children = []
+        self.viewport.set_items([])
         self.selected_index = -1
         self.notch.close_notch()
 
@@ -149,115 +171,86 @@ class ClipHistory(Box):
         self.clipboard_items = new_items
         self.display_clipboard_items()
 
+    @staticmethod
+    def _item_content(item):
+        return item.split('\t', 1)[1] if '\t' in item else item
+
     def display_clipboard_items(self, filter_text=""):
         """Display clipboard items in the viewport"""
-        remove_handler(self._arranger_handler) if self._arranger_handler else None
-        self.viewport.children = []
         self.selected_index = -1
-        
-
-        filtered_items = []
-        for item in self.clipboard_items:
-
-            content = item.split('\t', 1)[1] if '\t' in item else item
-            if filter_text.lower() in content.lower():
-                filtered_items.append(item)
-        
-
-        if not filtered_items:
 
-            container = Box(
-                name="no-clip-container",
-                orientation="v",
-                h_align="center",
-                v_align="center",
-                h_expand=True,
-                v_expand=True
-            )
-            
-
-            label = Label(
-                name="no-clip",
-                markup=icons.clipboard,
-                h_align="center",
-                v_align="center",
+        filter_lower = filter_text.lower()
+        filtered_items = [
+            item for item in self.clipboard_items
+            if filter_lower in self._item_content(item).lower()
+        ]
+        self.viewport.set_items(filtered_items)
+
+        if self.search_entry.get_text() and filtered_items:
+            self.update_selection(0)
+
+    def create_clipboard_item(self, kind):
+        """Create an empty button for a clipboard item; bind_clipboard_item fills it"""
+        if kind == "image":
+            icon = Image(name="clip-icon", h_align="start")
+            # Reserve the preview height so rows don't resize when it loads
+            icon.set_size_request(-1, 72)
+        else:
+            icon = Label(
+                name="clip-icon",
+                markup=icons.clip_text,
+                h_align="start",
             )
-            
-            container.add(label)
-            self.viewport.add(container)
-            return
-            
-
-        self._display_items_batch(filtered_items, 0, 10)
-
-    def _display_items_batch(self, items, start, batch_size):
-        """Display items in batches to keep UI responsive"""
-        end = min(start + batch_size, len(items))
-        
-        for i in range(start, end):
-            item = items[i]
-            self.viewport.add(self.create_clipboard_item(item))
-        
+        label = Label(
+            name="clip-label",
+            ellipsization="end",
+            v_align="center",
+            h_align="start",
+            h_expand=True,
+        )
+        button = Button(
+            name="slot-button",
+            child=Box(
+                name="slot-box",
+                orientation="h",
+                spacing=10,
+                children=[icon, label],
+            ),
+            on_clicked=lambda button: self.paste_item(button.item_id),
+        )
+        button.icon, button.label = icon, label
+        button.item_id = None
 
-        if end < len(items):
-            GLib.idle_add(self._display_items_batch, items, end, batch_size)
-        else:
+        button.connect("key-press-event", lambda widget, event: self.on_item_key_press(widget, event, widget.item_id))
 
-            if self.search_entry.get_text() and self.viewport.get_children():
-                self.update_selection(0)
+        button.set_can_focus(True)
+        button.add_events(Gdk.EventMask.KEY_PRESS_MASK)
 
-    def create_clipboard_item(self, item):
-        """Create a button for a clipboard item"""
+        return button
 
+    def bind_clipboard_item(self, button, item):
+        """Show clipboard item `item` in a pooled button"""
         parts = item.split('\t', 1)
         item_id = parts[0] if len(parts) > 1 else "0"
         content = parts[1] if len(parts) > 1 else item
-        
+        button.item_id = item_id
+
+        if button.kind == "image":
+            button.label.set_label("[Image]")
+            button.set_tooltip_text("Image in clipboard")
+            pixbuf = self.image_cache.get(item_id)
+            if pixbuf is not None:
+                button.icon.set_from_pixbuf(pixbuf)
+            else:
+                button.icon.clear()
+                self._load_image_preview_async(item_id, button)
+            return
 
         display_text = content.strip()
         if len(display_text) > 100:
             display_text = display_text[:97] + "..."
-        
-
-        is_image = self.is_image_data(content)
-        
-        if is_image:
-
-            button = Button(
-                name="slot-button",
-                child=Box(
-                    name="slot-box",
-                    orientation="h",
-                    spacing=10,
-                    children=[
-                        Image(name="clip-icon", h_align="start"),
-                        Label(
-                            name="clip-label",
-                            label="[Image]",
-                            ellipsization="end",
-                            v_align="center",
-                            h_align="start",
-                            h_expand=True,
-                        ),
-                    ],
-                ),
-                tooltip_text="Image in clipboard",
-                on_clicked=lambda *_, id=item_id: self.paste_item(id),
-            )
-
-            self._load_image_preview_async(item_id, button)
-        else:
-
-            button = self.create_text_item_button(item_id, display_text)
-        
-
-        button.connect("key-press-event", lambda widget, event, id=item_id: self.on_item_key_press(widget, event, id))
-        
-
-        button.set_can_focus(True)
-        button.add_events(Gdk.EventMask.KEY_PRESS_MASK)
-            
-        return button
+        button.label.set_label(display_text)
+        button.set_tooltip_text(display_text)
 
     def _load_image_preview_async(self, item_id, button):
         """Load image preview asynchronously using background thread"""
@@ -269,7 +262,7 @@ class ClipHistory(Box):
         try:
             if item_id in self.image_cache:
                 pixbuf = self.image_cache[item_id]
-                GLib.idle_add(self._update_image_button, button, pixbuf)
+                GLib.idle_add(self._update_image_button, button, item_id, pixbuf)
                 return
             
             result = subprocess.run(
@@ -292,45 +285,16 @@ class ClipHistory(Box):
             pixbuf = pixbuf.scale_simple(new_width, new_height, GdkPixbuf.InterpType.BILINEAR)
             self.image_cache[item_id] = pixbuf
             
-            GLib.idle_add(self._update_image_button, button, pixbuf)
+            GLib.idle_add(self._update_image_button, button, item_id, pixbuf)
         except Exception as e:
             print(f"Error loading image preview: {e}", file=sys.stderr)
 
-    def _update_image_button(self, button, pixbuf):
+    def _update_image_button(self, button, item_id, pixbuf):
         """Update the button with the loaded image preview"""
-        box = button.get_child()
-        if box and len(box.get_children()) > 0:
-            image_widget = box.get_children()[0]
-            if isinstance(image_widget, Image):
-                image_widget.set_from_pixbuf(pixbuf)
-
-    def create_text_item_button(self, item_id, display_text):
-        """Create a button for a text clipboard item"""
-        return Button(
-            name="slot-button",
-            child=Box(
-                name="slot-box",
-                orientation="h",
-                spacing=10,
-                children=[
-                    Label(
-                        name="clip-icon",
-                        markup=icons.clip_text,
-                        h_align="start",
-                    ),
-                    Label(
-                        name="clip-label",
-                        label=display_text,
-                        ellipsization="end",
-                        v_align="center",
-                        h_align="start",
-                        h_expand=True,
-                    ),
-                ],
-            ),
-            tooltip_text=display_text,
-            on_clicked=lambda *_: self.paste_item(item_id),
-        )
+        # The pooled button may have been rebound to another item meanwhile
+        if button.item_id == item_id:
+            button.icon.set_from_pixbuf(pixbuf)
+        return False
 
     def is_image_data(self, content):
         """Determine if clipboard content is likely an image"""
@@ -421,26 +385,16 @@ class ClipHistory(Box):
 
     def update_selection(self, new_index):
         """Update the selected item in the viewport"""
-        children = self.viewport.get_children()
-        
-
-        if self.selected_index != -1 and self.selected_index < len(children):
-            current_button = children[self.selected_index]
-            current_button.get_style_context().remove_class("selected")
-            
-
-        if new_index != -1 and new_index < len(children):
-            new_button = children[new_index]
-            new_button.get_style_context().add_class("selected")
+        if new_index != -1 and new_index < len(self.viewport.items):
             self.selected_index = new_index
-            self.scroll_to_selected(new_button)
         else:
             self.selected_index = -1
+        self.viewport.select(self.selected_index)
 
     def move_selection(self, delta):
         """Move the selection up or down"""
-        children = self.viewport.get_children()
-        if not children:
+        items = self.viewport.items
+        if not items:
             return
             
 
@@ -449,54 +403,28 @@ class ClipHistory(Box):
         else:
             new_index = self.selected_index + delta
             
-        new_index = max(0, min(new_index, len(children) - 1))
+        new_index = max(0, min(new_index, len(items) - 1))
         self.update_selection(new_index)
 
-    def scroll_to_selected(self, button):
-        """Scroll to ensure the selected item is visible"""
-        def scroll():
-            adj = self.scrolled_window.get_vadjustment()
-            alloc = button.get_allocation()
-            if alloc.height == 0:
-                return False
-
-            y = alloc.y
-            height = alloc.height
-            page_size = adj.get_page_size()
-            current_value = adj.get_value()
-
-            visible_top = current_value
-            visible_bottom = current_value + page_size
-
-            if y < visible_top:
-
-                adj.set_value(y)
-            elif y + height > visible_bottom:
-
-                new_value = y + height - page_size
-                adj.set_value(new_value)
-            return False
-        GLib.idle_add(scroll)
-
     def use_selected_item(self):
         """Use (paste) the selected clipboard item"""
-        children = self.viewport.get_children()
-        if not children or self.selected_index == -1 or self.selected_index >= len(self.clipboard_items):
+        items = self.viewport.items
+        if not items or self.selected_index == -1 or self.selected_index >= len(items):
             return
             
 
-        item_line = self.clipboard_items[self.selected_index]
+        item_line = items[self.selected_index]
         item_id = item_line.split('\t', 1)[0]
         self.paste_item(item_id)
 
     def delete_selected_item(self):
         """Delete the selected clipboard item"""
-        children = self.viewport.get_children()
-        if not children or self.selected_index == -1:
+        items = self.viewport.items
+        if not items or self.selected_index == -1 or self.selected_index >= len(items):
             return
             
 
-        item_line = self.clipboard_items[self.selected_index]
+        item_line = items[self.selected_index]
         item_id = item_line.split('\t', 1)[0]
         self.delete_item(item_id)
 
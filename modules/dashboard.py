@@ -39,11 +39,17 @@ class Dashboard(Box):
         self.notch = kwargs["notch"]
 
         self.widgets = Widgets(notch=self.notch)
-        self.pins = Pins()
-        self.kanban = Kanban()
-        self.wallpapers = WallpaperSelector()
-        self.weather_forecast = WeatherForecast()
-        self.mixer = Mixer()
+
+        # Sections other than widgets are built the first time they are shown
+        self._section_factories = {
+            "pins": Pins,
+            "kanban": Kanban,
+            "wallpapers": WallpaperSelector,
+            "weather": WeatherForecast,
+            "mixer": Mixer,
+        }
+        self._sections = {}
+        self._section_slots = {}
 
         self.stack = Stack(
             name="stack",
@@ -63,11 +69,17 @@ class Dashboard(Box):
         )
 
         self.stack.add_titled(self.widgets, "widgets", "Widgets")
-        self.stack.add_titled(self.pins, "pins", "Pins")
-        self.stack.add_titled(self.kanban, "kanban", "Kanban")
-        self.stack.add_titled(self.wallpapers, "wallpapers", "Wallpapers")
-        self.stack.add_titled(self.weather_forecast, "weather", "Weather")
-        self.stack.add_titled(self.mixer, "mixer", "Mixer")
+        for name, title in [
+            ("pins", "Pins"),
+            ("kanban", "Kanban"),
+            ("wallpapers", "Wallpapers"),
+            ("weather", "Weather"),
+            ("mixer", "Mixer"),
+        ]:
+            slot = Box(name=f"dashboard-{name}-slot", orientation="v")
+            slot.set_homogeneous(True)
+            self._section_slots[name] = slot
+            self.stack.add_titled(slot, name, title)
 
         self.switcher.set_stack(self.stack)
         self.switcher.set_hexpand(True)
@@ -92,6 +104,36 @@ class Dashboard(Box):
         )
         self.show_all()
 
+    @property
+    def pins(self):
+        return self._get_section("pins")
+
+    @property
+    def kanban(self):
+        return self._get_section("kanban")
+
+    @property
+    def wallpapers(self):
+        return self._get_section("wallpapers")
+
+    @property
+    def weather_forecast(self):
+        return self._get_section("weather")
+
+    @property
+    def mixer(self):
+        return self._get_section("mixer")
+
+    def _get_section(self, name):
+        """Return a section, building it into its stack slot on first use."""
+        section = self._sections.get(name)
+        if section is None:
+            section = self._section_factories[name]()
+            self._sections[name] = section
+            self._section_slots[name].add(section)
+            section.show_all()
+        return section
+
     def _setup_switcher_icons(self):
         icon_details_map = {
             "Widgets": {"icon": icons.widgets, "name": "widgets"},
@@ -144,22 +186,15 @@ class Dashboard(Box):
         return children.index(current_child) if current_child in children else -1
 
     def on_visible_child_changed(self, stack, param):
-        visible = stack.get_visible_child()
-        if visible == self.wallpapers:
-            self.wallpapers.search_entry.set_text("")
-            self.wallpapers.search_entry.grab_focus()
+        name = stack.get_visible_child_name()
+        if name not in self._section_slots:
+            return
+        section = self._get_section(name)
+        if name == "wallpapers":
+            section.search_entry.set_text("")
+            section.search_entry.grab_focus()
 
     def go_to_section(self, section_name):
         """Navigate to a specific section in the dashboard."""
-        if section_name == "widgets":
-            self.stack.set_visible_child(self.widgets)
-        elif section_name == "pins":
-            self.stack.set_visible_child(self.pins)
-        elif section_name == "kanban":
-            self.stack.set_visible_child(self.kanban)
-        elif section_name == "wallpapers":
-            self.stack.set_visible_child(self.wallpapers)
-        elif section_name == "weather":
-            self.stack.set_visible_child(self.weather_forecast)
-        elif section_name == "mixer":
-            self.stack.set_visible_child(self.mixer)
+        if section_name == "widgets" or section_name in self._section_slots:
+            self.stack.set_visible_child_name(section_name)
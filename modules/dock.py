@@ -1,5 +1,4 @@
 import json
-import logging
 
 import cairo
 import gi
@@ -7,8 +6,7 @@ import gi
 gi.require_version("Gtk", "3.0")
 from fabric.hyprland.widgets import get_hyprland_connection
 from fabric.utils import (exec_shell_command, exec_shell_command_async,
-                          get_relative_path, idle_add, remove_handler)
-from fabric.utils.helpers import get_desktop_applications
+                          idle_add, remove_handler)
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.widgets.eventbox import EventBox
@@ -18,42 +16,17 @@ from gi.repository import Gdk, GLib, Gtk
 
 import config.data as data
 from modules.corners import MyCorner
+from services.app_resolver import (IDENTIFIER_KEYS, app_identifiers,
+                                   get_app_resolver, normalize_window_class)
+from services.desktop_catalog import get_desktop_catalog
+from services.dock_config import app_data, get_dock_config_store
+from services.hyprland_state import get_hyprland_state
+from services.launch_history import get_launch_history
+from services.occlusion import get_occlusion_service
 from utils.icon_resolver import IconResolver
 from widgets.wayland import WaylandWindow as Window
 
 
-def read_config():
-    """Read and return the full configuration from the JSON file, handling missing file."""
-    config_path = get_relative_path("../config/dock.json")
-    try:
-        with open(config_path, "r") as file:
-            config_data = json.load(file)
-            
-        if "pinned_apps" in config_data and config_data["pinned_apps"] and isinstance(config_data["pinned_apps"][0], str):
-            all_apps = get_desktop_applications()
-            app_map = {app.name: app for app in all_apps if app.name}
-            
-            old_pinned = config_data["pinned_apps"]
-            config_data["pinned_apps"] = []
-            
-            for app_id in old_pinned:
-                app = app_map.get(app_id)
-                if app:
-                    app_data_obj = {
-                        "name": app.name,
-                        "display_name": app.display_name,
-                        "window_class": app.window_class,
-                        "executable": app.executable,
-                        "command_line": app.command_line
-                    }
-                    config_data["pinned_apps"].append(app_data_obj)
-                else:
-                    config_data["pinned_apps"].append({"name": app_id})
-                
-    except (FileNotFoundError, json.JSONDecodeError):
-        config_data = {"pinned_apps": []}
-    return config_data
-
 def createSurfaceFromWidget(widget: Gtk.Widget) -> cairo.ImageSurface:
     alloc = widget.get_allocation()
     surface = cairo.ImageSurface(
@@ -148,14 +121,22 @@ class Dock(Window):
                 case _:
                     self.set_margin("0px 0px 0px 0px")
 
-        self.config = read_config()
+        self.config_store = get_dock_config_store()
+        self.config = self.config_store.get_config()
         self.conn = get_hyprland_connection()
+        self.store = get_hyprland_state()
         self.icon_resolver = IconResolver() 
         self.pinned = self.config.get("pinned_apps", [])
-        self.config_path = get_relative_path("../config/dock.json")
-        self.app_map = {}
-        self._all_apps = get_desktop_applications()
-        self.app_identifiers = self._build_app_identifiers_map()
+        self.catalog = get_desktop_catalog()
+        self.resolver = get_app_resolver()
+
+        # Dock buttons keyed by pinned app or window group, and the memoized matches behind them
+        self._buttons = {}
+        self._buttons_generation = self.catalog.generation
+        self._separator = None
+        self._pinned_signature = None
+        self._pinned_match = []
+        self._pinned_owners = {}
         
         self.hide_id = None
         self._arranger_handler = None
@@ -292,47 +273,34 @@ class Dock(Window):
         self.view.connect("drag-begin", self.on_drag_begin)
         self.view.connect("drag-end", self.on_drag_end)
 
-        if self.conn.ready:
+        if self.store.is_ready:
             self.update_dock()
-            if not self.integrated_mode: GLib.timeout_add(500, self.check_occlusion_state)
         else:
-            self.conn.connect("event::ready", self.update_dock)
-            if not self.integrated_mode: self.conn.connect("event::ready", lambda *args: GLib.timeout_add(250, self.check_occlusion_state))
+            self.store.ready.connect(self.update_dock)
+
+        # Occlusion changes are pushed by the occlusion service instead of polled
+        self._occlusion_watch_id = None
+        if not self.integrated_mode:
+            if self.actual_dock_is_horizontal:
+                occlusion_side = "bottom"
+            else:
+                occlusion_side = anchor_to_set
+            self._occlusion_watch_id = get_occlusion_service().watch(
+                self.monitor_id,
+                (occlusion_side, self.effective_occlusion_size),
+                self._on_occlusion_changed,
+            )
 
         # Listen to window events to update dock when apps open/close
-        self.conn.connect("event::openwindow", self.update_dock)
-        self.conn.connect("event::closewindow", self.update_dock)
+        self.store.client_added.connect(self.update_dock)
+        self.store.client_removed.connect(self.update_dock)
         
         if not self.integrated_mode:
-            self.conn.connect("event::workspace", self.check_hide)
-        
-        GLib.timeout_add_seconds(2, self.check_config_change)
-            
-    def _build_app_identifiers_map(self):
-        identifiers = {}
-        for app in self._all_apps:
-            if app.name: identifiers[app.name.lower()] = app
-            if app.display_name: identifiers[app.display_name.lower()] = app
-            if app.window_class: identifiers[app.window_class.lower()] = app
-            if app.executable: identifiers[app.executable.split('/')[-1].lower()] = app
-            if app.command_line: identifiers[app.command_line.split()[0].split('/')[-1].lower()] = app
-        return identifiers
-
-    def _normalize_window_class(self, class_name):
-        if not class_name: return ""
-        normalized = class_name.lower()
-        suffixes = [".bin", ".exe", ".so", "-bin", "-gtk"]
-        for suffix in suffixes:
-            if normalized.endswith(suffix):
-                normalized = normalized[:-len(suffix)]
-        return normalized
-        
-    def _classes_match(self, class1, class2):
-        if not class1 or not class2: return False
-        norm1 = self._normalize_window_class(class1)
-        norm2 = self._normalize_window_class(class2)
-        return norm1 == norm2
+            self.store.workspace_changed.connect(self.check_hide)
 
+        # Pins changed by another dock, the launcher or an edit of dock.json
+        self.config_store.changed.connect(self._on_config_changed)
+            
     def on_drag_begin(self, widget, drag_context):
         self._drag_in_progress = True
         Gtk.drag_set_icon_surface(drag_context, createSurfaceFromWidget(widget))
@@ -382,41 +350,13 @@ class Dock(Window):
             self.dock_full.add_style_class("occluded")
         return True
 
-    def find_app(self, app_identifier):
-        if not app_identifier: return None
-        if isinstance(app_identifier, dict):
-            for key in ["window_class", "executable", "command_line", "name", "display_name"]:
-                if key in app_identifier and app_identifier[key]:
-                    app = self.find_app_by_key(app_identifier[key])
-                    if app: return app
-            return None
-        return self.find_app_by_key(app_identifier)
-    
-    def find_app_by_key(self, key_value):
-        if not key_value: return None
-        normalized_id = str(key_value).lower()
-        if normalized_id in self.app_identifiers:
-            return self.app_identifiers[normalized_id]
-        for app in self._all_apps:
-            if app.name and normalized_id in app.name.lower(): return app
-            if app.display_name and normalized_id in app.display_name.lower(): return app
-            if app.window_class and normalized_id in app.window_class.lower(): return app
-            if app.executable and normalized_id in app.executable.lower(): return app
-            if app.command_line and normalized_id in app.command_line.lower(): return app
-        return None
-
-    def update_app_map(self):
-        self._all_apps = get_desktop_applications()
-        self.app_map = {app.name: app for app in self._all_apps if app.name}
-        self.app_identifiers = self._build_app_identifiers_map()
-
     def create_button(self, app_identifier, instances):
-        desktop_app = self.find_app(app_identifier)
+        desktop_app = self.resolver.find_app(app_identifier)
         icon_img = None
         display_name = None
         
         if desktop_app:
-            icon_img = desktop_app.get_icon_pixbuf(size=self.icon_size) 
+            icon_img = self.icon_resolver.get_desktop_app_pixbuf(desktop_app, self.icon_size) 
             display_name = desktop_app.display_name or desktop_app.name
         
         id_value = app_identifier["name"] if isinstance(app_identifier, dict) else app_identifier
@@ -430,22 +370,22 @@ class Dock(Window):
                 icon_img = self.icon_resolver.get_icon_pixbuf("image-missing", self.icon_size) 
                 
         items = [Image(pixbuf=icon_img)]
-        tooltip = display_name or (id_value if isinstance(id_value, str) else "Unknown")
-        if not display_name and instances and instances[0].get("title"):
-            tooltip = instances[0]["title"]
 
+        # Handlers read the button's current state, so instances can change without a new button
         button = Button(
             child= Box(name="dock-icon", orientation="v", h_align="center", children=items), 
-            on_clicked=lambda *a: self.handle_app(app_identifier, instances, desktop_app),
-            tooltip_text=tooltip, name="dock-app-button",
+            on_clicked=lambda b, *a: self.handle_app(b.app_identifier, b.instances, b.desktop_app),
+            name="dock-app-button",
         )
         button.app_identifier = app_identifier
         button.desktop_app = desktop_app
-        button.instances = instances
-        if instances: button.add_style_class("instance")
+        button.display_name = display_name
+        button.id_value = id_value
+        button.instances = []
+        self._set_button_instances(button, instances)
 
         # Add right-click context menu functionality
-        button.connect("button-press-event", self._on_button_press, app_identifier, instances, desktop_app)
+        button.connect("button-press-event", self._on_button_press)
 
         button.drag_source_set(
             Gdk.ModifierType.BUTTON1_MASK,
@@ -464,10 +404,24 @@ class Dock(Window):
         button.connect("enter-notify-event", self._on_child_enter)
         return button
 
-    def _on_button_press(self, widget, event, app_identifier, instances, desktop_app):
+    def _set_button_instances(self, button, instances):
+        """Update a button's windows, its instance indicator and title-based tooltip."""
+        had_instances = bool(button.instances)
+        button.instances = instances
+        if bool(instances) != had_instances:
+            if instances: button.add_style_class("instance")
+            else: button.remove_style_class("instance")
+
+        tooltip = button.display_name or (button.id_value if isinstance(button.id_value, str) else "Unknown")
+        if not button.display_name and instances and instances[0].get("title"):
+            tooltip = instances[0]["title"]
+        if button.get_tooltip_text() != tooltip:
+            button.set_tooltip_text(tooltip)
+
+    def _on_button_press(self, widget, event):
         """Handle button press events for context menu"""
         if event.button == Gdk.BUTTON_SECONDARY:  # Right click
-            self._show_context_menu(widget, event, app_identifier, instances, desktop_app)
+            self._show_context_menu(widget, event, widget.app_identifier, widget.instances, widget.desktop_app)
             return True
         return False
 
@@ -522,24 +476,14 @@ class Dock(Window):
             return  # Already pinned
         
         # Create app data object for pinning
-        if desktop_app:
-            app_data_obj = {
-                "name": desktop_app.name,
-                "display_name": desktop_app.display_name,
-                "window_class": desktop_app.window_class,
-                "executable": desktop_app.executable,
-                "command_line": desktop_app.command_line
-            }
-        else:
-            app_data_obj = app_identifier
+        app_data_obj = app_data(desktop_app) if desktop_app else app_identifier
         
         # Add to pinned apps
         self.pinned.append(app_data_obj)
-        self.config["pinned_apps"] = self.pinned
         
         # Save and update dock
-        if self.update_pinned_apps_file():
-            self.update_dock()
+        self._save_pinned_apps()
+        self.update_dock()
 
     def _unpin_app(self, menu_item, app_identifier):
         """Unpin an app from the dock"""
@@ -556,11 +500,10 @@ class Dock(Window):
         
         if app_index >= 0:
             self.pinned.pop(app_index)
-            self.config["pinned_apps"] = self.pinned
             
             # Save and update dock
-            if self.update_pinned_apps_file():
-                self.update_dock()
+            self._save_pinned_apps()
+            self.update_dock()
 
     def _close_app(self, menu_item, instance):
         """Close a single app instance"""
@@ -575,8 +518,9 @@ class Dock(Window):
 
     def handle_app(self, app_identifier, instances, desktop_app=None):
         if not instances:
-            if not desktop_app: desktop_app = self.find_app(app_identifier)
+            if not desktop_app: desktop_app = self.resolver.find_app(app_identifier)
             if desktop_app:
+                get_launch_history().record(desktop_app)
                 # Special handling for Tidal HiFi to add required flags
                 if hasattr(desktop_app, 'name') and desktop_app.name and 'tidal' in desktop_app.name.lower():
                     # Launch Tidal HiFi with required flags to avoid zygote error
@@ -642,103 +586,132 @@ class Dock(Window):
                 self.dock_revealer.set_reveal_child(False)
             self.dock_full.add_style_class("occluded")
 
+    def _window_id(self, client):
+        """Identifier a window is grouped by: its class, or the app name from its title."""
+        if class_name := client.get("initialClass", "").lower(): return class_name
+        if class_name := client.get("class", "").lower(): return class_name
+        if title := client.get("title", "").lower():
+            possible_name = title.split(" - ")[0].strip()
+            return possible_name if possible_name and len(possible_name) > 1 else title
+        return "unknown-app"
+
+    def _pinned_identifiers(self, app_data_item):
+        app = self.resolver.find_app(app_data_item)
+        possible_identifiers = []
+        if isinstance(app_data_item, dict):
+            for key in IDENTIFIER_KEYS:
+                if key in app_data_item and app_data_item[key]: possible_identifiers.append(app_data_item[key].lower())
+        elif isinstance(app_data_item, str): possible_identifiers.append(app_data_item.lower())
+
+        if app: possible_identifiers.extend(app_identifiers(app))
+        return set(possible_identifiers)
+
+    def _refresh_matching(self):
+        """Drop the memoized matches and buttons that depend on pins or desktop entries that changed."""
+        if self._buttons_generation != self.catalog.generation:
+            self._buttons_generation = self.catalog.generation
+            self._buttons = {}
+            self._pinned_signature = None
+
+        pinned_keys = [json.dumps(item, sort_keys=True) for item in self.pinned]
+        if pinned_keys != self._pinned_signature:
+            self._pinned_signature = pinned_keys
+            self._pinned_match = [self._pinned_identifiers(item) for item in self.pinned]
+            self._pinned_owners = {}
+
+    def _pinned_owner(self, group_key, window_id):
+        """Index of the first pinned app a window group belongs to, memoized per group."""
+        if group_key in self._pinned_owners:
+            return self._pinned_owners[group_key]
+        candidates = (window_id, group_key)
+        owner = None
+        for index, identifiers in enumerate(self._pinned_match):
+            for identifier in identifiers:
+                if (identifier in candidates or normalize_window_class(identifier) in candidates
+                        or (len(identifier) >= 3 and any(identifier in c for c in candidates))):
+                    owner = index
+                    break
+            if owner is not None: break
+        self._pinned_owners[group_key] = owner
+        return owner
+
     def update_dock(self, *args):
-        self.update_app_map()
+        """
+        Reconcile the dock's buttons with the pinned apps and running windows.
+
+        Buttons are keyed by pinned app or window group, so only groups that
+        appeared, disappeared or changed windows are touched; icons are only
+        loaded for new buttons.
+        """
+        self._refresh_matching()
         arranger_handler = getattr(self, "_arranger_handler", None)
         if arranger_handler: remove_handler(arranger_handler)
-        clients = self.get_clients()
-        
-        running_windows = {}
-        for c in clients:
-            window_id = None
-            if class_name := c.get("initialClass", "").lower(): window_id = class_name
-            elif class_name := c.get("class", "").lower(): window_id = class_name
-            elif title := c.get("title", "").lower():
-                possible_name = title.split(" - ")[0].strip()
-                if possible_name and len(possible_name) > 1: window_id = possible_name
-                else: window_id = title
-            if not window_id: window_id = "unknown-app"
-            running_windows.setdefault(window_id, []).append(c)
-            normalized_id = self._normalize_window_class(window_id)
-            if normalized_id != window_id:
-                running_windows.setdefault(normalized_id, []).extend(running_windows[window_id])
-        
-        pinned_buttons = []
-        used_window_classes = set()
-        
-        for app_data_item in self.pinned:
-            app = self.find_app(app_data_item)
-            instances = []
-            matched_class = None
-            possible_identifiers = []
-            
-            if isinstance(app_data_item, dict):
-                for key in ["window_class", "executable", "command_line", "name", "display_name"]:
-                    if key in app_data_item and app_data_item[key]: possible_identifiers.append(app_data_item[key].lower())
-            elif isinstance(app_data_item, str): possible_identifiers.append(app_data_item.lower())
-            
-            if app:
-                if app.window_class: possible_identifiers.append(app.window_class.lower())
-                if app.executable: possible_identifiers.append(app.executable.split('/')[-1].lower())
-                if app.command_line:
-                    cmd_parts = app.command_line.split()
-                    if cmd_parts: possible_identifiers.append(cmd_parts[0].split('/')[-1].lower())
-                if app.name: possible_identifiers.append(app.name.lower())
-                if app.display_name: possible_identifiers.append(app.display_name.lower())
-            
-            possible_identifiers = list(set(possible_identifiers)) 
-            
-            for identifier in possible_identifiers:
-                if identifier in running_windows:
-                    instances = running_windows[identifier]; matched_class = identifier; break
-                normalized = self._normalize_window_class(identifier)
-                if normalized in running_windows:
-                    instances = running_windows[normalized]; matched_class = normalized; break
-                for window_class_key in running_windows: 
-                    if len(identifier) >= 3 and identifier in window_class_key:
-                        instances = running_windows[window_class_key]; matched_class = window_class_key
-                        break
-                if matched_class: break
-            
-            if matched_class:
-                used_window_classes.add(matched_class)
-                used_window_classes.add(self._normalize_window_class(matched_class))
-            
-            pinned_buttons.append(self.create_button(app_data_item, instances))
-        
-        open_buttons = []
-        for class_name, instances in running_windows.items():
-            if class_name not in used_window_classes:
-                app = None
-                app = self.app_identifiers.get(class_name)
-                if not app:
-                    norm_class = self._normalize_window_class(class_name)
-                    app = self.app_identifiers.get(norm_class)
-                if not app: app = self.find_app_by_key(class_name)
-                if not app and instances and instances[0].get("title"):
-                    title = instances[0].get("title", "")
-                    potential_name = title.split(" - ")[0].strip()
-                    if len(potential_name) > 2: app = self.find_app_by_key(potential_name)
-                
-                if app:
-                    app_data_obj = {
-                        "name": app.name, "display_name": app.display_name,
-                        "window_class": app.window_class, "executable": app.executable,
-                        "command_line": app.command_line
-                    }
-                    identifier = app_data_obj
-                else: identifier = class_name
-                open_buttons.append(self.create_button(identifier, instances))
+
+        # Group windows by normalized class, keeping the first class seen for display
+        groups = {}
+        for c in self.get_clients():
+            window_id = self._window_id(c)
+            group_key = normalize_window_class(window_id)
+            if group_key not in groups: groups[group_key] = (window_id, [])
+            groups[group_key][1].append(c)
+
+        pinned_instances = [[] for _ in self.pinned]
+        open_entries = []
+        for group_key, (window_id, instances) in groups.items():
+            owner = self._pinned_owner(group_key, window_id)
+            if owner is not None and not pinned_instances[owner]:
+                pinned_instances[owner] = instances
+                continue
+            app = self.resolver.resolve_window(window_id, instances[0].get("title", ""))
+            identifier = app_data(app) if app else window_id
+            open_entries.append((("open", group_key), identifier, instances))
+
+        pinned_entries = []
+        seen = {}
+        for item, key, instances in zip(self.pinned, self._pinned_signature, pinned_instances):
+            # Identical pins are told apart by occurrence
+            seen[key] = seen.get(key, -1) + 1
+            pinned_entries.append((("pinned", key, seen[key]), item, instances))
+
+        buttons = {}
+        def reconcile(entries):
+            children = []
+            for key, identifier, instances in entries:
+                button = self._buttons.get(key)
+                if button is None or button.app_identifier != identifier:
+                    button = self.create_button(identifier, instances)
+                elif button.instances != instances:
+                    self._set_button_instances(button, instances)
+                buttons[key] = button
+                children.append(button)
+            return children
+
+        pinned_buttons = reconcile(pinned_entries)
+        open_buttons = reconcile(open_entries)
+        self._buttons = buttons
 
         children = pinned_buttons
-        separator_orientation = Gtk.Orientation.VERTICAL if self.view.get_orientation() == Gtk.Orientation.HORIZONTAL else Gtk.Orientation.HORIZONTAL
         if pinned_buttons and open_buttons:
-            children += [Box(orientation=separator_orientation, v_expand=False, h_expand=False, h_align="center", v_align="center", name="dock-separator")]
-        children += open_buttons
-        
-        self.view.children = children
-        if not self.integrated_mode:
-            idle_add(self._update_size)
+            if self._separator is None:
+                separator_orientation = Gtk.Orientation.VERTICAL if self.view.get_orientation() == Gtk.Orientation.HORIZONTAL else Gtk.Orientation.HORIZONTAL
+                self._separator = Box(orientation=separator_orientation, v_expand=False, h_expand=False, h_align="center", v_align="center", name="dock-separator")
+            children = children + [self._separator]
+        children = children + open_buttons
+
+        current = self.view.get_children()
+        if current != children:
+            wanted = set(children)
+            for child in current:
+                if child not in wanted:
+                    self.view.remove(child)
+                    if child is not self._separator: child.destroy()
+            for child in children:
+                if child.get_parent() is None: self.view.add(child)
+            if self.view.get_children() != children:
+                for position, child in enumerate(children):
+                    self.view.reorder_child(child, position)
+            if not self.integrated_mode:
+                idle_add(self._update_size)
         self._drag_in_progress = False
         if not self.integrated_mode:
             self.check_occlusion_state()
@@ -750,16 +723,18 @@ class Dock(Window):
         return False
 
     def get_clients(self):
-        try: return json.loads(self.conn.send_command("j/clients").reply.decode())
-        except json.JSONDecodeError: return []
+        return self.store.get_clients()
 
     def get_focused(self):
-        try: return json.loads(self.conn.send_command("j/activewindow").reply.decode()).get("address", "")
-        except json.JSONDecodeError: return ""
+        return self.store.get_active_address()
 
     def get_workspace(self):
-        try: return json.loads(self.conn.send_command("j/activeworkspace").reply.decode()).get("id", 0)
-        except json.JSONDecodeError: return 0
+        return self.store.get_active_workspace_id()
+
+    def _on_occlusion_changed(self, _is_occluded):
+        # Only a trigger: reveal and hide depend on hover, drag and the
+        # always show/occluded settings, as when this was polled
+        self.check_occlusion_state()
 
     def check_occlusion_state(self):
         if self.integrated_mode:
@@ -770,20 +745,13 @@ class Dock(Window):
                 self.dock_revealer.set_reveal_child(True)
             if not self.always_show:
                  self.dock_full.remove_style_class("occluded")
-            return True
+            return False
 
         if self.always_occluded:
             if self.dock_revealer.get_reveal_child():
                 self.dock_revealer.set_reveal_child(False)
             self.dock_full.add_style_class("occluded")
-            return True
-
-        if self.is_mouse_over_dock_area or self._drag_in_progress or self._prevent_occlusion:
-            if not self.dock_revealer.get_reveal_child():
-                self.dock_revealer.set_reveal_child(True)
-            if not self.always_show:
-                 self.dock_full.remove_style_class("occluded")
-            return True
+            return False
 
         if self.always_show:
             if not self.dock_revealer.get_reveal_child():
@@ -794,7 +762,7 @@ class Dock(Window):
                 self.dock_revealer.set_reveal_child(False)
             self.dock_full.add_style_class("occluded")
 
-        return True
+        return False
 
     def _find_drag_target(self, widget):
         children = self.view.get_children()
@@ -866,8 +834,7 @@ class Dock(Window):
                 
                 if app_index_dragged >= 0:
                     self.pinned.pop(app_index_dragged)
-                    self.config["pinned_apps"] = self.pinned
-                    self.update_pinned_apps_file()
+                    self._save_pinned_apps()
                     self.update_dock()
                 elif instances_dragged:
                     address = instances_dragged[0].get("address")
@@ -879,30 +846,22 @@ class Dock(Window):
                 self.check_occlusion_state()
 
         GLib.idle_add(process_drag_end)
-    def check_config_change(self):
-        new_config = read_config()
+    def _on_config_changed(self, config):
         if not self.integrated_mode:
             new_always_show = data.DOCK_ALWAYS_SHOW 
             if self.always_show != new_always_show:
                 self.always_show = new_always_show
                 self.check_occlusion_state() 
 
-        if new_config.get("pinned_apps", []) != self.config.get("pinned_apps", []):
-            self.config = new_config
+        if config.get("pinned_apps", []) != self.pinned:
+            self.config = config
             self.pinned = self.config.get("pinned_apps", [])
-            self.update_app_map()
             self.update_dock()
-        return True 
 
-    def update_pinned_apps_file(self):
-        config_path = get_relative_path("../config/dock.json")
-        try:
-            with open(config_path, "w") as file:
-                json.dump(self.config, file, indent=4)
-            return True
-        except Exception as e:
-            logging.error(f"Failed to write dock config: {e}")
-            return False
+    def _save_pinned_apps(self):
+        """Publish this dock's pins; the store writes dock.json and updates the other docks."""
+        self.config["pinned_apps"] = self.pinned
+        self.config_store.set_pinned_apps(self.pinned)
 
     def update_pinned_apps(self, skip_update=False):
         pinned_children_data = [] 
@@ -910,43 +869,14 @@ class Dock(Window):
             if child_widget.get_name() == "dock-separator": break
             if hasattr(child_widget, "app_identifier"):
                 if hasattr(child_widget, "desktop_app") and child_widget.desktop_app:
-                    app = child_widget.desktop_app
-                    app_data_obj = {
-                        "name": app.name, "display_name": app.display_name,
-                        "window_class": app.window_class, "executable": app.executable,
-                        "command_line": app.command_line
-                    }
-                    pinned_children_data.append(app_data_obj)
+                    pinned_children_data.append(app_data(child_widget.desktop_app))
                 else:
                     pinned_children_data.append(child_widget.app_identifier)
 
-        self.config["pinned_apps"] = pinned_children_data
         self.pinned = pinned_children_data
-        file_updated = self.update_pinned_apps_file()
-        if file_updated and not skip_update:
-            self.update_dock()
-
-    @staticmethod
-    def notify_config_change():
-        for dock_instance in Dock._instances: 
-             GLib.idle_add(dock_instance.check_config_change_immediate)
-
-    def check_config_change_immediate(self): 
-        new_config = read_config()
-        
-        if not self.integrated_mode:
-            previous_always_show = self.always_show
-            self.always_show = data.DOCK_ALWAYS_SHOW 
-            
-            if previous_always_show != self.always_show:
-                self.check_occlusion_state() 
-        
-        if new_config.get("pinned_apps", []) != self.config.get("pinned_apps", []):
-            self.config = new_config
-            self.pinned = self.config.get("pinned_apps", [])
-            self.update_app_map()
+        self._save_pinned_apps()
+        if not skip_update:
             self.update_dock()
-        return False 
 
     @staticmethod
     def update_visibility(visible):
@@ -19,6 +19,27 @@ vertical_mode = data.PANEL_THEME == "Panel" and (data.BAR_POSITION in ["Left", "
 emoji_rows = 3 if not vertical_mode else 9
 emoji_columns = 9 if not vertical_mode else 5
 
+# Parsed once per process and shared by every picker instance
+_emoji_data = None
+
+
+def get_emoji_data():
+    global _emoji_data
+    if _emoji_data is not None:
+        return _emoji_data
+
+    emoji_data = {}
+    emoji_file_path = get_relative_path("../assets/emoji.json")
+    if not os.path.exists(emoji_file_path):
+        print(f"Emoji JSON file not found at: {emoji_file_path}")
+        return {}
+
+    with open(emoji_file_path, 'r') as f:
+        for emoji_char, emoji_info in ijson.kvitems(f, ''):
+            emoji_data[emoji_char] = emoji_info
+    _emoji_data = emoji_data
+    return _emoji_data
+
 class EmojiPicker(Box):
     def __init__(self, **kwargs):
         super().__init__(
@@ -86,16 +107,7 @@ class EmojiPicker(Box):
         self.show_all()
 
     def _load_emoji_data(self):
-        emoji_data = {}
-        emoji_file_path = get_relative_path("../assets/emoji.json")
-        if not os.path.exists(emoji_file_path):
-            print(f"Emoji JSON file not found at: {emoji_file_path}")
-            return {}
-
-        with open(emoji_file_path, 'r') as f:
-            for emoji_char, emoji_info in ijson.kvitems(f, ''):
-                emoji_data[emoji_char] = emoji_info
-        return emoji_data
+        return get_emoji_data()
 
     def close_picker(self):
         self.stack.children = []
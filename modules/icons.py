@@ -30,6 +30,7 @@ close: str = "&#xeb55;"
 
 # Circles
 temp: str = "&#xeb38;"
+fan: str = "&#xec34;"
 disk: str = "&#xea88;"
 battery: str = "&#xea38;"
 memory: str = "&#xfa97;"
@@ -1,14 +1,11 @@
 import json
 import math
-import operator
 import os
 import re
 import subprocess
-from collections.abc import Iterator
 
 import numpy as np
-from fabric.utils import (DesktopApp, exec_shell_command_async,
-                          get_desktop_applications, idle_add, remove_handler)
+from fabric.utils import DesktopApp, exec_shell_command_async
 from fabric.utils.helpers import get_relative_path
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
@@ -20,9 +17,14 @@ from gi.repository import Gdk, GLib
 
 import config.data as data
 import modules.icons as icons
-from modules.dock import Dock
 from modules.updater import run_updater
+from services.desktop_catalog import get_desktop_catalog
+from services.dock_config import get_dock_config_store
+from services.launch_history import app_key, get_launch_history
+from utils.app_search import AppSearchIndex
 from utils.conversion import Conversion
+from utils.icon_resolver import IconResolver
+from widgets.virtual_list import VirtualList
 
 tooltip_settings = f"<b>Open {data.APP_NAME_CAP} Settings</b>"
 tooltip_close = "<b>Close</b>"
@@ -38,12 +40,13 @@ class AppLauncher(Box):
 
         self.notch = kwargs["notch"]
         self.selected_index = -1
-
-        self._arranger_handler: int = 0
-        self._all_apps = get_desktop_applications()
+        self.icon_resolver = IconResolver()
 
         # Load application search aliases
         self.search_aliases = self.load_search_aliases()
+        self._search_index = None
+        self._catalog_generation = -1
+        self.refresh_apps()
 
         self.converter = Conversion()
         self.calc_history_path = f"{data.CACHE_DIR}/calc.json"
@@ -60,7 +63,6 @@ class AppLauncher(Box):
         else:
             self.conversion_history = []
 
-        self.viewport = Box(name="viewport", spacing=4, orientation="v")
         self.search_entry = Entry(
             name="search-entry",
             placeholder="Search Applications...",
@@ -78,10 +80,18 @@ class AppLauncher(Box):
             v_expand=True,
             h_align="fill",
             v_align="fill",
-            child=self.viewport,
             propagate_width=False,
             propagate_height=False,
         )
+        self.viewport = VirtualList(
+            self.scrolled_window,
+            create_row=self.create_slot,
+            bind_row=self.bind_slot,
+            row_kind=lambda item: "app" if isinstance(item, DesktopApp) else "history",
+            name="viewport",
+            spacing=4,
+        )
+        self.scrolled_window.add(self.viewport)
 
         self.header_box = Box(
             name="header_box",
@@ -139,100 +149,29 @@ class AppLauncher(Box):
                 ]
             }
 
-    def fuzzy_match(self, query: str, target: str) -> bool:
-        """Return True if query fuzzily matches target (substring, subsequence, or similar)."""
-        q = (query or "").strip().casefold()
-        t = (target or "").strip().casefold()
-        if not q:
-            return True
-        if q in t:
-            return True
-        # Subsequence check: all query chars appear in order within target
-        idx = 0
-        for ch in q:
-            idx = t.find(ch, idx)
-            if idx == -1:
-                break
-            idx += 1
-        else:
-            return True
-        # Fallback: similarity ratio
-        try:
-            import difflib
-            if difflib.SequenceMatcher(None, q, t).ratio() >= 0.68:
-                return True
-        except Exception:
-            pass
-        return False
-
-    def generate_progressive_terms(self, term):
-        """Generate progressive character sequences for a search term"""
-        # Generate progressive sequences: "internet" -> ["i", "in", "int", "inte", "inter", "intern", "interne", "internet"]
-        sequences = []
-        for i in range(1, len(term) + 1):
-            sequences.append(term[:i])
-        return sequences
-
-    def should_app_match_query(self, app: DesktopApp, query: str) -> bool:
-        """Check if an app should match the search query, including special cases from JSON config"""
-        query_lower = query.casefold()
-        
-        # Standard search fields (non-fuzzy): include more sources similar to previous inline filter
-        def extract_command_name(command_line):
-            if not command_line:
-                return ""
-            if command_line.startswith("/bin/sh -c"):
-                return ""
-            cmd = command_line.split()[0] if command_line.split() else ""
-            if "/" in cmd:
-                cmd = cmd.split("/")[-1]
-            return cmd
-
-        searchable_text = (
-            (app.display_name or "")
-            + (" " + (app.name or "") + " ")
-            + (app.generic_name or "")
-            + (" " + (getattr(app, "command_line", "") or "") + " ")
-            + (" " + (getattr(app, "executable", "") or "") + " ")
-            + (" " + extract_command_name(getattr(app, "command_line", "")) + " ")
-        ).casefold()
-
-        # Normal search: direct substring match only (no fuzzy) for general apps
-        if query_lower in searchable_text:
-            return True
-        
-        # Check aliases from JSON configuration
-        app_name_lower = (app.display_name or "").casefold()
-        app_exec_lower = (app.name or "").casefold()
-        
-        for alias_config in self.search_aliases.get("application_aliases", []):
-            app_names = [name.casefold() for name in alias_config.get("app_names", [])]
-            base_search_terms = [term.casefold() for term in alias_config.get("search_terms", [])]
-            
-            # Generate progressive sequences for each base search term (optional boost for partials)
-            all_search_terms = []
-            for base_term in base_search_terms:
-                all_search_terms.extend(self.generate_progressive_terms(base_term))
-            
-            # Check if current app matches any of the configured app names
-            app_matches = any(
-                app_name in app_name_lower or app_name in app_exec_lower 
-                for app_name in app_names
-            )
-            
-            # If app matches and query fuzzily matches any alias term, return True
-            if app_matches and any(self.fuzzy_match(query_lower, term) for term in all_search_terms):
-                return True
-        
-        return False
+    def refresh_apps(self):
+        """Rebuild the search index if desktop applications changed, and refresh launch boosts"""
+        catalog = get_desktop_catalog()
+        if self._search_index is None or self._catalog_generation != catalog.generation:
+            self._all_apps = catalog.get_apps()
+            self._catalog_generation = catalog.generation
+            self._search_index = AppSearchIndex(self._all_apps, self.search_aliases)
+
+        # Rank frequently and recently launched apps first within each match tier
+        scores = get_launch_history().scores()
+        if scores:
+            self._search_index.set_boosts({
+                i: scores.get(app_key(app), 0.0)
+                for i, app in enumerate(self._search_index.apps)
+            })
 
     def close_launcher(self):
-        self.viewport.children = []
+        self.viewport.set_items([])
         self.selected_index = -1
         self.notch.close_notch()
 
     def open_launcher(self):
-        self._all_apps = get_desktop_applications()
+        self.refresh_apps()
         self.arrange_viewport()
         
 
@@ -252,7 +191,7 @@ class AppLauncher(Box):
         """Make sure the launcher is initialized with apps list before opening"""
         if not hasattr(self, '_initialized'):
 
-            self._all_apps = get_desktop_applications()
+            self.refresh_apps()
             self._initialized = True
             return True
         return False
@@ -266,25 +205,8 @@ class AppLauncher(Box):
             # In conversion mode, update history view once (not per keystroke)
             self.update_conversion_viewport()
             return
-        remove_handler(self._arranger_handler) if self._arranger_handler else None
-        self.viewport.children = []
         self.selected_index = -1
 
-        def extract_command_name(command_line):
-            """Extract base command name from command line, removing paths and arguments"""
-            if not command_line:
-                return ""
-            # Remove common shell wrappers
-            if command_line.startswith("/bin/sh -c"):
-                # Handle wrapped commands like "/bin/sh -c "\$SHELL -i -c scrcpy""
-                return ""
-            # Split by spaces and take first part (the command)
-            cmd = command_line.split()[0] if command_line.split() else ""
-            # Extract just the command name from full paths
-            if "/" in cmd:
-                cmd = cmd.split("/")[-1]
-            return cmd
-
         # Custom filter: when searching for "steam", exclude apps with "Play this" and "steam" in description
         query_lower = query.casefold()
         is_steam_search = "steam" in query_lower
@@ -297,75 +219,88 @@ class AppLauncher(Box):
             # Exclude if description contains both "play this" and "steam"
             return "play this" in desc_lower and "steam" in desc_lower
         
-        filtered_apps_iter = iter(
-            sorted(
-                [
-                    app
-                    for app in self._all_apps
-                    if self.should_app_match_query(app, query)
-                    and not should_exclude_app(app)
-                ],
-                key=lambda app: (app.display_name or "").casefold(),
-            )
-        )
-        should_resize = operator.length_hint(filtered_apps_iter) == len(self._all_apps)
+        filtered_apps = [app for app in self._search_index.search(query) if not should_exclude_app(app)]
+        self.viewport.set_items(filtered_apps)
 
-        self._arranger_handler = idle_add(
-            lambda apps_iter: self.add_next_application(apps_iter) or self.handle_arrange_complete(should_resize, query),
-            filtered_apps_iter,
-            pin=True,
-        )
-
-    def handle_arrange_complete(self, should_resize, query):
-        if query.strip() != "" and self.viewport.get_children():
+        if query.strip() != "" and filtered_apps:
             self.update_selection(0)
-        return False
-
-    def add_next_application(self, apps_iter: Iterator[DesktopApp]):
-        if not (app := next(apps_iter, None)):
-            return False
-        self.viewport.add(self.bake_application_slot(app))
-        return True
 
     def resize_viewport(self):
         # Removed set_min_content_width to prevent size retention issues
         # when switching between modules in the notch stack
         pass
 
-    def bake_application_slot(self, app: DesktopApp, **kwargs) -> Button:
+    def create_slot(self, kind: str) -> Button:
+        """Create an empty result row; bind_slot fills it for the item it shows."""
+        if kind == "app":
+            icon = Image(name="app-icon", h_align="start")
+            label = Label(
+                name="app-label",
+                ellipsization="end",
+                v_align="center",
+                h_align="center",
+            )
+            desc = Label(
+                name="app-desc",
+                ellipsization="end",
+                v_align="center",
+                h_align="start",
+                h_expand=True,
+            )
+            button = Button(
+                name="slot-button",
+                child=Box(
+                    name="slot-box",
+                    orientation="h",
+                    spacing=10,
+                    children=[icon, label, desc],
+                ),
+                on_clicked=lambda button: (self.launch_app(button.item), self.close_launcher()),
+            )
+            button.icon, button.label, button.desc = icon, label, desc
+            return button
+
+        label = Label(
+            name="calc-label",
+            ellipsization="end",
+            v_align="center",
+            h_align="center",
+        )
         button = Button(
             name="slot-button",
             child=Box(
-                name="slot-box",
+                name="calc-slot-box",
                 orientation="h",
                 spacing=10,
-                children=[
-                    Image(name="app-icon", pixbuf=app.get_icon_pixbuf(size=24), h_align="start"),
-                    Label(
-                        name="app-label",
-                        label=app.display_name or "Unknown",
-                        ellipsization="end",
-                        v_align="center",
-                        h_align="center",
-                    ),
-                    Label(
-                        name="app-desc",
-                        label=app.description or "",
-                        ellipsization="end",
-                        v_align="center",
-                        h_align="start",
-                        h_expand=True,
-                    ),
-                ],
+                children=[label],
             ),
-            tooltip_text=app.description,
-            on_clicked=lambda *_: (self.launch_app(app), self.close_launcher()),
-            **kwargs,
+            on_clicked=lambda button: self.copy_text_to_clipboard(button.item),
         )
+        button.label = label
         return button
 
+    def bind_slot(self, button: Button, item):
+        if button.kind == "app":
+            button.icon.set_from_pixbuf(self.icon_resolver.get_desktop_app_pixbuf(item, 24))
+            button.label.set_label(item.display_name or "Unknown")
+            button.desc.set_label(item.description or "")
+            button.set_tooltip_text(item.description)
+            return
+
+        display_text = item
+        if "=>" in item:
+            parts = item.split("=>")
+            expression = parts[0].strip()
+            result = parts[1].strip()
+            # Truncate long results for display, the tooltip keeps the full text
+            if len(result) > 50:
+                display_text = f"{expression} => {result[:47]}..."
+        button.label.set_label(display_text)
+        button.set_tooltip_text(item)
+
     def launch_app(self, app):
         """Launch an application with special handling for Tidal HiFi"""
+        get_launch_history().record(app)
         # Special handling for Tidal HiFi to add required flags
         if hasattr(app, 'name') and app.name and 'tidal' in app.name.lower():
             # Launch Tidal HiFi with required flags to avoid zygote error
@@ -375,44 +310,11 @@ class AppLauncher(Box):
             app.launch()
 
     def update_selection(self, new_index: int):
-
-        if self.selected_index != -1 and self.selected_index < len(self.viewport.get_children()):
-            current_button = self.viewport.get_children()[self.selected_index]
-            current_button.get_style_context().remove_class("selected")
-
-        if new_index != -1 and new_index < len(self.viewport.get_children()):
-            new_button = self.viewport.get_children()[new_index]
-            new_button.get_style_context().add_class("selected")
+        if new_index != -1 and new_index < len(self.viewport.items):
             self.selected_index = new_index
-            self.scroll_to_selected(new_button)
         else:
             self.selected_index = -1
-
-    def scroll_to_selected(self, button):
-        def scroll():
-            adj = self.scrolled_window.get_vadjustment()
-            alloc = button.get_allocation()
-            if alloc.height == 0:
-                return False
-
-            y = alloc.y
-            height = alloc.height
-            page_size = adj.get_page_size()
-            current_value = adj.get_value()
-
-            visible_top = current_value
-            visible_bottom = current_value + page_size
-
-            if y < visible_top:
-
-                adj.set_value(y)
-            elif y + height > visible_bottom:
-
-                new_value = y + height - page_size
-                adj.set_value(new_value)
-
-            return False
-        GLib.idle_add(scroll)
+        self.viewport.select(self.selected_index)
 
     def on_search_entry_activate(self, text):
         if text.startswith("="):
@@ -441,14 +343,15 @@ class AppLauncher(Box):
                 exec_shell_command_async(f"python {get_relative_path('../config/config.py')}")
                 self.close_launcher()
             case _:
-                children = self.viewport.get_children()
-                if children:
+                apps = self.viewport.items
+                if apps:
 
                     if text.strip() == "" and self.selected_index == -1:
                         return
                     selected_index = self.selected_index if self.selected_index != -1 else 0
-                    if 0 <= selected_index < len(children):
-                        children[selected_index].clicked()
+                    if 0 <= selected_index < len(apps):
+                        self.launch_app(apps[selected_index])
+                        self.close_launcher()
 
     def on_search_entry_key_press(self, widget, event):
         text = widget.get_text()
@@ -544,15 +447,13 @@ class AppLauncher(Box):
             self.arrange_viewport(text)
 
     def add_selected_app_to_dock(self):
-        """Adds the currently selected application to the dock.json file with comprehensive metadata."""
-        children = self.viewport.get_children()
-        if not children or self.selected_index == -1 or self.selected_index >= len(children):
+        """Pins the currently selected application to the dock with comprehensive metadata."""
+        items = self.viewport.items
+        if not items or self.selected_index == -1 or self.selected_index >= len(items):
             return
 
-        selected_button = children[self.selected_index]
-
-        selected_app = next((app for app in self._all_apps if app.display_name == selected_button.get_child().get_children()[1].props.label), None)
-        if not selected_app:
+        selected_app = items[self.selected_index]
+        if not isinstance(selected_app, DesktopApp):
             return
 
         app_data = {k: v for k, v in {
@@ -564,47 +465,18 @@ class AppLauncher(Box):
             "icon_name": selected_app.icon_name
         }.items() if v is not None}
 
-        config_path = get_relative_path("../config/dock.json")
-        try:
-            with open(config_path, "r") as file:
-                data = json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            data = {"pinned_apps": []}
-
-        already_pinned = False
-        for pinned_app in data.get("pinned_apps", []):
-            if isinstance(pinned_app, dict) and pinned_app.get("name") == app_data["name"]:
-                already_pinned = True
-
-                pinned_app.update(app_data)
-                break
-            elif isinstance(pinned_app, str) and pinned_app == app_data["name"]:
-                already_pinned = True
-
-                data["pinned_apps"].remove(pinned_app)
-                data["pinned_apps"].append(app_data)
-                break
-
-        if not already_pinned:
-            data.setdefault("pinned_apps", []).append(app_data)
-        
-
-        with open(config_path, "w") as file:
-            json.dump(data, file, indent=4)
-            
-
-        Dock.notify_config_change()
+        get_dock_config_store().pin_app(app_data)
 
     def move_selection(self, delta: int):
-        children = self.viewport.get_children()
-        if not children:
+        items = self.viewport.items
+        if not items:
             return
 
         if self.selected_index == -1 and delta == 1:
             new_index = 0
         else:
             new_index = self.selected_index + delta
-        new_index = max(0, min(new_index, len(children) - 1))
+        new_index = max(0, min(new_index, len(items) - 1))
         self.update_selection(new_index)
 
     def save_calc_history(self):
@@ -727,132 +599,18 @@ class AppLauncher(Box):
         self.update_conversion_viewport()
         
     def update_calculator_viewport(self):
-        self.viewport.children = []
-        for item in self.calc_history:
-            btn = self.create_calc_history_button(item)
-            self.viewport.add(btn)
+        self.viewport.set_items(list(self.calc_history))
 
         if self.selected_index >= len(self.calc_history):
             self.selected_index = -1
     
     def update_conversion_viewport(self):
-        self.viewport.children = []
-        for item in self.conversion_history:
-            btn = self.create_conversion_history_button(item)
-            self.viewport.add(btn)
+        self.viewport.set_items(list(self.conversion_history))
         # Don't reset selection index here automatically
         # Ensure selection state stays valid
         if self.selected_index >= len(self.conversion_history):
             self.selected_index = -1
 
-    def create_calc_history_button(self, text: str) -> Button:
-
-        if "=>" in text:
-            parts = text.split("=>")
-            expression = parts[0].strip()
-            result = parts[1].strip()
-            
-
-            display_text = text
-            if len(result) > 50:
-                display_text = f"{expression} => {result[:47]}..."
-                
-            btn = Button(
-                name="slot-button",
-                child=Box(
-                    name="calc-slot-box",
-                    orientation="h",
-                    spacing=10,
-                    children=[
-                        Label(
-                            name="calc-label",
-                            label=display_text,
-                            ellipsization="end",
-                            v_align="center",
-                            h_align="center",
-                        ),
-                    ],
-                ),
-                tooltip_text=text,
-                on_clicked=lambda *_: self.copy_text_to_clipboard(text),
-            )
-        else:
-
-            btn = Button(
-                name="slot-button",
-                child=Box(
-                    name="calc-slot-box",
-                    orientation="h",
-                    spacing=10,
-                    children=[
-                        Label(
-                            name="calc-label",
-                            label=text,
-                            ellipsization="end",
-                            v_align="center",
-                            h_align="center",
-                        ),
-                    ],
-                ),
-                tooltip_text=text,
-                on_clicked=lambda *_: self.copy_text_to_clipboard(text),
-            )
-        return btn
-
-    def create_conversion_history_button(self, text: str) -> Button:
-        # Parse the result to create a more readable display
-        if "=>" in text:
-            parts = text.split("=>")
-            expression = parts[0].strip()
-            result = parts[1].strip()
-            
-            # For very long results, truncate for display but keep full in tooltip
-            display_text = text
-            if len(result) > 50:  # Truncate long results
-                display_text = f"{expression} => {result[:47]}..."
-                
-            btn = Button(
-                name="slot-button",  # reuse existing CSS styling
-                child=Box(
-                    name="calc-slot-box",
-                    orientation="h",
-                    spacing=10,
-                    children=[
-                        Label(
-                            name="calc-label",
-                            label=display_text,
-                            ellipsization="end",
-                            v_align="center",
-                            h_align="center",
-                        ),
-                    ],
-                ),
-                tooltip_text=text,
-                on_clicked=lambda *_: self.copy_text_to_clipboard(text),
-            )
-        else:
-            # Fallback for non-calculation entries
-            btn = Button(
-                name="slot-button",
-                child=Box(
-                    name="calc-slot-box",
-                    orientation="h",
-                    spacing=10,
-                    children=[
-                        Label(
-                            name="calc-label",
-                            label=text,
-                            ellipsization="end",
-                            v_align="center",
-                            h_align="center",
-                        ),
-                    ],
-                ),
-                tooltip_text=text,
-                on_clicked=lambda *_: self.copy_text_to_clipboard(text),
-            )
-        return btn
-    
     def copy_text_to_clipboard(self, text: str):
 
         parts = text.split("=>", 1)
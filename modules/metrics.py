@@ -1,11 +1,8 @@
 import json
 import logging
 import subprocess
-import time
 
 import psutil
-from fabric.core.fabricator import Fabricator
-from fabric.utils.helpers import invoke_repeater
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.widgets.circularprogressbar import CircularProgressBar
@@ -17,12 +14,62 @@ from fabric.widgets.scale import Scale
 from gi.repository import GLib  # type: ignore
 
 import config.data as data
-from modules.upower.upower import UPowerManager
 import modules.icons as icons
+from utils.functions import format_speed
+from services.disk_sampler import IDLE_IO, DiskSampler
+from services.gpu_sampler import GpuSampler
+from services.metrics_exporter import Metric
+from services.net_sampler import SAMPLE_INTERVAL, get_net_rate_sampler
 from services.network import NetworkClient
+from services.pressure import NO_PRESSURE, get_pressure_monitor
+from services.proc_sampler import ProcSampler
+from services.sampler_scheduler import get_sampler_scheduler
+from services.sensors import get_sensor_monitor
+from services.upower import get_upower_service
+from utils.ring_buffer import RingBuffer
+from widgets.sparkline import Sparkline
 
 logger = logging.getLogger(__name__)
 
+# One hour of history at the 2 s metrics interval
+HISTORY_SAMPLES = 1800
+# One hour of history at the 1 s network interval
+NETWORK_HISTORY_SAMPLES = 3600
+
+# Free space barely changes, so disk usage is refreshed on a slow cadence
+DISK_USAGE_INTERVAL = 30
+# Disks busier than this (percent of time with I/O in flight) are shown as saturated
+DISK_SATURATED_BUSY = 90
+
+# Temperature shown as a full scale, in degrees Celsius
+SENSOR_TEMP_MAX = 100.0
+# Fan speed shown as a full scale until a faster one is seen, in RPM
+SENSOR_FAN_MAX = 3000.0
+
+# Processes listed per column in the CPU drill-down
+TOP_PROCESSES = 5
+# Per-core bars per row in the CPU drill-down
+CORES_PER_ROW = 16
+
+
+def format_bytes(value):
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
+def pressure_markup(pressure):
+    return f"stall 10s {pressure.some10:.1f}% · 60s {pressure.some60:.1f}%"
+
+
+def disk_io_markup(io):
+    return (
+        f"R {format_bytes(io.read)}/s · W {format_bytes(io.write)}/s · "
+        f"busy {io.busy:.0f}% · {io.latency:.1f} ms"
+    )
+
 class MetricsProvider:
     """
     Class responsible for obtaining centralized CPU, memory, disk usage, and battery metrics.
@@ -32,76 +79,70 @@ class MetricsProvider:
         self.gpu = []
         self.cpu = 0.0
         self.mem = 0.0
-        self.disk = []
+        self.disk = [0.0 for _ in data.BAR_METRICS_DISKS]
+
+        # Throughput and latency of the devices behind the disk paths, from /proc/diskstats
+        self.disk_sampler = DiskSampler(data.BAR_METRICS_DISKS)
+        self.disk_io = [IDLE_IO for _ in data.BAR_METRICS_DISKS]
+        self._disk_usage_running = False
+
+        # Pressure stall averages; alerts come from kernel triggers, see PressureMonitor
+        self.pressure = get_pressure_monitor()
+        self.psi = {}
+
+        # Temperatures and fans, from sensor files discovered once
+        self.sensors = get_sensor_monitor()
+        self.sensor_values = {}
 
-        self.upower = UPowerManager()
-        self.display_device = self.upower.get_display_device()
-        self.bat_percent = 0.0
-        self.bat_charging = None
-        self.bat_time = 0
+        # Per-core utilization from /proc/stat; processes are only sampled on demand
+        self.proc_sampler = ProcSampler()
+        self.cores = self.proc_sampler.sample_cores()
+        self._process_update_running = False
 
-        # Controller battery tracking
-        self.controllers = []
-        self.controller_data = {}
+        # Per-metric history, oldest samples overwritten after HISTORY_SAMPLES
+        self.cpu_history = RingBuffer(HISTORY_SAMPLES)
+        self.mem_history = RingBuffer(HISTORY_SAMPLES)
+        self.disk_history = [RingBuffer(HISTORY_SAMPLES) for _ in data.BAR_METRICS_DISKS]
+        self._gpu_history = []
 
+        # Battery and controller state is pushed by UPower signals, not sampled
+        self.upower = get_upower_service()
+
+        # Native GPU sampling; nvtop is only forked when no native source covers every GPU
+        self.gpu_sampler = GpuSampler()
         self._gpu_update_running = False
         self._gpu_update_counter = 0
 
-        GLib.timeout_add_seconds(2, self._update)
+        get_sampler_scheduler().register(self._update, 2)
+        self._start_disk_usage_async()
+        get_sampler_scheduler().register(self._start_disk_usage_async, DISK_USAGE_INTERVAL)
 
     def _update(self):
         self.cpu = psutil.cpu_percent(interval=0)
+        self.cores = self.proc_sampler.sample_cores()
         self.mem = psutil.virtual_memory().percent
-        self.disk = [psutil.disk_usage(path).percent for path in data.BAR_METRICS_DISKS]
-
-        self._gpu_update_counter += 1
-        if self._gpu_update_counter >= 5:  # Update GPU every 10 seconds (5 * 2s)
-            self._gpu_update_counter = 0
-            if not self._gpu_update_running:
-                self._start_gpu_update_async()
-
-        # Update main battery
-        battery = self.upower.get_full_device_information(self.display_device)
-        if battery is None:
-            self.bat_percent = 0.0
-            self.bat_charging = None
-            self.bat_time = 0
-        else:
-            self.bat_percent = battery['Percentage']
-            self.bat_charging = battery['State'] == 1
-            self.bat_time = battery['TimeToFull'] if self.bat_charging else battery['TimeToEmpty']
+        self.disk_io = self.disk_sampler.sample()
+        self.psi = self.pressure.sample()
+        self.sensor_values = self.sensors.sample()
 
-        # Update controller batteries
-        self._update_controllers()
+        if self.gpu_sampler.available:
+            self.gpu = self.gpu_sampler.sample()
+        else:
+            self._gpu_update_counter += 1
+            if self._gpu_update_counter >= 5:  # Update GPU every 10 seconds (5 * 2s)
+                self._gpu_update_counter = 0
+                if not self._gpu_update_running:
+                    self._start_gpu_update_async()
+
+        self.cpu_history.append(self.cpu)
+        self.mem_history.append(self.mem)
+        for history, value in zip(self.disk_history, self.disk):
+            history.append(value)
+        for i, value in enumerate(self.gpu):
+            self.gpu_history(i).append(value)
 
         return True
 
-    def _update_controllers(self):
-        """Update controller battery information"""
-        try:
-            current_controllers = self.upower.get_controller_devices()
-            
-            # Update existing controller data
-            for controller in current_controllers:
-                path = controller['path']
-                controller_info = self.upower.get_controller_info(path)
-                
-                if controller_info:
-                    self.controller_data[path] = {
-                        'percentage': controller_info['percentage'],
-                        'charging': controller_info['state'] == 1,  # 1 = charging
-                        'time': controller_info['time_to_full'] if controller_info['state'] == 1 else controller_info['time_to_empty'],
-                        'model': controller_info['model'],
-                        'vendor': controller_info['vendor']
-                    }
-            
-            # Remove disconnected controllers
-            current_paths = {controller['path'] for controller in current_controllers}
-            self.controller_data = {path: data for path, data in self.controller_data.items() if path in current_paths}
-            
-        except Exception as e:
-            logger.error(f"Error updating controllers: {e}")
-
     def _start_gpu_update_async(self):
         """Starts a new GLib thread to run nvtop in the background."""
         self._gpu_update_running = True
@@ -163,13 +204,78 @@ class MetricsProvider:
 
         return False
 
+    def _start_disk_usage_async(self):
+        """Refresh disk usage in a GLib thread, since statvfs can block on slow or network file systems."""
+        if not self._disk_usage_running:
+            self._disk_usage_running = True
+            GLib.Thread.new("disk-usage-thread", lambda _: self._run_disk_usage_in_thread(), None)
+        return True
+
+    def _run_disk_usage_in_thread(self):
+        usage = []
+        for path in data.BAR_METRICS_DISKS:
+            try:
+                usage.append(psutil.disk_usage(path).percent)
+            except OSError as e:
+                logger.warning(f"Error reading disk usage of {path}: {e}")
+                usage.append(0.0)
+        GLib.idle_add(self._set_disk_usage, usage)
+        self._disk_usage_running = False
+
+    def _set_disk_usage(self, usage):
+        self.disk = usage
+        return False
+
+    def update_processes_async(self, callback, top=TOP_PROCESSES):
+        """
+        Sample processes in a GLib thread and call `callback(by_cpu, by_rss)` on the main loop.
+
+        Reading every /proc/[pid]/stat takes a few milliseconds with a
+        thousand processes, so it is kept off the main loop like nvtop.
+        """
+        if self._process_update_running:
+            return
+        self._process_update_running = True
+        GLib.Thread.new("proc-thread", lambda _: self._run_process_sample_in_thread(callback, top), None)
+
+    def _run_process_sample_in_thread(self, callback, top):
+        by_cpu, by_rss = [], []
+        try:
+            by_cpu, by_rss = self.proc_sampler.sample_processes(top)
+        except Exception as e:
+            logger.error(f"Error sampling processes: {e}")
+        self._process_update_running = False
+        GLib.idle_add(callback, by_cpu, by_rss)
+
     def get_metrics(self):
         return (self.cpu, self.mem, self.disk, self.gpu)
 
+    def get_cores(self):
+        return self.cores
+
+    def get_disk_io(self):
+        return self.disk_io
+
+    def get_sensor_values(self):
+        """Sensor key -> degrees Celsius, or RPM for fans."""
+        return self.sensor_values
+
+    def get_pressure(self, resource):
+        """Pressure of 'cpu', 'memory' or 'io', with avg10 and avg60 for some and full stalls."""
+        return self.psi.get(resource, NO_PRESSURE)
+
     def get_battery(self):
-        return (self.bat_percent, self.bat_charging, self.bat_time)
+        return self.upower.get_battery()
+
+    def gpu_history(self, index):
+        """History of GPU `index`, created on first use since GPUs are discovered late with nvtop."""
+        while len(self._gpu_history) <= index:
+            self._gpu_history.append(RingBuffer(HISTORY_SAMPLES))
+        return self._gpu_history[index]
 
     def get_gpu_info(self):
+        if self.gpu_sampler.available:
+            return [{"device_name": name} for name in self.gpu_sampler.device_names()]
         try:
             result = subprocess.check_output(["nvtop", "-s"], text=True, timeout=5)
             return json.loads(result)
@@ -191,7 +297,84 @@ class MetricsProvider:
 
     def get_controllers(self):
         """Get controller battery data"""
-        return self.controller_data
+        return self.upower.get_controllers()
+
+    def snapshot(self):
+        """
+        Latest values as exporter gauges.
+
+        Only reads what the samplers and UPower already hold, so serving a
+        scrape never samples anything by itself.
+        """
+        metrics = [
+            Metric("yzshell_cpu_usage_percent", "CPU usage.", [({}, self.cpu)]),
+            Metric("yzshell_cpu_core_usage_percent", "CPU usage per core.",
+                   [({"core": str(i)}, value) for i, value in enumerate(self.cores)]),
+            Metric("yzshell_memory_usage_percent", "Memory usage.", [({}, self.mem)]),
+        ]
+
+        disks = [
+            ({"path": path, "device": device or ""}, io)
+            for path, device, io in zip(self.disk_sampler.paths, self.disk_sampler.devices, self.disk_io)
+        ]
+        metrics += [
+            Metric("yzshell_disk_usage_percent", "Disk space used.",
+                   [({"path": path}, value) for path, value in zip(data.BAR_METRICS_DISKS, self.disk)]),
+            Metric("yzshell_disk_read_bytes_per_second", "Disk read throughput.",
+                   [(labels, io.read) for labels, io in disks]),
+            Metric("yzshell_disk_write_bytes_per_second", "Disk write throughput.",
+                   [(labels, io.write) for labels, io in disks]),
+            Metric("yzshell_disk_busy_percent", "Time the disk had I/O in flight.",
+                   [(labels, io.busy) for labels, io in disks]),
+            Metric("yzshell_disk_latency_milliseconds", "Average time per completed disk request.",
+                   [(labels, io.latency) for labels, io in disks]),
+            Metric("yzshell_gpu_usage_percent", "GPU usage.",
+                   [({"gpu": str(i)}, value) for i, value in enumerate(self.gpu)]),
+        ]
+
+        for field, help in (
+            ("some10", "Time some tasks stalled on the resource, over 10 s."),
+            ("some60", "Time some tasks stalled on the resource, over 60 s."),
+            ("full10", "Time all non-idle tasks stalled on the resource, over 10 s."),
+            ("full60", "Time all non-idle tasks stalled on the resource, over 60 s."),
+        ):
+            metrics.append(Metric(
+                f"yzshell_pressure_{field[:4]}_avg{field[4:]}_percent", help,
+                [({"resource": resource}, getattr(pressure, field)) for resource, pressure in self.psi.items()],
+            ))
+
+        temperatures, fans = [], []
+        for sensor in self.sensors.sensors:
+            value = self.sensor_values.get(sensor.key)
+            if value is not None:
+                (fans if sensor.kind == "fan" else temperatures).append(
+                    ({"sensor": sensor.key, "label": sensor.label}, value)
+                )
+        metrics += [
+            Metric("yzshell_sensor_celsius", "Temperature sensors.", temperatures),
+            Metric("yzshell_fan_rpm", "Fan speeds.", fans),
+        ]
+
+        percentage, charging, _ = self.get_battery()
+        if charging is not None:
+            metrics += [
+                Metric("yzshell_battery_percent", "Battery charge.", [({}, percentage)]),
+                Metric("yzshell_battery_charging", "Whether the battery is charging.", [({}, float(charging))]),
+            ]
+        metrics.append(Metric(
+            "yzshell_controller_battery_percent", "Controller battery charge.",
+            [({"model": controller['model'], "device": path}, controller['percentage'])
+             for path, controller in self.get_controllers().items()],
+        ))
+
+        rates = get_net_rate_sampler().rates()
+        metrics += [
+            Metric("yzshell_network_receive_bytes_per_second", "Network download rate, smoothed.",
+                   [({"interface": name, "kind": rate.kind}, rate.down) for name, rate in rates.items()]),
+            Metric("yzshell_network_transmit_bytes_per_second", "Network upload rate, smoothed.",
+                   [({"interface": name, "kind": rate.kind}, rate.up) for name, rate in rates.items()]),
+        ]
+        return metrics
 
 shared_provider = MetricsProvider()
 
@@ -221,7 +404,83 @@ class SingularMetric:
             ]
         )
 
-        self.box.set_tooltip_markup(f"{icon} {name}")
+        self.tooltip_markup = f"{icon} {name}"
+        self.box.set_tooltip_markup(self.tooltip_markup)
+
+class CpuDrilldown(Revealer):
+    """Per-core usage and the busiest processes, revealed next to the CPU scale."""
+
+    def __init__(self, **kwargs):
+        self.core_scales = []
+        rows = []
+        for start in range(0, shared_provider.proc_sampler.core_count, CORES_PER_ROW):
+            row = Box(name="cpu-cores-row", orientation="h", spacing=2, v_expand=True)
+            for _ in range(start, min(start + CORES_PER_ROW, shared_provider.proc_sampler.core_count)):
+                scale = Scale(
+                    name="core-usage",
+                    value=0,
+                    orientation='v',
+                    inverted=True,
+                    v_align='fill',
+                    v_expand=True,
+                )
+                scale.set_sensitive(False)
+                self.core_scales.append(scale)
+                row.add(scale)
+            rows.append(row)
+
+        self.by_cpu_label = Label(name="cpu-processes-label", h_align="start", v_align="start", markup="")
+        self.by_rss_label = Label(name="cpu-processes-label", h_align="start", v_align="start", markup="")
+
+        self.content = Box(
+            name="cpu-drilldown",
+            orientation="v",
+            spacing=8,
+            children=[
+                Box(name="cpu-cores", orientation="v", spacing=4, v_expand=True, children=rows),
+                Box(
+                    orientation="h",
+                    spacing=12,
+                    children=[self.by_cpu_label, self.by_rss_label],
+                ),
+            ],
+        )
+
+        super().__init__(
+            name="cpu-drilldown-revealer",
+            transition_duration=250,
+            transition_type="slide-left",
+            child=self.content,
+            child_revealed=False,
+            **kwargs,
+        )
+
+        get_sampler_scheduler().register(self.update, 2, widget=self.content)
+
+    def toggle(self):
+        revealed = not self.get_reveal_child()
+        self.set_reveal_child(revealed)
+        if revealed:
+            self.update()
+
+    def update(self):
+        if not self.get_reveal_child():
+            return True
+        for scale, value in zip(self.core_scales, shared_provider.get_cores()):
+            scale.value = value / 100.0
+        shared_provider.update_processes_async(self._on_processes)
+        return True
+
+    def _on_processes(self, by_cpu, by_rss):
+        cpu_lines = [f"<b>{icons.cpu} CPU</b>"] + [
+            f"{GLib.markup_escape_text(p.name)}  {p.cpu:.0f}%" for p in by_cpu
+        ]
+        rss_lines = [f"<b>{icons.memory} RAM</b>"] + [
+            f"{GLib.markup_escape_text(p.name)}  {format_bytes(p.rss)}" for p in by_rss
+        ]
+        self.by_cpu_label.set_markup("\n".join(cpu_lines))
+        self.by_rss_label.set_markup("\n".join(rss_lines))
+        return False
 
 class Metrics(Box):
     def __init__(self, **kwargs):
@@ -247,10 +506,17 @@ class Metrics(Box):
         self.disk = disks
         self.gpu = gpus
 
+        # Clicking the CPU scale reveals per-core and per-process usage
+        self.cpu_drilldown = CpuDrilldown() if self.cpu else None
+        if self.cpu:
+            self.cpu.box.set_tooltip_markup(f"{icons.cpu} CPU\n<small>Click for cores and processes</small>")
+            self.cpu_button = EventBox(events="button-press", child=self.cpu.box)
+            self.cpu_button.connect("button-press-event", lambda *_: self.cpu_drilldown.toggle())
+
         self.scales = []
         if self.disk: self.scales.extend([v.box for v in self.disk])
         if self.ram: self.scales.append(self.ram.box)
-        if self.cpu: self.scales.append(self.cpu.box)
+        if self.cpu: self.scales.extend([self.cpu_button, self.cpu_drilldown])
         if self.gpu: self.scales.extend([v.box for v in self.gpu])
 
         if self.cpu: self.cpu.usage.set_sensitive(False)
@@ -263,7 +529,29 @@ class Metrics(Box):
         for x in self.scales:
             self.add(x)
 
-        GLib.timeout_add_seconds(2, self.update_status)
+        # Temperatures and fans, rebuilt when sensors are hotplugged
+        self.sensor_metrics = {}
+        self._fan_max = SENSOR_FAN_MAX
+        if visible.get('sensors', True):
+            self.sensor_box = Box(name="metrics-sensors", spacing=8)
+            self.add(self.sensor_box)
+            self._build_sensor_metrics()
+            shared_provider.sensors.changed.connect(self._build_sensor_metrics)
+
+        get_sampler_scheduler().register(self.update_status, 2, widget=self)
+
+    def _build_sensor_metrics(self):
+        for child in self.sensor_box.get_children():
+            child.destroy()
+        self.sensor_metrics = {}
+        for sensor in shared_provider.sensors.sensors:
+            fan = sensor.kind == "fan"
+            metric = SingularMetric("fan" if fan else "temp", sensor.label, icons.fan if fan else icons.temp)
+            metric.usage.set_sensitive(False)
+            self.sensor_box.add(metric.box)
+            self.sensor_metrics[sensor.key] = (sensor, metric)
+        self.sensor_box.set_visible(bool(self.sensor_metrics))
+        self.sensor_box.show_all()
 
     def update_status(self):
         cpu, mem, disks, gpus = shared_provider.get_metrics()
@@ -272,20 +560,47 @@ class Metrics(Box):
             self.cpu.usage.value = cpu / 100.0
         if self.ram:
             self.ram.usage.value = mem / 100.0
+        disk_io = shared_provider.get_disk_io()
         for i, disk in enumerate(self.disk):
 
             if i < len(disks):
                 disk.usage.value = disks[i] / 100.0
+            if i < len(disk_io):
+                tooltip = f"{disk.tooltip_markup}\n<small>{disk_io_markup(disk_io[i])}</small>"
+                if tooltip != disk.box.get_tooltip_markup():
+                    disk.box.set_tooltip_markup(tooltip)
+                if disk_io[i].busy >= DISK_SATURATED_BUSY:
+                    disk.usage.add_style_class("alert")
+                else:
+                    disk.usage.remove_style_class("alert")
         for i, gpu in enumerate(self.gpu):
 
             if i < len(gpus):
                 gpu.usage.value = gpus[i] / 100.0
+
+        values = shared_provider.get_sensor_values()
+        for key, (sensor, metric) in self.sensor_metrics.items():
+            value = values.get(key)
+            if value is None:
+                continue
+            if sensor.kind == "fan":
+                self._fan_max = max(self._fan_max, value)
+                metric.usage.value = value / self._fan_max
+                tooltip = f"{metric.tooltip_markup}: {value:.0f} RPM"
+            else:
+                metric.usage.value = min(value, SENSOR_TEMP_MAX) / SENSOR_TEMP_MAX
+                tooltip = f"{metric.tooltip_markup}: {value:.0f} °C"
+            if tooltip != metric.box.get_tooltip_markup():
+                metric.box.set_tooltip_markup(tooltip)
         return True
 
 class SingularMetricSmall:
-    def __init__(self, id, name, icon):
+    def __init__(self, id, name, icon, history=None, detail=None):
         self.name_markup = name
         self.icon_markup = icon
+        self.history = history
+        # Optional callable returning an extra line of tooltip markup
+        self.detail = detail
 
         self.icon = Label(name="metrics-icon", markup=icon)
         self.circle = CircularProgressBar(
@@ -318,6 +633,17 @@ class SingularMetricSmall:
     def markup(self):
         return f"{self.icon_markup} {self.name_markup}" if not data.VERTICAL else f"{self.icon_markup} {self.name_markup}: {self.level.get_label()}"
 
+    def history_markup(self):
+        """Markup line with the current level and the min/avg/max of the last hour."""
+        stats = self.history.stats() if self.history is not None else None
+        markup = f"{self.icon_markup} {self.name_markup}: {self.level.get_label()}"
+        if stats is not None:
+            low, avg, high = stats
+            markup += f"  <small>1h min {low:.0f}% · avg {avg:.0f}% · max {high:.0f}%</small>"
+        if self.detail is not None:
+            markup += f"\n<small>{self.detail()}</small>"
+        return markup
+
 class MetricsSmall(Button):
     def __init__(self, **kwargs):
         super().__init__(name="metrics-small", **kwargs)
@@ -331,15 +657,21 @@ class MetricsSmall(Button):
         )
 
         visible = getattr(data, "METRICS_SMALL_VISIBLE", {'cpu': True, 'ram': True, 'disk': True, 'gpu': True})
-        disks = [SingularMetricSmall("disk", f"DISK ({path})" if len(data.BAR_METRICS_DISKS) != 1 else "DISK", icons.disk)
-                 for path in data.BAR_METRICS_DISKS] if visible.get('disk', True) else []
+        disks = [SingularMetricSmall("disk", f"DISK ({path})" if len(data.BAR_METRICS_DISKS) != 1 else "DISK", icons.disk,
+                                     shared_provider.disk_history[i],
+                                     lambda i=i: f"{disk_io_markup(shared_provider.get_disk_io()[i])}\n"
+                                                 f"{pressure_markup(shared_provider.get_pressure('io'))}")
+                 for i, path in enumerate(data.BAR_METRICS_DISKS)] if visible.get('disk', True) else []
 
         gpu_info = shared_provider.get_gpu_info()
-        gpus = [SingularMetricSmall(f"gpu", f"GPU ({v['device_name']})" if len(gpu_info) != 1 else "GPU", icons.gpu)
-                for v in gpu_info] if visible.get('gpu', True) else []
-
-        self.cpu = SingularMetricSmall("cpu", "CPU", icons.cpu) if visible.get('cpu', True) else None
-        self.ram = SingularMetricSmall("ram", "RAM", icons.memory) if visible.get('ram', True) else None
+        gpus = [SingularMetricSmall(f"gpu", f"GPU ({v['device_name']})" if len(gpu_info) != 1 else "GPU", icons.gpu,
+                                    shared_provider.gpu_history(i))
+                for i, v in enumerate(gpu_info)] if visible.get('gpu', True) else []
+
+        self.cpu = SingularMetricSmall("cpu", "CPU", icons.cpu, shared_provider.cpu_history,
+                                       lambda: pressure_markup(shared_provider.get_pressure("cpu"))) if visible.get('cpu', True) else None
+        self.ram = SingularMetricSmall("ram", "RAM", icons.memory, shared_provider.mem_history,
+                                       lambda: pressure_markup(shared_provider.get_pressure("memory"))) if visible.get('ram', True) else None
         self.disk = disks
         self.gpu = gpus
 
@@ -360,7 +692,19 @@ class MetricsSmall(Button):
         self.connect("enter-notify-event", self.on_mouse_enter)
         self.connect("leave-notify-event", self.on_mouse_leave)
 
-        GLib.timeout_add_seconds(2, self.update_metrics)
+        # Tooltip with a sparkline per metric, built on first hover
+        self._tooltip_box = None
+        self._tooltip_rows = []
+        self.set_has_tooltip(True)
+        self.connect("query-tooltip", self.on_query_tooltip)
+
+        get_sampler_scheduler().register(self.update_metrics, 2, widget=self)
+
+        # Stalls raise urgent styling as soon as the kernel reports them
+        shared_provider.pressure.changed.connect(self.on_pressure_changed)
+        for resource, alert in shared_provider.pressure.alerts.items():
+            if alert:
+                self.on_pressure_changed(resource, True)
 
         self.hide_timer = None
         self.hover_counter = 0
@@ -414,24 +758,70 @@ class MetricsSmall(Button):
         if self.ram:
             self.ram.circle.set_value(mem / 100.0)
             self.ram.level.set_label(self._format_percentage(int(mem)))
+        disk_io = shared_provider.get_disk_io()
         for i, disk in enumerate(self.disk):
 
             if i < len(disks):
                 disk.circle.set_value(disks[i] / 100.0)
                 disk.level.set_label(self._format_percentage(int(disks[i])))
+            if i < len(disk_io):
+                saturated = disk_io[i].busy >= DISK_SATURATED_BUSY
+                for widget in (disk.circle, disk.icon, disk.level):
+                    if saturated:
+                        widget.add_style_class("alert")
+                    else:
+                        widget.remove_style_class("alert")
         for i, gpu in enumerate(self.gpu):
 
             if i < len(gpus):
                 gpu.circle.set_value(gpus[i] / 100.0)
                 gpu.level.set_label(self._format_percentage(int(gpus[i])))
 
+        return True
+
+    def on_pressure_changed(self, resource, alert):
+        metrics = {
+            "cpu": [self.cpu] if self.cpu else [],
+            "memory": [self.ram] if self.ram else [],
+            "io": self.disk,
+        }.get(resource, [])
+        for metric in metrics:
+            for widget in (metric.circle, metric.icon, metric.level):
+                if alert:
+                    widget.add_style_class("urgent")
+                else:
+                    widget.remove_style_class("urgent")
+
+        if any(shared_provider.pressure.alerts.values()):
+            self.add_style_class("pressure")
+        else:
+            self.remove_style_class("pressure")
+
+    def _tooltip_metrics(self):
         tooltip_metrics = []
         if self.disk: tooltip_metrics.extend(self.disk)
         if self.ram: tooltip_metrics.append(self.ram)
         if self.cpu: tooltip_metrics.append(self.cpu)
         if self.gpu: tooltip_metrics.extend(self.gpu)
-        self.set_tooltip_markup((" - " if not data.VERTICAL else "\n").join([v.markup() for v in tooltip_metrics]))
-
+        return tooltip_metrics
+
+    def on_query_tooltip(self, widget, x, y, keyboard_mode, tooltip):
+        if self._tooltip_box is None:
+            self._tooltip_box = Box(name="metrics-tooltip", orientation="v", spacing=4)
+            for metric in self._tooltip_metrics():
+                label = Label(name="metrics-tooltip-label", h_align="start")
+                sparkline = Sparkline(metric.history) if metric.history is not None else None
+                self._tooltip_box.add(label)
+                if sparkline is not None:
+                    self._tooltip_box.add(sparkline)
+                self._tooltip_rows.append((metric, label, sparkline))
+            self._tooltip_box.show_all()
+
+        for metric, label, sparkline in self._tooltip_rows:
+            label.set_markup(metric.history_markup())
+            if sparkline is not None:
+                sparkline.queue_draw()
+        tooltip.set_custom(self._tooltip_box)
         return True
 
 class Battery(Button):
@@ -479,14 +869,9 @@ class Battery(Button):
         self.connect("enter-notify-event", self.on_mouse_enter)
         self.connect("leave-notify-event", self.on_mouse_leave)
 
-        self.batt_fabricator = Fabricator(
-            poll_from=lambda v: shared_provider.get_battery(),
-            on_changed=lambda f, v: self.update_battery,
-            interval=1000,
-            stream=False,
-            default_value=0
+        shared_provider.upower.connect(
+            "battery-changed", lambda *_: self.update_battery(None, shared_provider.get_battery())
         )
-        self.batt_fabricator.changed.connect(self.update_battery)
         GLib.idle_add(self.update_battery, None, shared_provider.get_battery())
 
         self.hide_timer = None
@@ -583,8 +968,7 @@ class ControllerBattery(Box):
         # Start with container hidden
         self.set_visible(False)
 
-        # Poll for controller updates
-        GLib.timeout_add_seconds(2, self._update_controller_widgets)
+        shared_provider.upower.connect("controllers-changed", lambda *_: self._update_controller_widgets())
         GLib.idle_add(self._update_controller_widgets)
 
     def _update_controller_widgets(self):
@@ -847,102 +1231,106 @@ class NetworkApplet(Button):
             self.upload_icon.set_margin_top(4)
             self.download_icon.set_margin_bottom(4)
 
-        self.last_counters = psutil.net_io_counters()
-        self.last_time = time.time()
-        invoke_repeater(1000, self.update_network)
+        self.download_history = RingBuffer(NETWORK_HISTORY_SAMPLES)
+        self.upload_history = RingBuffer(NETWORK_HISTORY_SAMPLES)
+        # Last applied markup, so labels are only touched when what they show changes
+        self._shown = {}
+        self.set_has_tooltip(True)
+        self.connect("query-tooltip", self.on_query_tooltip)
+        self.net_rates = get_net_rate_sampler()
+        get_sampler_scheduler().register(self.update_network, SAMPLE_INTERVAL, widget=self)
 
         self.connect("enter-notify-event", self.on_mouse_enter)
         self.connect("leave-notify-event", self.on_mouse_leave)
 
-    def update_network(self):
-        current_time = time.time()
-        elapsed = current_time - self.last_time
-        current_counters = psutil.net_io_counters()
-        download_speed = (current_counters.bytes_recv - self.last_counters.bytes_recv) / elapsed
-        upload_speed = (current_counters.bytes_sent - self.last_counters.bytes_sent) / elapsed
-        download_str = self.format_speed(download_speed)
-        upload_str = self.format_speed(upload_speed)
-        self.download_label.set_markup(download_str)
-        self.upload_label.set_markup(upload_str)
-
-        self.downloading = (download_speed >= 10e6)
-        self.uploading = (upload_speed >= 2e6)
-
-        if not self.is_mouse_over:
-            if self.downloading:
-                self.download_urgent()
-            elif self.uploading:
-                self.upload_urgent()
-            else:
-                self.remove_urgent()
+    def _set_markup(self, label, markup):
+        if self._shown.get(label) != markup:
+            self._shown[label] = markup
+            label.set_markup(markup)
 
-        show_download = self.downloading or (self.is_mouse_over and not data.VERTICAL)
-        show_upload = self.uploading or (self.is_mouse_over and not data.VERTICAL)
-        self.download_revealer.set_reveal_child(show_download)
-        self.upload_revealer.set_reveal_child(show_upload)
+    def update_network(self):
+        rate = self.net_rates.primary_rate()
+        download_speed = rate.down
+        upload_speed = rate.up
+        self.download_history.append(download_speed)
+        self.upload_history.append(upload_speed)
+        self._set_markup(self.download_label, self.format_speed(download_speed))
+        self._set_markup(self.upload_label, self.format_speed(upload_speed))
+
+        downloading = (download_speed >= 10e6)
+        uploading = (upload_speed >= 2e6)
+        if (downloading, uploading) != (self.downloading, self.uploading):
+            self.downloading = downloading
+            self.uploading = uploading
+            if not self.is_mouse_over:
+                if self.downloading:
+                    self.download_urgent()
+                elif self.uploading:
+                    self.upload_urgent()
+                else:
+                    self.remove_urgent()
 
-        primary_device = None
-        if self.network_client:
-            primary_device = self.network_client.primary_device
+            show_download = self.downloading or (self.is_mouse_over and not data.VERTICAL)
+            show_upload = self.uploading or (self.is_mouse_over and not data.VERTICAL)
+            self.download_revealer.set_reveal_child(show_download)
+            self.upload_revealer.set_reveal_child(show_upload)
 
-        tooltip_base = ""
-        tooltip_vertical = ""
+        self._set_markup(self.wifi_label, self._connection_icon())
 
+    def _connection_icon(self):
+        primary_device = self.network_client.primary_device if self.network_client else None
         if primary_device == "wired" and self.network_client.ethernet_device:
-            ethernet_state = self.network_client.ethernet_device.internet
-
-            if ethernet_state == "activated":
-                self.wifi_label.set_markup(icons.world)
-            elif ethernet_state == "activating":
-                self.wifi_label.set_markup(icons.world)
-            else:
-                self.wifi_label.set_markup(icons.world_off)
-
-            tooltip_base = "Ethernet Connection"
-            tooltip_vertical = f"SSID: Ethernet\nUpload: {upload_str}\nDownload: {download_str}"
-
-        elif self.network_client and self.network_client.wifi_device:
+            if self.network_client.ethernet_device.internet in ("activated", "activating"):
+                return icons.world
+            return icons.world_off
+        if self.network_client and self.network_client.wifi_device:
             if self.network_client.wifi_device.ssid != "Disconnected":
                 strength = self.network_client.wifi_device.strength
-
                 if strength >= 75:
-                    self.wifi_label.set_markup(icons.wifi_3)
+                    return icons.wifi_3
                 elif strength >= 50:
-                    self.wifi_label.set_markup(icons.wifi_2)
+                    return icons.wifi_2
                 elif strength >= 25:
-                    self.wifi_label.set_markup(icons.wifi_1)
-                else:
-                    self.wifi_label.set_markup(icons.wifi_0)
-
-                tooltip_base = self.network_client.wifi_device.ssid
-                tooltip_vertical = f"SSID: {self.network_client.wifi_device.ssid}\nUpload: {upload_str}\nDownload: {download_str}"
-            else:
-                self.wifi_label.set_markup(icons.world_off)
-                tooltip_base = "Disconnected"
-                tooltip_vertical = f"SSID: Disconnected\nUpload: {upload_str}\nDownload: {download_str}"
-        else:
-            self.wifi_label.set_markup(icons.world_off)
-            tooltip_base = "Disconnected"
-            tooltip_vertical = f"SSID: Disconnected\nUpload: {upload_str}\nDownload: {download_str}"
+                    return icons.wifi_1
+                return icons.wifi_0
+        return icons.world_off
 
+    def _connection_name(self):
+        primary_device = self.network_client.primary_device if self.network_client else None
+        if primary_device == "wired" and self.network_client.ethernet_device:
+            return "Ethernet Connection", "Ethernet"
+        if self.network_client and self.network_client.wifi_device:
+            ssid = self.network_client.wifi_device.ssid
+            return ssid, ssid
+        return "Disconnected", "Disconnected"
+
+    def on_query_tooltip(self, widget, x, y, keyboard_mode, tooltip):
+        # Built on hover only, since the history summary changes every sample
+        tooltip_base, ssid = self._connection_name()
+        history = self.history_summary()
         if data.VERTICAL:
-            self.set_tooltip_text(tooltip_vertical)
+            rate = self.net_rates.primary_rate()
+            tooltip.set_text(
+                f"SSID: {ssid}\nUpload: {self.format_speed(rate.up)}\n"
+                f"Download: {self.format_speed(rate.down)}\n{history}"
+            )
         else:
-            self.set_tooltip_text(tooltip_base)
-
-        self.last_counters = current_counters
-        self.last_time = current_time
+            tooltip.set_text(f"{tooltip_base}\n{history}")
         return True
 
+    def history_summary(self):
+        """Average and peak speeds over the last hour."""
+        down = self.download_history.stats()
+        up = self.upload_history.stats()
+        if down is None or up is None:
+            return ""
+        return (
+            f"1h avg: ↓ {self.format_speed(down[1])} ↑ {self.format_speed(up[1])}\n"
+            f"1h peak: ↓ {self.format_speed(down[2])} ↑ {self.format_speed(up[2])}"
+        )
+
     def format_speed(self, speed):
-        # Convert bytes to bits and then to megabits
-        speed_bits = speed * 8  # Convert bytes to bits
-        if speed_bits < 1000:
-            return f"{speed_bits:.0f} bps"
-        elif speed_bits < 1000000:
-            return f"{speed_bits / 1000:.1f} Kbps"
-        else:
-            return f"{speed_bits / 1000000:.1f} Mbps"
+        return format_speed(speed)
 
     def on_mouse_enter(self, *_):
         self.is_mouse_over = True
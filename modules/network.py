@@ -13,7 +13,10 @@ from fabric.widgets.entry import Entry
 from gi.repository import NM, GLib, Gtk
 
 import modules.icons as icons
+from services.net_sampler import SAMPLE_INTERVAL, get_net_rate_sampler
 from services.network import NetworkClient
+from services.sampler_scheduler import get_sampler_scheduler
+from utils.functions import format_speed
 
 
 def group_access_points_by_ssid(access_points):
@@ -203,7 +206,14 @@ class NetworkConnections(Box):
             propagate_height=False,
         )
 
+        # Throughput of every active interface, VPN tunnels included
+        self.rates_label = Label(name="network-rates-label", h_align="center", markup="")
+        self.net_rates = get_net_rate_sampler()
+        # Paused while the dashboard page is hidden, dropped with the widget
+        get_sampler_scheduler().register(self._update_rates, SAMPLE_INTERVAL, widget=self)
+
         self.add(header_box)
+        self.add(self.rates_label)
         self.add(self.status_label)
         self.add(scrolled_window)
 
@@ -211,6 +221,16 @@ class NetworkConnections(Box):
         self.wifi_toggle_button.set_sensitive(False)
         self.refresh_button.set_sensitive(False)
 
+    def _update_rates(self):
+        parts = []
+        for name, rate in self.net_rates.rates().items():
+            label = f"{name} (VPN)" if rate.kind == "vpn" else name
+            parts.append(f"{GLib.markup_escape_text(label)} ↓ {format_speed(rate.down)} ↑ {format_speed(rate.up)}")
+        markup = "  ·  ".join(parts)
+        if markup != self.rates_label.get_label():
+            self.rates_label.set_markup(markup)
+        self.rates_label.set_visible(bool(parts))
+
     def _on_device_ready(self, _client):
 
         if self.network_client.wifi_device:
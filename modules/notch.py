@@ -1,5 +1,5 @@
 from fabric.hyprland.widgets import HyprlandActiveWindow as ActiveWindow
-from fabric.utils.helpers import FormattedString, get_desktop_applications
+from fabric.utils.helpers import FormattedString
 from fabric.widgets.box import Box
 from fabric.widgets.centerbox import CenterBox
 from fabric.widgets.image import Image
@@ -19,8 +19,10 @@ from modules.player import PlayerSmall
 from modules.power import PowerMenu
 from modules.tmux import TmuxManager
 from modules.tools import Toolbox
+from services.desktop_catalog import get_desktop_catalog
+from services.hyprland_state import get_hyprland_state
+from services.occlusion import get_occlusion_service
 from utils.icon_resolver import IconResolver
-from utils.occlusion import check_occlusion
 from widgets.wayland import WaylandWindow as Window
 
 
@@ -149,10 +151,14 @@ class Notch(Window):
         self._prevent_occlusion = False
         self._occlusion_timer_id = None
         self._forced_occlusion = False
+        self._occluded = False
 
         self.icon_resolver = IconResolver()
-        self._all_apps = get_desktop_applications()
+        self.store = get_hyprland_state()
+        self.catalog = get_desktop_catalog()
+        self._all_apps = self.catalog.get_apps()
         self.app_identifiers = self._build_app_identifiers_map()
+        self.catalog.changed.connect(self._on_catalog_changed)
 
         self.dashboard = Dashboard(notch=self)
         self.nhistory = self.dashboard.widgets.notification_history
@@ -164,12 +170,18 @@ class Notch(Window):
         self.btdevices.set_visible(False)
         self.nwconnections.set_visible(False)
 
-        self.launcher = AppLauncher(notch=self)
-        self.overview = Overview(monitor_id=monitor_id)
-        self.emoji = EmojiPicker(notch=self)
+        # Heavy modules are built the first time they are opened
+        self._module_factories = {
+            "launcher": lambda: AppLauncher(notch=self),
+            "overview": lambda: Overview(monitor_id=monitor_id),
+            "emoji": lambda: EmojiPicker(notch=self),
+            "tmux": lambda: TmuxManager(notch=self),
+            "cliphist": lambda: ClipHistory(notch=self),
+        }
+        self._modules = {}
+        self._module_sizes = {}
+
         self.power = PowerMenu(notch=self)
-        self.tmux = TmuxManager(notch=self)
-        self.cliphist = ClipHistory(notch=self)
 
         self.window_label = Label(
             name="notch-window-label",
@@ -204,10 +216,12 @@ class Notch(Window):
             lambda widget, event: (self.open_notch("dashboard"), False)[1],
         )
 
-        self.active_window.connect("notify::label", self.update_window_icon)
+        # Driven by the state store rather than the label, so the window
+        # class is already up to date when these run
+        self.store.active_window_changed.connect(self.update_window_icon)
 
         if data.PANEL_THEME == "Notch":
-            self.active_window.connect("notify::label", self.on_active_window_changed)
+            self.store.active_window_changed.connect(self.on_active_window_changed)
 
         self.active_window.get_children()[0].set_hexpand(True)
         self.active_window.get_children()[0].set_halign(Gtk.Align.FILL)
@@ -273,14 +287,9 @@ class Notch(Window):
             transition_duration=250,
             children=[
                 self.compact,
-                self.launcher,
                 self.dashboard,
-                self.overview,
-                self.emoji,
                 self.power,
                 self.tools,
-                self.tmux,
-                self.cliphist,
             ],
         )
 
@@ -294,16 +303,20 @@ class Notch(Window):
             data.PANEL_POSITION in ["Start", "End"] and data.PANEL_THEME == "Panel"
         ):
             self.compact.set_size_request(260, 40)
-            self.launcher.set_size_request(320, 635)
-            self.tmux.set_size_request(320, 635)
-            self.cliphist.set_size_request(320, 635)
+            self._module_sizes = {
+                "launcher": (320, 635),
+                "tmux": (320, 635),
+                "cliphist": (320, 635),
+            }
             self.dashboard.set_size_request(410, 900)
 
         else:
             self.compact.set_size_request(260, 40)
-            self.launcher.set_size_request(480, 244)
-            self.tmux.set_size_request(480, 244)
-            self.cliphist.set_size_request(480, 244)
+            self._module_sizes = {
+                "launcher": (480, 244),
+                "tmux": (480, 244),
+                "cliphist": (480, 244),
+            }
             self.dashboard.set_size_request(1093, 472)
 
         self.stack.set_interpolate_size(True)
@@ -425,21 +438,62 @@ class Notch(Window):
 
         self._current_window_class = self._get_current_window_class()
 
-        # Always enable occlusion detection for fullscreen windows
-        GLib.timeout_add(500, self._check_occlusion)
-
         if data.PANEL_THEME == "Notch":
             self.notch_revealer.set_reveal_child(True)
         else:
             self.notch_revealer.set_reveal_child(False)
 
+        # Always enable occlusion detection for fullscreen windows.
+        # The occlusion service pushes changes, so there is nothing to poll.
+        self._occlusion_watch_id = get_occlusion_service().watch(
+            self.monitor_id, ("top", 40), self._on_occlusion_changed
+        )
+
         self.connect("key-press-event", self.on_key_press)
 
+    @property
+    def launcher(self):
+        return self._get_module("launcher")
+
+    @property
+    def overview(self):
+        return self._get_module("overview")
+
+    @property
+    def emoji(self):
+        return self._get_module("emoji")
+
+    @property
+    def tmux(self):
+        return self._get_module("tmux")
+
+    @property
+    def cliphist(self):
+        return self._get_module("cliphist")
+
+    def _get_module(self, name):
+        """Return a notch module, building it into the stack on first use."""
+        module = self._modules.get(name)
+        if module is None:
+            module = self._module_factories[name]()
+            self._modules[name] = module
+            if name in self._module_sizes:
+                module.set_size_request(*self._module_sizes[name])
+            self.stack.add(module)
+            module.show_all()
+        return module
+
+    def _is_module_visible(self, name):
+        """Check if a module is the visible stack child, without building it."""
+        module = self._modules.get(name)
+        return module is not None and self.stack.get_visible_child() == module
+
     def on_button_enter(self, widget, event):
         self.is_hovered = True
         window = widget.get_window()
         if window:
             window.set_cursor(Gdk.Cursor(Gdk.CursorType.HAND2))
+        self._check_occlusion()
         return True
 
     def on_button_leave(self, widget, event):
@@ -450,6 +504,7 @@ class Notch(Window):
         window = widget.get_window()
         if window:
             window.set_cursor(None)
+        self._check_occlusion()
         return True
 
     def _on_realize(self, widget):
@@ -461,6 +516,8 @@ class Notch(Window):
         self.is_hovered = True
         if data.PANEL_THEME == "Notch" and data.BAR_POSITION != "Top":
             self.notch_revealer.set_reveal_child(True)
+        elif self._forced_occlusion:
+            self._check_occlusion()
         return False
 
     def on_notch_hover_area_leave(self, widget, event):
@@ -470,6 +527,7 @@ class Notch(Window):
             return False
 
         self.is_hovered = False
+        self._check_occlusion()
 
         return False
 
@@ -497,6 +555,8 @@ class Notch(Window):
             else:
                 self.set_margin("-40px 8px 8px 8px")
 
+        self._check_occlusion()
+
     def open_notch(self, widget_name: str):
         # Debug info for troubleshooting
         if hasattr(self, '_debug_monitor_focus') and self._debug_monitor_focus:
@@ -623,19 +683,11 @@ class Notch(Window):
                 self.applet_stack.set_visible_child(self.nhistory)
                 return
 
-        dashboard_sections_map = {
-            "pins": self.dashboard.pins,
-            "kanban": self.dashboard.kanban,
-            "wallpapers": self.dashboard.wallpapers,
-            "weather": self.dashboard.weather_forecast,
-            "mixer": self.dashboard.mixer,
-        }
-        if widget_name in dashboard_sections_map:
-            section_widget_instance = dashboard_sections_map[widget_name]
-
+        dashboard_sections = ["pins", "kanban", "wallpapers", "weather", "mixer"]
+        if widget_name in dashboard_sections:
             if (
                 is_dashboard_currently_visible
-                and self.dashboard.stack.get_visible_child() == section_widget_instance
+                and self.dashboard.stack.get_visible_child_name() == widget_name
             ):
                 self.close_notch()
                 return
@@ -646,13 +698,14 @@ class Notch(Window):
 
         hide_bar_revealers = False
 
+        # Configs are built on demand so only the requested module is created
         widget_configs = {
-            "tmux": {"instance": self.tmux, "action": self.tmux.open_manager},
-            "cliphist": {
+            "tmux": lambda: {"instance": self.tmux, "action": self.tmux.open_manager},
+            "cliphist": lambda: {
                 "instance": self.cliphist,
                 "action": lambda: GLib.idle_add(self.cliphist.open),
             },
-            "launcher": {
+            "launcher": lambda: {
                 "instance": self.launcher,
                 "action": self.launcher.open_launcher,
                 "focus": lambda: (
@@ -660,7 +713,7 @@ class Notch(Window):
                     self.launcher.search_entry.grab_focus(),
                 ),
             },
-            "emoji": {
+            "emoji": lambda: {
                 "instance": self.emoji,
                 "action": self.emoji.open_picker,
                 "focus": lambda: (
@@ -668,13 +721,13 @@ class Notch(Window):
                     self.emoji.search_entry.grab_focus(),
                 ),
             },
-            "overview": {"instance": self.overview, "hide_revealers": True},
-            "power": {"instance": self.power},
-            "tools": {"instance": self.tools},
+            "overview": lambda: {"instance": self.overview, "hide_revealers": True},
+            "power": lambda: {"instance": self.power},
+            "tools": lambda: {"instance": self.tools},
         }
 
         if widget_name in widget_configs:
-            config = widget_configs[widget_name]
+            config = widget_configs[widget_name]()
             target_widget_on_stack = config["instance"]
             action_on_open = config.get("action")
             focus_action = config.get("focus")
@@ -702,7 +755,7 @@ class Notch(Window):
             elif widget_name == "network_applet":
                 self.dashboard.go_to_section("widgets")
                 self.applet_stack.set_visible_child(self.nwconnections)
-            elif widget_name in dashboard_sections_map:
+            elif widget_name in dashboard_sections:
                 self.dashboard.go_to_section(widget_name)
             elif widget_name == "dashboard":
                 self.dashboard.go_to_section("widgets")
@@ -785,8 +838,6 @@ class Notch(Window):
             label.set_halign(Gtk.Align.FILL)
             label.queue_resize()
 
-            self.update_window_icon()
-
     def _build_app_identifiers_map(self):
         """Build a mapping of app identifiers (class names, executables, names) to DesktopApp objects"""
         identifiers = {}
@@ -810,74 +861,56 @@ class Notch(Window):
 
         return identifiers
 
+    def _on_catalog_changed(self):
+        self._all_apps = self.catalog.get_apps()
+        self.app_identifiers = self._build_app_identifiers_map()
+        self.update_window_icon()
+
     def find_app(self, app_id: str):
         """Find a DesktopApp object by various identifiers using the pre-built map."""
         normalized_id = app_id.lower()
         return self.app_identifiers.get(normalized_id)
 
     def update_window_icon(self, *args):
-        """Update the window icon based on the current active window title"""
-
-        label_widget = self.active_window.get_children()[0]
-        if not isinstance(label_widget, Gtk.Label):
-            return
+        """Update the window icon based on the current active window"""
 
-        title = label_widget.get_text()
-        if title == "Desktop" or not title:
+        app_id = self.store.get_active_window_class()
+        if not app_id:
             self.window_icon.set_visible(False)
             return
 
         self.window_icon.set_visible(True)
 
-        from fabric.hyprland.widgets import get_hyprland_connection
-
-        conn = get_hyprland_connection()
-        if conn:
-            try:
-                import json
-
-                active_window_json = conn.send_command("j/activewindow").reply.decode()
-                active_window_data = json.loads(active_window_json)
-                app_id = active_window_data.get(
-                    "initialClass", ""
-                ) or active_window_data.get("class", "")
-
-                icon_size = 20
-                desktop_app = self.find_app(app_id)
+        try:
+            icon_size = 20
+            desktop_app = self.find_app(app_id)
 
-                icon_pixbuf = None
-                if desktop_app:
-                    icon_pixbuf = desktop_app.get_icon_pixbuf(size=icon_size)
+            icon_pixbuf = None
+            if desktop_app:
+                icon_pixbuf = self.icon_resolver.get_desktop_app_pixbuf(desktop_app, icon_size)
 
-                if not icon_pixbuf:
-                    icon_pixbuf = self.icon_resolver.get_icon_pixbuf(app_id, icon_size)
+            if not icon_pixbuf:
+                icon_pixbuf = self.icon_resolver.get_icon_pixbuf(app_id, icon_size)
 
-                if not icon_pixbuf and "-" in app_id:
-                    base_app_id = app_id.split("-")[0]
-                    icon_pixbuf = self.icon_resolver.get_icon_pixbuf(
-                        base_app_id, icon_size
-                    )
+            if not icon_pixbuf and "-" in app_id:
+                base_app_id = app_id.split("-")[0]
+                icon_pixbuf = self.icon_resolver.get_icon_pixbuf(
+                    base_app_id, icon_size
+                )
 
-                if icon_pixbuf:
-                    self.window_icon.set_from_pixbuf(icon_pixbuf)
-                else:
-                    try:
-                        self.window_icon.set_from_icon_name(
-                            "application-x-executable", 20
-                        )
-                    except:
-                        self.window_icon.set_from_icon_name(
-                            "application-x-executable-symbolic", 20
-                        )
-            except Exception as e:
-                print(f"Error updating window icon: {e}")
+            if icon_pixbuf:
+                self.window_icon.set_from_pixbuf(icon_pixbuf)
+            else:
                 try:
-                    self.window_icon.set_from_icon_name("application-x-executable", 20)
+                    self.window_icon.set_from_icon_name(
+                        "application-x-executable", 20
+                    )
                 except:
                     self.window_icon.set_from_icon_name(
                         "application-x-executable-symbolic", 20
                     )
-        else:
+        except Exception as e:
+            print(f"Error updating window icon: {e}")
             try:
                 self.window_icon.set_from_icon_name("application-x-executable", 20)
             except:
@@ -885,32 +918,32 @@ class Notch(Window):
                     "application-x-executable-symbolic", 20
                 )
 
+    def _on_occlusion_changed(self, is_occluded: bool):
+        """Called by the occlusion service when the top 40px of this monitor change state."""
+        self._occluded = is_occluded
+        self._check_occlusion()
+
     def _check_occlusion(self):
         """
-        Check if top 40px of the screen is occluded by any window
-        and update the notch_revealer accordingly.
+        Update the notch_revealer from the last known occlusion state
+        of the top 40px of the screen.
         """
 
-        occlusion_edge = "top"
-        occlusion_size = 40
-
         if self._forced_occlusion:
             # When forced occlusion is active, show only on hover
             self.notch_revealer.set_reveal_child(self.is_hovered)
         elif not (self.is_hovered or self._is_notch_open or self._prevent_occlusion):
-            is_occluded = check_occlusion((occlusion_edge, occlusion_size))
-            self.notch_revealer.set_reveal_child(not is_occluded)
+            self.notch_revealer.set_reveal_child(not self._occluded)
 
-        return True
+        return False
     
     def force_occlusion(self):
         """Force notch to occlusion mode (hidden)."""
         self._forced_occlusion = True
         self._prevent_occlusion = False
         self.notch_revealer.set_reveal_child(False)
-        # Start occlusion check timer if in vertical mode (left/right)
         if data.BAR_POSITION in ["Left", "Right"]:
-            GLib.timeout_add(100, self._check_occlusion)
+            self._check_occlusion()
     
     def restore_from_occlusion(self):
         """Restore notch from occlusion mode."""
@@ -919,26 +952,15 @@ class Notch(Window):
         if data.PANEL_THEME == "Notch":
             if data.BAR_POSITION == "Top":
                 self.notch_revealer.set_reveal_child(True)
+                # Briefly show the notch, then fall back to the occlusion state
+                GLib.timeout_add(500, self._check_occlusion)
             else:
                 self._prevent_occlusion = False
+                self._check_occlusion()
 
     def _get_current_window_class(self):
         """Get the class of the currently active window"""
-        try:
-            from fabric.hyprland.widgets import get_hyprland_connection
-
-            conn = get_hyprland_connection()
-            if conn:
-                import json
-
-                active_window_json = conn.send_command("j/activewindow").reply.decode()
-                active_window_data = json.loads(active_window_json)
-                return active_window_data.get(
-                    "initialClass", ""
-                ) or active_window_data.get("class", "")
-        except Exception as e:
-            print(f"Error getting window class: {e}")
-        return ""
+        return self.store.get_active_window_class()
 
     def on_active_window_changed(self, *args):
         """
@@ -970,6 +992,7 @@ class Notch(Window):
 
         self._prevent_occlusion = False
         self._occlusion_timer_id = None
+        self._check_occlusion()
 
         return False
 
@@ -981,7 +1004,7 @@ class Notch(Window):
         if initial_text:
             self._typed_chars_buffer = initial_text
 
-        if self.stack.get_visible_child() == self.launcher:
+        if self._is_module_visible("launcher"):
             current_text = self.launcher.search_entry.get_text()
             self.launcher.search_entry.set_text(current_text + initial_text)
 
@@ -1003,16 +1026,7 @@ class Notch(Window):
             "tmux",
         ]:
             self.stack.remove_style_class(style)
-        for w in [
-            self.launcher,
-            self.dashboard,
-            self.overview,
-            self.emoji,
-            self.power,
-            self.tools,
-            self.tmux,
-            self.cliphist,
-        ]:
+        for w in [self.dashboard, self.power, self.tools, *self._modules.values()]:
             w.remove_style_class("open")
 
         self.stack.add_style_class("launcher")
@@ -1112,7 +1126,7 @@ class Notch(Window):
                 calendar_stack.get_visible_child() == self.dashboard.widgets.vpn_prompt):
                 return False  # Let the VPN password prompt handle typing
 
-            if self.stack.get_visible_child() == self.launcher:
+            if self._is_module_visible("launcher"):
                 return False
 
             keyval = event.keyval
@@ -1,21 +1,20 @@
 # Thanks to https://github.com/muhchaudhary for the original code. You are a legend.
-import json
 
 import cairo
 import gi
-from fabric.hyprland.service import Hyprland
-from fabric.utils.helpers import get_desktop_applications
+from fabric.hyprland.widgets import get_hyprland_connection
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.widgets.eventbox import EventBox
 from fabric.widgets.image import Image
 from fabric.widgets.label import Label
 from fabric.widgets.overlay import Overlay
-from loguru import logger
 
 import config.data as data
 import modules.icons as icons
-# WIP icon resolver (app_id to guessing the icon name)
+from services.app_resolver import get_app_resolver
+from services.hyprland_state import get_hyprland_state
+from services.window_previews import get_window_preview_service
 from utils.icon_resolver import IconResolver
 
 gi.require_version("Gtk", "3.0")
@@ -26,7 +25,7 @@ CURRENT_WIDTH = screen.get_width()
 CURRENT_HEIGHT = screen.get_height()
 
 icon_resolver = IconResolver()
-connection = Hyprland()
+connection = get_hyprland_connection()
 BASE_SCALE = 0.1  # Base scale factor for overview
 
 # Credit to Aylur for the drag and drop code
@@ -48,6 +47,28 @@ def createSurfaceFromWidget(widget: Gtk.Widget) -> cairo.ImageSurface:
     return surface
 
 
+class WindowPreview(Gtk.DrawingArea):
+    """A window's cached thumbnail, scaled to fit; empty until the first capture."""
+
+    def __init__(self, address: str, previews):
+        super().__init__(hexpand=True, vexpand=True)
+        self.address = address
+        self.previews = previews
+        self.connect("draw", self.on_draw)
+
+    def on_draw(self, widget, cr):
+        surface = self.previews.get(self.address)
+        if surface is None:
+            return False
+        width, height = self.get_allocated_width(), self.get_allocated_height()
+        scale = min(width / surface.get_width(), height / surface.get_height())
+        cr.translate((width - surface.get_width() * scale) / 2, (height - surface.get_height() * scale) / 2)
+        cr.scale(scale, scale)
+        cr.set_source_surface(surface, 0, 0)
+        cr.paint()
+        return False
+
+
 class HyprlandWindowButton(Button):
     def __init__(
         self,
@@ -70,12 +91,12 @@ class HyprlandWindowButton(Button):
         icon_size_main = int(min(self.size) * 0.5)  # adjust factor as needed
 
         # Enhanced icon resolution using desktop apps
-        desktop_app = window.find_app(app_id)
+        desktop_app = get_app_resolver().find_app(app_id, fuzzy=False)
         
         # Get icon using improved method with fallbacks
         icon_pixbuf = None
         if desktop_app:
-            icon_pixbuf = desktop_app.get_icon_pixbuf(size=icon_size_main)
+            icon_pixbuf = icon_resolver.get_desktop_app_pixbuf(desktop_app, icon_size_main)
         
         if not icon_pixbuf:
             # Fallback to IconResolver
@@ -86,18 +107,22 @@ class HyprlandWindowButton(Button):
             icon_pixbuf = icon_resolver.get_icon_pixbuf("application-x-executable-symbolic", icon_size_main)
             if not icon_pixbuf:
                 icon_pixbuf = icon_resolver.get_icon_pixbuf("image-missing", icon_size_main)
-                
-        # Ensure icon is scaled to the correct size
-        if icon_pixbuf and (icon_pixbuf.get_width() != icon_size_main or icon_pixbuf.get_height() != icon_size_main):
-            icon_pixbuf = icon_pixbuf.scale_simple(
-                icon_size_main, 
-                icon_size_main, 
-                gi.repository.GdkPixbuf.InterpType.BILINEAR
-            )
+
+
+        # The icon sits over the live thumbnail, and moves to the bottom once there is one
+        self.preview = None
+        self.icon = Image(pixbuf=icon_pixbuf)
+        image = self.icon
+        if window.previews is not None:
+            self.preview = WindowPreview(address, window.previews)
+            self.icon = Image(name="overview-icon", pixbuf=icon_pixbuf, h_align="center", v_align="center")
+            image = Overlay(child=self.preview, overlays=self.icon)
+            if window.previews.get(address) is not None:
+                self.icon.set_valign(Gtk.Align.END)
 
         super().__init__(
             name="overview-client-box",
-            image=Image(pixbuf=icon_pixbuf),
+            image=image,
             tooltip_text=title,
             size=size,
             on_clicked=self.on_button_click,
@@ -139,7 +164,7 @@ class HyprlandWindowButton(Button):
         # Enhanced icon resolution for overlay
         icon_pixbuf = None
         if hasattr(self, 'desktop_app') and self.desktop_app:
-            icon_pixbuf = self.desktop_app.get_icon_pixbuf(size=icon_size_overlay)
+            icon_pixbuf = icon_resolver.get_desktop_app_pixbuf(self.desktop_app, icon_size_overlay)
             
         if not icon_pixbuf:
             icon_pixbuf = icon_resolver.get_icon_pixbuf(self.app_id, icon_size_overlay)
@@ -148,14 +173,7 @@ class HyprlandWindowButton(Button):
             icon_pixbuf = icon_resolver.get_icon_pixbuf("application-x-executable-symbolic", icon_size_overlay)
             if not icon_pixbuf:
                 icon_pixbuf = icon_resolver.get_icon_pixbuf("image-missing", icon_size_overlay)
-        
-        # Ensure icon is scaled to the correct size
-        if icon_pixbuf and (icon_pixbuf.get_width() != icon_size_overlay or icon_pixbuf.get_height() != icon_size_overlay):
-            icon_pixbuf = icon_pixbuf.scale_simple(
-                icon_size_overlay, 
-                icon_size_overlay, 
-                gi.repository.GdkPixbuf.InterpType.BILINEAR
-            )
+
                 
         self.set_image(
             Overlay(
@@ -170,6 +188,12 @@ class HyprlandWindowButton(Button):
             )
         )
 
+    def refresh_preview(self):
+        if self.preview is None:
+            return
+        self.icon.set_valign(Gtk.Align.END)
+        self.preview.queue_draw()
+
     def on_button_click(self, *_):
         connection.send_command(f"/dispatch focuswindow address:{self.address}")
 
@@ -177,6 +201,12 @@ class HyprlandWindowButton(Button):
 class WorkspaceEventBox(EventBox):
     def __init__(self, workspace_id: int, fixed: Gtk.Fixed | None = None, monitor_width: int = None, monitor_height: int = None, monitor_scale: float = 1.0):
         self.fixed = fixed
+        self.empty_label = Label(
+            name="overview-add-label",
+            h_expand=True,
+            v_expand=True,
+            markup=icons.circle_plus,
+        )
         
         # Use provided monitor dimensions or fallback to current screen
         width = monitor_width or CURRENT_WIDTH
@@ -192,13 +222,8 @@ class WorkspaceEventBox(EventBox):
             v_expand=True,
             size=(int(width * container_scale), int(height * container_scale)),
             child=fixed
-            if fixed
-            else Label(
-                name="overview-add-label",
-                h_expand=True,
-                v_expand=True,
-                markup=icons.circle_plus,
-            ),
+            if fixed and fixed.get_children()
+            else self.empty_label,
             on_drag_data_received=lambda _w, _c, _x, _y, data, *_: connection.send_command(
                 f"/dispatch movetoworkspacesilent {workspace_id},address:{data.get_data().decode()}"
             ),
@@ -211,6 +236,16 @@ class WorkspaceEventBox(EventBox):
         if fixed:
             fixed.show_all()
 
+    def set_empty(self, empty: bool):
+        """Show the add label in place of the windows while the workspace has none."""
+        child = self.empty_label if empty or self.fixed is None else self.fixed
+        current = self.get_child()
+        if current is child:
+            return
+        if current is not None:
+            self.remove(current)
+        self.add(child)
+        child.show_all()
 
 
 class Overview(Box):
@@ -240,125 +275,41 @@ class Overview(Box):
                 monitor_height = monitor_info['height']
         # Initialize as a Box instead of a PopupWindow.
         super().__init__(name="overview", orientation="v", spacing=8, **kwargs)
-        self.workspace_boxes: dict[int, Box] = {}
+        self.workspace_boxes: dict[int, Gtk.Fixed] = {}
+        self.workspace_event_boxes: dict[int, WorkspaceEventBox] = {}
         self.clients: dict[str, HyprlandWindowButton] = {}
-        
-        # Initialize app registry for better icon resolution
-        self._all_apps = get_desktop_applications()
-        self.app_identifiers = self._build_app_identifiers_map()
-        
-        # Remove the window_class_aliases dictionary completely
+        self._monitors = {}
+        self._effective_scale = BASE_SCALE
 
-        connection.connect("event::openwindow", self.do_update)
-        connection.connect("event::closewindow", self.do_update)
-        connection.connect("event::movewindow", self.do_update)
-        self.update()
-        
-    def _normalize_window_class(self, class_name):
-        """Normalize window class by removing common suffixes and lowercase."""
-        if not class_name:
-            return ""
-            
-        normalized = class_name.lower()
-        
-        # Remove common suffixes
-        suffixes = [".bin", ".exe", ".so", "-bin", "-gtk"]
-        for suffix in suffixes:
-            if normalized.endswith(suffix):
-                normalized = normalized[:-len(suffix)]
-                
-        return normalized
-    
-    def _classes_match(self, class1, class2):
-        """Check if two window class names match with stricter comparison."""
-        if not class1 or not class2:
-            return False
-            
-        # Normalize both classes
-        norm1 = self._normalize_window_class(class1)
-        norm2 = self._normalize_window_class(class2)
-        
-        # Direct match after normalization
-        if norm1 == norm2:
-            return True
-            
-        # Don't do substring matching as it's too error-prone
-        # This avoids incorrectly matching flatpak apps and others
-        return False
-        
-    def _build_app_identifiers_map(self):
-        """Build a mapping of app identifiers (class names, executables, names) to DesktopApp objects"""
-        identifiers = {}
-        for app in self._all_apps:
-            # Map by name (lowercase)
-            if app.name:
-                identifiers[app.name.lower()] = app
-                
-            # Map by display name
-            if app.display_name:
-                identifiers[app.display_name.lower()] = app
-                
-            # Map by window class if available
-            if app.window_class:
-                identifiers[app.window_class.lower()] = app
-                
-            # Map by executable name if available
-            if app.executable:
-                exe_basename = app.executable.split('/')[-1].lower()
-                identifiers[exe_basename] = app
-                
-            # Map by command line if available (without parameters)
-            if app.command_line:
-                cmd_base = app.command_line.split()[0].split('/')[-1].lower()
-                identifiers[cmd_base] = app
-                
-        return identifiers
+        # Window events only mark the overview stale while it is not shown
+        self._dirty = False
+        self._layout_dirty = False
+
+        # Thumbnails are only captured while some overview is mapped
+        self.previews = get_window_preview_service() if data.OVERVIEW_WINDOW_PREVIEWS else None
+        if self.previews is not None:
+            self.previews.changed.connect(self._on_preview_changed)
+            self.connect("unmap", self._on_unmap)
         
-    def find_app(self, app_identifier):
-        """Return the DesktopApp object by matching any app identifier."""
-        if not app_identifier:
-            return None
+        self.store = get_hyprland_state()
+        self.store.clients_synced.connect(self.do_update)
+        self.store.client_removed.connect(self._on_client_removed)
+        self.store.client_moved.connect(lambda address, _workspace_id: self._on_client_changed(address))
+        self.store.client_updated.connect(self._on_client_changed)
+        self.store.monitors_changed.connect(self._on_monitors_changed)
+        self.connect("map", self._on_map)
+        self.update()
         
-        # Try direct lookup in our identifiers map
-        normalized_id = str(app_identifier).lower()
-        if normalized_id in self.app_identifiers:
-            return self.app_identifiers[normalized_id]
-            
-        # Try with normalized class name
-        norm_id = self._normalize_window_class(normalized_id)
-        if norm_id in self.app_identifiers:
-            return self.app_identifiers[norm_id]
-            
-        # More targeted matching with exact names only
-        for app in self._all_apps:
-            if app.name and app.name.lower() == normalized_id:
-                return app
-            if app.window_class and app.window_class.lower() == normalized_id:
-                return app
-            if app.display_name and app.display_name.lower() == normalized_id:
-                return app
-            # Try with executable basename
-            if app.executable:
-                exe_base = app.executable.split('/')[-1].lower()
-                if exe_base == normalized_id:
-                    return app
-            # Try with command basename
-            if app.command_line:
-                cmd_base = app.command_line.split()[0].split('/')[-1].lower()
-                if cmd_base == normalized_id:
-                    return app
-                
-        return None
-
     def update(self, signal_update=False):
-        self._all_apps = get_desktop_applications()
-        self.app_identifiers = self._build_app_identifiers_map()
+        """Rebuild the workspace grid, then place every window."""
+        self._layout_dirty = False
         for client in self.clients.values():
             client.destroy()
         self.clients.clear()
         for workspace in self.workspace_boxes.values():
             workspace.destroy()
         self.workspace_boxes.clear()
+        self.workspace_event_boxes.clear()
 
         if data.PANEL_THEME == "Panel" and data.BAR_POSITION in ["Left", "Right"]:
             rows = 5
@@ -383,34 +334,7 @@ class Overview(Box):
         
         # Calculate effective scale for this monitor
         # Higher scale monitors need larger overview elements to appear the same physical size
-        effective_scale = BASE_SCALE * monitor_scale
-
-        monitors = {
-            monitor["id"]: (monitor["x"], monitor["y"], monitor["transform"])
-            for monitor in json.loads(connection.send_command("j/monitors").reply.decode())
-        }
-        
-        # Filter clients to only show those in this monitor's workspace range
-        for client in json.loads(connection.send_command("j/clients").reply.decode()):
-            workspace_id = client["workspace"]["id"]
-            if workspace_id > 0 and self.workspace_start <= workspace_id <= self.workspace_end:
-                btn = HyprlandWindowButton(
-                    window=self,
-                    title=client["title"],
-                    address=client["address"],
-                    app_id=client["initialClass"],
-                    size=(client["size"][0] * effective_scale, client["size"][1] * effective_scale),
-                    transform=monitors[client["monitor"]][2],
-                )
-                self.clients[client["address"]] = btn
-                w_id = workspace_id
-                if w_id not in self.workspace_boxes:
-                    self.workspace_boxes[w_id] = Gtk.Fixed.new()
-                self.workspace_boxes[w_id].put(
-                    btn,
-                    abs(client["at"][0] - monitors[client["monitor"]][0]) * effective_scale,
-                    abs(client["at"][1] - monitors[client["monitor"]][1]) * effective_scale,
-                )
+        self._effective_scale = BASE_SCALE * monitor_scale
 
         # Generate workspaces only for this monitor's range
         for w_id in range(self.workspace_start, self.workspace_end + 1):
@@ -420,23 +344,149 @@ class Overview(Box):
             else:
                 row = idx // cols
             overview_row = self.children[row]
+            self.workspace_boxes[w_id] = Gtk.Fixed.new()
+            self.workspace_event_boxes[w_id] = WorkspaceEventBox(
+                w_id,
+                self.workspace_boxes[w_id],
+                monitor_width=monitor_width,
+                monitor_height=monitor_height,
+                monitor_scale=monitor_scale
+            )
             overview_row.add(
                 Box(
                     name="overview-workspace-box",
                     orientation="vertical",
                     children=[
                         Label(name="overview-workspace-label", label=f"Workspace {w_id}"),
-                        WorkspaceEventBox(
-                            w_id,
-                            self.workspace_boxes.get(w_id),
-                            monitor_width=monitor_width,
-                            monitor_height=monitor_height,
-                            monitor_scale=monitor_scale
-                        ),
+                        self.workspace_event_boxes[w_id],
                     ],
                 )
             )
 
+        self.reconcile()
+
+    def reconcile(self):
+        """Bring the window buttons in line with the store, touching only windows that changed."""
+        self._dirty = False
+        self._monitors = {
+            monitor["id"]: (monitor["x"], monitor["y"], monitor["transform"])
+            for monitor in self.store.get_monitors()
+        }
+        clients = {client["address"]: client for client in self.store.get_clients()}
+        for address in [address for address in self.clients if address not in clients]:
+            self._remove_client(address)
+        for address, client in clients.items():
+            self._sync_client(address, client)
+
+    def _client_layout(self, client):
+        """(workspace, x, y, width, height, transform) of a window shown here, or None."""
+        monitor = self._monitors.get(client.get("monitor"))
+        # Freshly opened windows have no geometry until the store resyncs
+        if not client.get("at") or not client.get("size") or monitor is None:
+            return None
+        workspace_id = client["workspace"]["id"]
+        if not (workspace_id > 0 and self.workspace_start <= workspace_id <= self.workspace_end):
+            return None
+        scale = self._effective_scale
+        return (
+            workspace_id,
+            abs(client["at"][0] - monitor[0]) * scale,
+            abs(client["at"][1] - monitor[1]) * scale,
+            client["size"][0] * scale,
+            client["size"][1] * scale,
+            monitor[2],
+        )
+
+    def _sync_client(self, address, client):
+        layout = self._client_layout(client) if client is not None else None
+        button = self.clients.get(address)
+        if layout is None:
+            if button is not None:
+                self._remove_client(address)
+            return
+
+        # Size, transform and icon are fixed when a button is built
+        if button is not None and (button.layout[3:] != layout[3:] or button.app_id != client["initialClass"]):
+            self._remove_client(address)
+            button = None
+
+        if button is None:
+            button = HyprlandWindowButton(
+                window=self,
+                title=client["title"],
+                address=address,
+                app_id=client["initialClass"],
+                size=layout[3:5],
+                transform=layout[5],
+            )
+            button.layout = layout
+            self.clients[address] = button
+            self.workspace_boxes[layout[0]].put(button, layout[1], layout[2])
+            button.show_all()
+            self.workspace_event_boxes[layout[0]].set_empty(False)
+        elif button.layout != layout:
+            previous_workspace = button.layout[0]
+            if previous_workspace == layout[0]:
+                self.workspace_boxes[layout[0]].move(button, layout[1], layout[2])
+            else:
+                self.workspace_boxes[previous_workspace].remove(button)
+                self._update_empty(previous_workspace)
+                self.workspace_boxes[layout[0]].put(button, layout[1], layout[2])
+                self.workspace_event_boxes[layout[0]].set_empty(False)
+            button.layout = layout
+
+        if button.title != client["title"]:
+            button.title = client["title"]
+            button.set_tooltip_text(client["title"])
+
+    def _remove_client(self, address):
+        button = self.clients.pop(address, None)
+        if button is None:
+            return
+        workspace_id = button.layout[0]
+        self.workspace_boxes[workspace_id].remove(button)
+        button.destroy()
+        self._update_empty(workspace_id)
+
+    def _update_empty(self, workspace_id):
+        self.workspace_event_boxes[workspace_id].set_empty(not self.workspace_boxes[workspace_id].get_children())
+
+    def _on_client_removed(self, address):
+        if self.get_mapped():
+            self._remove_client(address)
+        elif address in self.clients:
+            self._dirty = True
+
+    def _on_client_changed(self, address):
+        if self.get_mapped():
+            self._sync_client(address, self.store.get_client(address))
+        else:
+            self._dirty = True
+
+    def _on_monitors_changed(self):
+        # Monitor size and scale drive the whole grid
+        self._layout_dirty = True
+        if self.get_mapped():
+            self.update()
+
+    def _on_map(self, *_):
+        if self._layout_dirty:
+            self.update()
+        elif self._dirty:
+            self.reconcile()
+        if self.previews is not None:
+            self.previews.acquire(self)
+
+    def _on_unmap(self, *_):
+        self.previews.release(self)
+
+    def _on_preview_changed(self, address):
+        button = self.clients.get(address)
+        if button is not None:
+            button.refresh_preview()
+
     def do_update(self, *_):
-        logger.info(f"[Overview] Updating for :{_[1].name}")
-        self.update(signal_update=True)
+        if not self.get_mapped():
+            self._dirty = True
+            return
+        self.reconcile()
@@ -1,16 +1,17 @@
 import os
 import subprocess
 
-from fabric.utils import exec_shell_command_async, idle_add, remove_handler
+from fabric.utils import exec_shell_command_async
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.widgets.entry import Entry
 from fabric.widgets.label import Label
 from fabric.widgets.scrolledwindow import ScrolledWindow
-from gi.repository import Gdk, GLib, Gtk
+from gi.repository import Gdk, Gtk
 
 import config.data as data
 import modules.icons as icons
+from widgets.virtual_list import VirtualList
 
 
 class TmuxManager(Box):
@@ -25,9 +26,6 @@ class TmuxManager(Box):
         self.notch = kwargs["notch"]
         self.selected_index = -1  # Track the selected item index
 
-        self._arranger_handler: int = 0
-
-        self.viewport = Box(name="viewport", spacing=4, orientation="v")
         self.session_name_entry = Entry(
             name="session-name-entry",
             placeholder="Create Tmux Session...",
@@ -44,10 +42,34 @@ class TmuxManager(Box):
             v_expand=True,
             h_align="fill",
             v_align="fill",
-            child=self.viewport,
             propagate_width=False,
             propagate_height=False,
         )
+        self.viewport = VirtualList(
+            self.scrolled_window,
+            create_row=self.create_session_slot,
+            bind_row=self.bind_session_slot,
+            placeholder=Box(
+                name="no-tmux-container",
+                orientation="v",
+                h_align="center",
+                v_align="center",
+                h_expand=True,
+                v_expand=True,
+                children=[
+                    # Shown when there are no sessions
+                    Label(
+                        name="no-tmux",
+                        markup=icons.terminal,
+                        h_align="center",
+                        v_align="center",
+                    ),
+                ],
+            ),
+            name="viewport",
+            spacing=4,
+        )
+        self.scrolled_window.add(self.viewport)
 
         self.header_box = Box(
             name="header_box",
@@ -86,7 +108,7 @@ class TmuxManager(Box):
 
     def close_manager(self):
         """Close the tmux manager"""
-        self.viewport.children = []
+        self.viewport.set_items([])
         self.selected_index = -1  # Reset selection
         self.notch.close_notch()
 
@@ -98,39 +120,10 @@ class TmuxManager(Box):
 
     def refresh_sessions(self):
         """Get tmux sessions and populate the viewport"""
-        remove_handler(self._arranger_handler) if self._arranger_handler else None
-        self.viewport.children = []
         self.selected_index = -1  # Clear selection when viewport changes
 
-        # Get tmux sessions
-        sessions = self.get_tmux_sessions()
-        if not sessions:
-            # Create a container box to better center the message
-            container = Box(
-                name="no-tmux-container",
-                orientation="v",
-                h_align="center",
-                v_align="center",
-                h_expand=True,
-                v_expand=True
-            )
-            
-            # Show a message if no sessions
-            label = Label(
-                name="no-tmux",
-                markup=icons.terminal,
-                h_align="center",
-                v_align="center",
-            )
-            
-            container.add(label)
-            
-            self.viewport.add(container)
-            return
-
-        # Add session slots to viewport
-        for session in sessions:
-            self.viewport.add(self.create_session_slot(session))
+        # Get tmux sessions; an empty list shows the placeholder
+        self.viewport.set_items(self.get_tmux_sessions())
 
     def get_tmux_sessions(self):
         """Get list of tmux sessions"""
@@ -147,21 +140,19 @@ class TmuxManager(Box):
             print(f"Error getting tmux sessions: {e}")
             return []
 
-    def create_session_slot(self, session_name):
-        """Create a button for a tmux session"""
+    def create_session_slot(self, kind):
+        """Create an empty button for a tmux session; bind_session_slot fills it"""
         # Create an entry for inline editing (initially hidden)
         name_entry = Entry(
             name="session-name-entry",
-            text=session_name,
             visible=False,
-            on_activate=lambda entry, *_: self.finish_rename(button, session_name, entry),
+            on_activate=lambda entry, *_: self.finish_rename(button, button.session_name, entry),
             on_key_press_event=self.on_rename_key_press,
         )
         
         # Create the label showing the session name
         name_label = Label(
             name="app-label",
-            label=session_name,
             ellipsization="end",
             v_align="center",
             h_align="center",
@@ -185,26 +176,38 @@ class TmuxManager(Box):
         button = Button(
             name="slot-button",  # reuse existing CSS styling
             child=slot_box,
-            tooltip_text=f"Attach to session: {session_name}",
-            on_clicked=lambda *_: self.attach_to_session(session_name),
+            on_clicked=lambda button: self.attach_to_session(button.session_name),
             can_focus=True,  # Ensure the button can receive focus
         )
         
         # Add double-click handler to start renaming
-        button.connect("button-press-event", self.on_session_click, session_name, name_label, name_entry)
+        button.connect("button-press-event", self.on_session_click)
         
         # Add key press handler for 'r' to rename
-        button.connect("key-press-event", self.on_slot_key_press, session_name, name_label, name_entry)
+        button.connect("key-press-event", self.on_slot_key_press)
         
         # Store reference to entry and label in button for later access
         button.name_entry = name_entry
         button.name_label = name_label
-        button.session_name = session_name
+        button.session_name = None
         
         return button
 
-    def on_session_click(self, button, event, session_name, label, entry):
+    def bind_session_slot(self, button, session_name):
+        """Show session `session_name` in a pooled button"""
+        # A recycled button may still be mid-rename for its previous session
+        button.name_entry.set_visible(False)
+        button.name_label.set_visible(True)
+        button.get_style_context().remove_class("editing")
+
+        button.session_name = session_name
+        button.name_label.set_label(session_name)
+        button.name_entry.set_text(session_name)
+        button.set_tooltip_text(f"Attach to session: {session_name}")
+
+    def on_session_click(self, button, event):
         """Handle clicks on session buttons"""
+        session_name, label, entry = button.session_name, button.name_label, button.name_entry
         # Handle double-click to rename
         if event.type == Gdk.EventType.DOUBLE_BUTTON_PRESS and event.button == 1:
             self.start_rename(button, session_name, label, entry)
@@ -314,34 +317,6 @@ class TmuxManager(Box):
         # Custom navigation with UP/DOWN keys removed
         return False
 
-    def scroll_to_selected(self, button):
-        """Scroll to ensure the selected button is visible"""
-        def scroll():
-            adj = self.scrolled_window.get_vadjustment()
-            alloc = button.get_allocation()
-            if alloc.height == 0:
-                return False  # Retry if allocation isn't ready
-
-            y = alloc.y
-            height = alloc.height
-            page_size = adj.get_page_size()
-            current_value = adj.get_value()
-
-            # Calculate visible boundaries
-            visible_top = current_value
-            visible_bottom = current_value + page_size
-
-            if y < visible_top:
-                # Item above viewport - align to top
-                adj.set_value(y)
-            elif y + height > visible_bottom:
-                # Item below viewport - align to bottom
-                new_value = y + height - page_size
-                adj.set_value(new_value)
-            # No action if already fully visible
-            return False
-        GLib.idle_add(scroll)
-
     def create_session(self, session_name):
         """Create a new tmux session"""
         if not session_name:
@@ -494,8 +469,9 @@ class TmuxManager(Box):
             print(f"Error killing tmux session: {e}")
 
     # Add new method to handle key presses on session slots
-    def on_slot_key_press(self, button, event, session_name, label, entry):
+    def on_slot_key_press(self, button, event):
         """Handle key presses on session buttons"""
+        session_name, label, entry = button.session_name, button.name_label, button.name_entry
         # Print debugging info
         print(f"Key pressed: {event.keyval}, State: {event.state}")
         
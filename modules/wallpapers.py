@@ -22,6 +22,13 @@ import modules.icons as icons
 
 class WallpaperSelector(Box):
     CACHE_DIR = f"{data.CACHE_DIR}/thumbs"  # Changed from wallpapers to thumbs
+    _executor = None  # Thumbnail pool shared by every selector instance
+
+    @classmethod
+    def get_executor(cls):
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(max_workers=4)
+        return cls._executor
 
     def __init__(self, **kwargs):
         # Delete the old cache directory if it exists
@@ -43,7 +50,7 @@ class WallpaperSelector(Box):
         GLib.idle_add(self._load_wallpapers_async().__next__)
         self.thumbnails = []
         self.thumbnail_queue = []
-        self.executor = ThreadPoolExecutor(max_workers=4)  # Shared executor
+        self.executor = self.get_executor()
 
         # Variable to control the selection (similar to AppLauncher)
         self.selected_index = -1
@@ -1,6 +1,7 @@
 import gi
 import requests
 import threading
+import time
 from datetime import datetime, timedelta
 from gi.repository import Gtk, GLib
 
@@ -11,6 +12,12 @@ gi.require_version("Gtk", "3.0")
 import modules.icons as icons
 from modules.weather_utils import WeatherUtils
 
+# Forecasts are shared by every WeatherForecast instance, so only one
+# request goes out per refresh interval regardless of monitor count
+FORECAST_MAX_AGE = 590  # Just under the 10 minute refresh interval
+_forecast_lock = threading.Lock()
+_forecast_cache = {"time": 0.0, "location": None, "data": None}
+
 
 class WeatherForecast(Box):
     def __init__(self, **kwargs) -> None:
@@ -255,18 +262,10 @@ class WeatherForecast(Box):
 
     def _fetch_weather_forecast_thread(self):
         """Fetch weather data from Met.no API"""
-        # Get coordinates automatically
-        if not self.get_coordinates():
-            GLib.idle_add(self._show_error)
-            return
-        
-        url = WeatherUtils.get_met_api_url(self.lat, self.lon)
-        
         try:
-            response = self.session.get(url, headers={'User-Agent': WeatherUtils.get_user_agent('weather-forecast-app')})
+            data = self._get_shared_forecast()
             
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 timeseries = data["properties"]["timeseries"]
                 
                 # Get current weather data
@@ -428,6 +427,30 @@ class WeatherForecast(Box):
             print(f"Error fetching weather forecast: {e}")
             GLib.idle_add(self._show_error)
 
+    def _get_shared_forecast(self):
+        """Get the Met.no forecast, fetching it only when the shared copy is stale"""
+        with _forecast_lock:
+            if (
+                _forecast_cache["data"] is not None
+                and time.monotonic() - _forecast_cache["time"] < FORECAST_MAX_AGE
+            ):
+                self.lat, self.lon, self.city_name = _forecast_cache["location"]
+                return _forecast_cache["data"]
+
+            # Get coordinates automatically
+            if not self.get_coordinates():
+                return None
+
+            url = WeatherUtils.get_met_api_url(self.lat, self.lon)
+            response = self.session.get(url, headers={'User-Agent': WeatherUtils.get_user_agent('weather-forecast-app')})
+            if response.status_code != 200:
+                return None
+
+            _forecast_cache["time"] = time.monotonic()
+            _forecast_cache["location"] = (self.lat, self.lon, self.city_name)
+            _forecast_cache["data"] = response.json()
+            return _forecast_cache["data"]
+
     def _update_forecast_ui(self, forecast_widgets):
         """Update the UI with forecast data"""
         # Clear existing forecast
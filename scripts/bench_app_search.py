@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+"""
+Micro-benchmark for the launcher's application search index.
+
+Builds an AppSearchIndex over synthetic desktop entries and times every
+keystroke of a few typed queries, the way the launcher sees them.
+
+Usage:
+    python scripts/bench_app_search.py [--apps 2000] [--budget-ms 1.0]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+# Add the YZ-Shell directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.app_search import AppSearchIndex
+
+WORDS = [
+    "fire", "fox", "term", "inal", "code", "studio", "visual", "text", "edit",
+    "image", "viewer", "music", "player", "video", "office", "writer", "calc",
+    "sheet", "mail", "chat", "web", "browser", "files", "manager", "settings",
+    "system", "monitor", "network", "sound", "control", "screen", "shot",
+    "record", "game", "steam", "launcher", "paint", "draw", "photo", "book",
+]
+
+QUERIES = ["firefox", "term", "visual studio", "sttngs", "vsc", "discord", "zz"]
+
+SEARCH_ALIASES = {
+    "application_aliases": [
+        {"app_names": ["vesktop"], "search_terms": ["discord"]},
+    ]
+}
+
+
+def make_apps(count):
+    rng = random.Random(0)
+    apps = []
+    for i in range(count):
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        display = " ".join(word.capitalize() for word in words)
+        name = "-".join(words) + f"-{i}"
+        apps.append(SimpleNamespace(
+            name=name,
+            display_name=display,
+            generic_name=" ".join(rng.sample(WORDS, 2)),
+            command_line=f"/usr/bin/{name} %U",
+            executable=f"/usr/bin/{name}",
+            description="",
+        ))
+    apps.append(SimpleNamespace(
+        name="vesktop", display_name="Vesktop", generic_name="Internet Messenger",
+        command_line="vesktop %U", executable="vesktop", description="",
+    ))
+    return apps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--apps", type=int, default=2000)
+    parser.add_argument("--budget-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    apps = make_apps(args.apps)
+
+    start = time.perf_counter()
+    index = AppSearchIndex(apps, SEARCH_ALIASES)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"Index build for {len(apps)} apps: {build_ms:.1f} ms")
+    print()
+    print(f"{'query':<16} {'results':>8} {'mean ms':>8} {'p95 ms':>8} {'max ms':>8}")
+
+    worst = 0.0
+    for query in QUERIES:
+        timings = []
+        for _ in range(20):
+            # Every prefix, as typed one key at a time
+            for end in range(1, len(query) + 1):
+                start = time.perf_counter()
+                results = index.search(query[:end])
+                timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        worst = max(worst, p95)
+        print(
+            f"{query:<16} {len(results):>8} {statistics.mean(timings):>8.3f} "
+            f"{p95:>8.3f} {timings[-1]:>8.3f}"
+        )
+
+    print()
+    if worst > args.budget_ms:
+        print(f"FAIL: p95 {worst:.3f} ms exceeds {args.budget_ms} ms budget")
+        sys.exit(1)
+    print(f"OK: p95 {worst:.3f} ms within {args.budget_ms} ms budget")
+
+
+if __name__ == "__main__":
+    main()
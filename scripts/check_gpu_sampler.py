@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+"""
+Check the native GPU sampler against a fake sysfs tree, or the real one.
+
+Without arguments, builds a temporary /sys/class/drm with an amdgpu card,
+an i915 card, an xe card and a connector, checks that GpuSampler reads
+the value written for the amdgpu card and leaves the Intel cards to
+nvtop, then times a sample. With --sysfs, samples the given tree instead (e.g. /sys).
+
+Usage:
+    python scripts/check_gpu_sampler.py [--sysfs /sys] [--samples 1000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add the YZ-Shell directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.gpu_sampler import GpuSampler
+
+
+def write(path, value):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(f"{value}\n")
+
+
+def make_card(root, card, driver):
+    """Create class/drm/<card> with a device/driver symlink to `driver`."""
+    device_dir = os.path.join(root, "devices", card)
+    os.makedirs(device_dir)
+    driver_dir = os.path.join(root, "bus/pci/drivers", driver)
+    os.makedirs(driver_dir, exist_ok=True)
+    os.symlink(driver_dir, os.path.join(device_dir, "driver"))
+    card_dir = os.path.join(root, "class/drm", card)
+    os.makedirs(card_dir)
+    os.symlink(device_dir, os.path.join(card_dir, "device"))
+    return card_dir, device_dir
+
+
+def build_fake_sysfs(root):
+    _, amd_device = make_card(root, "card0", "amdgpu")
+    write(os.path.join(amd_device, "gpu_busy_percent"), 42)
+    write(os.path.join(amd_device, "product_name"), "Fake Radeon")
+
+    intel_card, _ = make_card(root, "card1", "i915")
+    write(os.path.join(intel_card, "gt_act_freq_mhz"), 650)
+    write(os.path.join(intel_card, "gt_RP0_freq_mhz"), 1300)
+
+    _, xe_device = make_card(root, "card2", "xe")
+    write(os.path.join(xe_device, "tile0/gt0/freq0/act_freq"), 300)
+    write(os.path.join(xe_device, "tile0/gt0/freq0/rp0_freq"), 2400)
+
+    # Connectors must be skipped
+    os.makedirs(os.path.join(root, "class/drm/card0-DP-1"))
+    return [42]
+
+
+def time_samples(sampler, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        sampler.sample()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sysfs", help="sample this sysfs tree instead of a fake one")
+    parser.add_argument("--samples", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.sysfs:
+        sampler = GpuSampler(args.sysfs)
+        print(f"Devices: {sampler.device_names() or 'none'}")
+        print(f"Native sampling available: {sampler.available}")
+        if sampler.devices:
+            print(f"Sample: {sampler.sample()}")
+            print(f"Cost: {time_samples(sampler, args.samples):.1f} us per sample")
+        return
+
+    with tempfile.TemporaryDirectory(prefix="fake-sysfs-") as root:
+        expected = build_fake_sysfs(root)
+        sampler = GpuSampler(root, use_nvml=False)
+        names = sampler.device_names()
+        values = sampler.sample()
+        print(f"Devices: {names}")
+        print(f"Sample: {values}")
+
+        failures = []
+        if names != ["Fake Radeon"]:
+            failures.append(f"expected only 'Fake Radeon', got {names}")
+        if values != expected:
+            failures.append(f"expected {expected}, got {values}")
+        # Intel utilization is not in sysfs, so nvtop stays the source
+        if sampler.unsupported != 2 or sampler.available:
+            failures.append(f"expected the 2 Intel cards left to nvtop, got {sampler.unsupported}")
+
+        # Values are re-read on every sample
+        write(os.path.join(root, "devices/card0/gpu_busy_percent"), 7)
+        if sampler.sample()[0] != 7:
+            failures.append("amdgpu value was not re-read")
+
+        print(f"Cost: {time_samples(sampler, args.samples):.1f} us per sample")
+        sampler.close()
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
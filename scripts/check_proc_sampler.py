@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+"""
+Check the /proc CPU sampler against a fake procfs tree, or the real one.
+
+Without arguments, builds a temporary /proc with four cores and
+--processes processes, advances their counters between two samples and
+checks the per-core and top-process results, that a process waking up
+between two reads of its stat is still reported, and that an unparsable
+stat file leaks no fd. With --proc, samples the given tree instead
+(e.g. /proc). Either way, a sample of the cores and every process must
+take at most --budget-ms.
+
+Usage:
+    python scripts/check_proc_sampler.py [--proc /proc] [--processes 1500] [--samples 50] [--budget-ms 2.0]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add the YZ-Shell directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.proc_sampler import CLK_TCK, IDLE_RESCAN_SAMPLES, PAGE_SIZE, ProcSampler
+
+
+def write_stat(root, cores):
+    """cores: list of (busy, idle) tick counts."""
+    lines = ["cpu  0 0 0 0 0 0 0 0 0 0"]
+    for i, (busy, idle) in enumerate(cores):
+        lines.append(f"cpu{i} {busy} 0 0 {idle} 0 0 0 0 0 0")
+    lines.append("intr 0")
+    with open(os.path.join(root, "stat"), "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def write_pid(root, pid, name, ticks, rss_pages):
+    os.makedirs(os.path.join(root, str(pid)), exist_ok=True)
+    # Fields 3..24: state ppid pgrp session tty tpgid flags minflt cminflt majflt
+    # cmajflt utime stime cutime cstime priority nice threads itrealvalue
+    # starttime vsize rss
+    rest = f"S 1 1 1 0 -1 0 0 0 0 0 {ticks} 0 0 0 20 0 1 0 0 0 {rss_pages}"
+    with open(os.path.join(root, str(pid), "stat"), "w") as f:
+        f.write(f"{pid} ({name}) {rest} 0 0\n")
+
+
+def time_samples(sampler, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        sampler.sample_cores()
+        sampler.sample_processes()
+    return (time.perf_counter() - start) / count * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--proc", help="sample this procfs tree instead of a fake one")
+    parser.add_argument("--processes", type=int, default=1500)
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--budget-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    if args.proc:
+        sampler = ProcSampler(args.proc)
+        sampler.sample_cores()
+        sampler.sample_processes()
+        time.sleep(1)
+        print(f"Cores: {[round(v) for v in sampler.sample_cores()]}")
+        by_cpu, by_rss = sampler.sample_processes()
+        print(f"Top CPU: {[(p.name, round(p.cpu, 1)) for p in by_cpu]}")
+        print(f"Top RSS: {[(p.name, p.rss // (1024 * 1024)) for p in by_rss]}")
+        cost = time_samples(sampler, args.samples)
+        if cost > args.budget_ms:
+            print(f"FAIL: {cost:.2f} ms per sample exceeds {args.budget_ms} ms budget")
+            sys.exit(1)
+        print(f"OK: {cost:.2f} ms per sample within {args.budget_ms} ms budget")
+        return
+
+    failures = []
+    with tempfile.TemporaryDirectory(prefix="fake-proc-") as root:
+        write_stat(root, [(0, 0)] * 4)
+        for pid in range(1, args.processes + 1):
+            write_pid(root, pid, f"proc {pid}", 0, pid)
+        write_pid(root, 99999, "weird) (name", 0, 1)
+        os.makedirs(os.path.join(root, "self"))
+
+        sampler = ProcSampler(root)
+        sampler.sample_cores()
+        sampler.sample_processes()
+
+        # Core i is 25 * i percent busy, the odd-named process uses a full core
+        write_stat(root, [(25 * i, 100 - 25 * i) for i in range(4)])
+        write_pid(root, 99999, "weird) (name", CLK_TCK, 1)
+        cores = [round(v) for v in sampler.sample_cores()]
+        by_cpu, by_rss = sampler.sample_processes(top=3)
+        print(f"Cores: {cores}")
+        print(f"Top CPU: {by_cpu}")
+        print(f"Top RSS: {by_rss}")
+
+        if cores != [0, 25, 50, 75]:
+            failures.append(f"expected cores [0, 25, 50, 75], got {cores}")
+        if not by_cpu or by_cpu[0].name != "weird) (name" or by_cpu[0].cpu <= 0:
+            failures.append(f"expected 'weird) (name' on top by CPU, got {by_cpu[:1]}")
+        if [p.pid for p in by_rss] != [args.processes, args.processes - 1, args.processes - 2]:
+            failures.append(f"unexpected top RSS pids {[p.pid for p in by_rss]}")
+        if by_rss and by_rss[0].rss != args.processes * PAGE_SIZE:
+            failures.append(f"RSS is not in bytes: {by_rss[0].rss}")
+
+        # A sleeping process is not read every sample, but its CPU use is caught up
+        write_pid(root, 42, "proc 42", CLK_TCK, 42)
+        woken = False
+        for _ in range(IDLE_RESCAN_SAMPLES):
+            by_cpu, _ = sampler.sample_processes(top=3)
+            woken = woken or any(p.pid == 42 and p.cpu > 0 for p in by_cpu)
+        if not woken:
+            failures.append("a process waking up between reads was not reported")
+
+        # A process whose stat cannot be parsed must not leak its fd
+        with open(os.path.join(root, "1", "stat"), "w") as f:
+            f.write("1 (truncated) S 1\n")
+        # Idle processes are only re-read every IDLE_RESCAN_SAMPLES samples
+        for _ in range(IDLE_RESCAN_SAMPLES):
+            sampler.sample_processes()
+        open_fds = len(os.listdir("/proc/self/fd"))
+        for _ in range(2 * IDLE_RESCAN_SAMPLES):
+            sampler.sample_processes()
+        if len(os.listdir("/proc/self/fd")) > open_fds:
+            failures.append("an unparsable stat file leaked a file descriptor")
+
+        cost = time_samples(sampler, args.samples)
+        print(f"Cost: {cost:.2f} ms per sample of {args.processes + 1} processes")
+        if cost > args.budget_ms:
+            failures.append(f"{cost:.2f} ms per sample exceeds {args.budget_ms} ms budget")
+        sampler.close()
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+
+"""
+Check the hyprland-toplevel-export client against a fake compositor.
+
+Serves a minimal Wayland compositor on a temporary UNIX socket that
+offers wl_shm and the export manager, validates new object ids the way
+libwayland-server does, and fills every copied buffer with the window's
+color. Checks that a window is copied with its size, format, flags and
+pixels, that the handle is the low 32 bits of the address, that a closed
+window yields no frame, that object ids are reused across many captures,
+that a compositor without toplevel export is reported, and that the
+client reconnects after the compositor drops it. Then times a capture.
+
+Usage:
+    python scripts/check_toplevel_export.py [--captures 200]
+"""
+
+import argparse
+import mmap
+import os
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+# Add the YZ-Shell directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.toplevel_export import (FLAG_Y_INVERT, MANAGER_INTERFACE, SHM_XRGB8888, ExportError,
+                                      ToplevelExportClient)
+
+# Handle -> (width, height, flags, BGRA pixel)
+WINDOWS = {
+    0xC0A0E2B0: (64, 32, 0, b"\x11\x22\x33\xff"),
+    0x00000042: (16, 16, FLAG_Y_INVERT, b"\x44\x55\x66\xff"),
+}
+
+
+def _string(value):
+    data = value.encode() + b"\0"
+    return struct.pack("=I", len(data)) + data + b"\0" * (-len(data) % 4)
+
+
+class FakeCompositor:
+    """Just enough of a compositor for ToplevelExportClient; one client at a time."""
+
+    def __init__(self, path, offer_manager=True):
+        self.path = path
+        self.offer_manager = offer_manager
+        self.max_id = 0
+        self.errors = []
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(path)
+        self._server.listen(1)
+        self._drop = threading.Event()
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def drop_client(self):
+        """Close the current connection after its next request."""
+        self._drop.set()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    self._handle(conn)
+                except OSError:
+                    pass  # The client went away
+
+    def _handle(self, conn):
+        objects = {1: "wl_display"}
+        # Deleted ids stay in libwayland's id map, so the next new id is past the highest ever used
+        highest = [1]
+        pools = {}
+        buffers = {}
+        frames = {}
+        data = b""
+        fds = []
+
+        def send(object_id, opcode, payload=b""):
+            conn.sendall(struct.pack("=II", object_id, (8 + len(payload)) << 16 | opcode) + payload)
+
+        def delete(object_id):
+            objects.pop(object_id, None)
+            send(1, 1, struct.pack("=I", object_id))
+
+        def create(object_id, interface):
+            # libwayland-server only accepts a free id or the next one after the highest
+            if object_id in objects or object_id > highest[0] + 1:
+                self.errors.append(f"invalid new id {object_id}")
+                send(1, 0, struct.pack("=II", 1, 0) + _string("invalid new id"))
+                return False
+            objects[object_id] = interface
+            highest[0] = max(highest[0], object_id)
+            self.max_id = max(self.max_id, object_id)
+            return True
+
+        while True:
+            chunk, ancillary, _, _ = conn.recvmsg(4096, socket.CMSG_SPACE(16))
+            if not chunk:
+                return
+            for level, kind, payload in ancillary:
+                if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+                    fds.extend(struct.unpack(f"={len(payload) // 4}i", payload))
+            data += chunk
+
+            while len(data) >= 8:
+                object_id, header = struct.unpack_from("=II", data)
+                size, opcode = header >> 16, header & 0xFFFF
+                if len(data) < size:
+                    break
+                args, data = data[8:size], data[size:]
+                interface = objects.get(object_id)
+
+                if interface == "wl_display" and opcode == 1:
+                    registry, = struct.unpack("=I", args)
+                    create(registry, "wl_registry")
+                    announced = [(1, "wl_compositor", 4), (2, "wl_shm", 1)]
+                    if self.offer_manager:
+                        announced.append((3, MANAGER_INTERFACE, 2))
+                    for name, global_interface, version in announced:
+                        send(registry, 0, struct.pack("=I", name) + _string(global_interface) + struct.pack("=I", version))
+                elif interface == "wl_display" and opcode == 0:
+                    callback, = struct.unpack("=I", args)
+                    if create(callback, "wl_callback"):
+                        send(callback, 0, struct.pack("=I", 1))
+                        delete(callback)
+                elif interface == "wl_registry" and opcode == 0:
+                    length, = struct.unpack_from("=I", args, 4)
+                    bound = args[8:8 + length - 1].decode()
+                    new_id, = struct.unpack_from("=I", args, 8 + length + (-length % 4) + 4)
+                    create(new_id, bound)
+                elif interface == "wl_shm" and opcode == 0:
+                    pool, pool_size = struct.unpack("=Ii", args)
+                    fd = fds.pop(0)
+                    if create(pool, "wl_shm_pool"):
+                        pools[pool] = mmap.mmap(fd, pool_size)
+                    os.close(fd)
+                elif interface == "wl_shm_pool" and opcode == 0:
+                    buffer, offset, width, height, stride, format_ = struct.unpack("=IiiiiI", args)
+                    if create(buffer, "wl_buffer"):
+                        buffers[buffer] = (pools[object_id], offset, height, stride)
+                elif interface in ("wl_shm_pool", "wl_buffer") and opcode in (0, 1):
+                    # wl_shm_pool.destroy, wl_buffer.destroy
+                    pools.pop(object_id, None)
+                    buffers.pop(object_id, None)
+                    delete(object_id)
+                elif interface == MANAGER_INTERFACE and opcode == 0:
+                    frame, _overlay_cursor, handle = struct.unpack("=IiI", args)
+                    if not create(frame, "hyprland_toplevel_export_frame_v1"):
+                        continue
+                    if handle not in WINDOWS:
+                        send(frame, 4)
+                        continue
+                    width, height, flags, _ = WINDOWS[handle]
+                    frames[frame] = handle
+                    send(frame, 0, struct.pack("=IIII", SHM_XRGB8888, width, height, width * 4))
+                    send(frame, 2, struct.pack("=I", flags))
+                    send(frame, 6)
+                elif interface == "hyprland_toplevel_export_frame_v1" and opcode == 0:
+                    buffer, _ignore_damage = struct.unpack("=Ii", args)
+                    memory, offset, height, stride = buffers[buffer]
+                    pixel = WINDOWS[frames[object_id]][3]
+                    memory[offset:offset + stride * height] = pixel * (stride * height // 4)
+                    send(object_id, 3, struct.pack("=III", 0, 1, 0))
+                elif interface == "hyprland_toplevel_export_frame_v1" and opcode == 1:
+                    frames.pop(object_id, None)
+                    delete(object_id)
+
+                if self._drop.is_set():
+                    self._drop.clear()
+                    return
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--captures", type=int, default=200)
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory(prefix="fake-wayland-") as root:
+        compositor = FakeCompositor(os.path.join(root, "wayland-1"))
+        client = ToplevelExportClient(compositor.path)
+
+        frame = client.capture(int("0x55d1c0a0e2b0", 16))
+        if frame is None:
+            failures.append("the window was not captured through its 32-bit handle")
+        else:
+            print(f"Frame: {frame.width}x{frame.height}, stride {frame.stride}, format {frame.format}")
+            if (frame.width, frame.height, frame.stride, frame.format) != (64, 32, 256, SHM_XRGB8888):
+                failures.append(f"unexpected frame geometry {frame[:4]}")
+            if frame.data[:4] != b"\x11\x22\x33\xff" or len(frame.data) != 256 * 32:
+                failures.append("the frame does not hold the window's pixels")
+            if frame.y_invert:
+                failures.append("y_invert set on a frame without the flag")
+
+        frame = client.capture(0x42)
+        if frame is None or not frame.y_invert or frame.data[:4] != b"\x44\x55\x66\xff":
+            failures.append("the y-inverted window was not captured with its flag")
+
+        if client.capture(0xDEAD) is not None:
+            failures.append("a closed window produced a frame")
+
+        start = time.perf_counter()
+        for _ in range(args.captures):
+            client.capture(0xC0A0E2B0)
+        elapsed = (time.perf_counter() - start) / args.captures * 1e3
+        print(f"Highest object id after {args.captures + 3} captures: {compositor.max_id}")
+        if compositor.max_id > 10:
+            failures.append(f"object ids are not reused, reached {compositor.max_id}")
+        print(f"Cost: {elapsed:.2f} ms per 64x32 capture")
+
+        compositor.drop_client()
+        try:
+            client.capture(0xC0A0E2B0)
+            failures.append("a dropped connection was not reported")
+        except OSError:
+            pass
+        if client.is_connected:
+            failures.append("the client stayed connected after an error")
+        if client.capture(0xC0A0E2B0) is None:
+            failures.append("the client did not reconnect")
+        client.close()
+
+        failures.extend(f"compositor: {error}" for error in compositor.errors)
+
+        bare = FakeCompositor(os.path.join(root, "wayland-2"), offer_manager=False)
+        try:
+            ToplevelExportClient(bare.path).connect()
+            failures.append("a compositor without toplevel export was not reported")
+        except ExportError as e:
+            print(f"Without the manager: {e}")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
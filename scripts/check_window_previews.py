@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+"""
+Check the window preview pipeline against a fake capture backend.
+
+Runs WindowPreviewService on a GLib main loop with a fake Hyprland store
+and FakeCaptureBackend: nothing is captured until a consumer acquires
+the service, every window is then captured once and downscaled, a
+damaged window is refreshed no sooner than MIN_REFRESH_INTERVAL, a
+failed capture is retried, the cache stays within its budget, and
+released or closed windows stop being captured.
+
+Usage:
+    python scripts/check_window_previews.py [--windows 12]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the YZ-Shell directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gi.repository import GLib
+
+from services.window_previews import (MIN_REFRESH_INTERVAL, THUMBNAIL_SIZE,
+                                      FakeCaptureBackend, WindowPreviewService)
+from utils.signal import Signal
+
+
+class FakeStore:
+    """The parts of HyprlandStateStore the preview service uses."""
+
+    def __init__(self, windows):
+        self.clients = {
+            f"0x{i + 1:x}": {
+                "address": f"0x{i + 1:x}",
+                "at": [0, 0],
+                "size": [1920, 1080],
+                "workspace": {"id": 1},
+                "hidden": False,
+            }
+            for i in range(windows)
+        }
+        self.client_updated = Signal()
+        self.client_removed = Signal()
+        self.active_window_changed = Signal()
+        self.clients_synced = Signal()
+        self.workspace_changed = Signal()
+
+    def get_clients(self):
+        return list(self.clients.values())
+
+    def get_client(self, address):
+        return self.clients.get(address)
+
+    def get_monitors(self):
+        return [{"id": 0, "activeWorkspace": {"id": 1}, "specialWorkspace": {"id": 0}}]
+
+    def get_active_address(self):
+        return ""
+
+    def remove(self, address):
+        del self.clients[address]
+        self.client_removed.emit(address)
+
+
+def run_until(condition, timeout):
+    """Iterate the main loop until `condition()` holds or `timeout` seconds pass."""
+    context = GLib.MainContext.default()
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        context.iteration(False)
+        time.sleep(0.005)
+    return condition()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--windows", type=int, default=12)
+    args = parser.parse_args()
+
+    failures = []
+    store = FakeStore(args.windows)
+    backend = FakeCaptureBackend()
+    # Room for a bit more than half of the thumbnails (320x180 ARGB each)
+    budget = THUMBNAIL_SIZE * 180 * 4 * (args.windows // 2 + 1)
+    previews = WindowPreviewService(backend, store, budget=budget)
+
+    run_until(lambda: False, 0.3)
+    if backend.captured:
+        failures.append(f"captured {len(backend.captured)} windows with no consumer")
+
+    consumer = object()
+    previews.acquire(consumer)
+    if not run_until(lambda: len(backend.captured) >= args.windows, 10):
+        failures.append(f"captured {len(backend.captured)} of {args.windows} windows")
+    if sorted(backend.captured) != sorted(store.clients):
+        failures.append("some windows were captured more than once")
+
+    newest = backend.captured[-1] if backend.captured else None
+    thumbnail = previews.get(newest) if newest else None
+    if thumbnail is None:
+        failures.append("the newest thumbnail is not cached")
+    elif (thumbnail.get_width(), thumbnail.get_height()) != (THUMBNAIL_SIZE, 180):
+        failures.append(f"thumbnail is {thumbnail.get_width()}x{thumbnail.get_height()}, expected {THUMBNAIL_SIZE}x180")
+    if previews.cache.size > budget:
+        failures.append(f"cache holds {previews.cache.size} bytes over a {budget} byte budget")
+    print(f"Cached {len(previews.cache)} of {args.windows} thumbnails, {previews.cache.size // 1024} KiB")
+
+    # Damage right after a capture waits for the refresh interval
+    damaged = backend.captured[0]
+    captures = len(backend.captured)
+    start = time.monotonic()
+    previews.invalidate(damaged)
+    run_until(lambda: len(backend.captured) > captures, MIN_REFRESH_INTERVAL + 2)
+    elapsed = time.monotonic() - start
+    if len(backend.captured) != captures + 1 or backend.captured[-1] != damaged:
+        failures.append("the damaged window was not captured again")
+    print(f"Damaged window refreshed after {elapsed:.2f} s")
+
+    # A failed capture is retried
+    backend.failing.add(damaged)
+    captures = len(backend.captured)
+    previews.invalidate(damaged)
+    run_until(lambda: len(backend.captured) > captures, MIN_REFRESH_INTERVAL + 2)
+    backend.failing.clear()
+    run_until(lambda: len(backend.captured) > captures + 1, MIN_REFRESH_INTERVAL + 2)
+    if backend.captured[captures:] != [damaged, damaged]:
+        failures.append("a failed capture was not retried")
+
+    # Nothing is captured once released, and closed windows leave the cache
+    previews.release(consumer)
+    captures = len(backend.captured)
+    previews.invalidate(*store.clients)
+    run_until(lambda: False, 0.5)
+    if len(backend.captured) != captures:
+        failures.append("windows were captured after the consumer was released")
+    store.remove(damaged)
+    if previews.get(damaged) is not None:
+        failures.append("a closed window is still cached")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+"""
+Replay harness for the Hyprland event socket reader.
+
+Serves a recorded socket2 event stream from a local UNIX socket stand-in,
+split into random chunks so lines straddle reads, and checks that
+HyprlandEventReader dispatches every event intact. The server then drops
+the connection to exercise reconnection and replays the stream once more.
+
+Usage:
+    python scripts/replay_socket2.py [recording.txt]
+
+A recording can be captured from a live session with:
+    socat -U - UNIX-CONNECT:$XDG_RUNTIME_DIR/hypr/$HYPRLAND_INSTANCE_SIGNATURE/.socket2.sock > recording.txt
+"""
+
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+
+# Add the YZ-Shell directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gi.repository import GLib
+
+from services.hyprland_events import HyprlandEventReader
+
+SAMPLE_RECORDING = """\
+workspace>>2
+workspacev2>>2,2
+focusedmon>>DP-1,2
+activewindow>>kitty,~/src
+activewindowv2>>55d1c0a0e2b0
+openwindow>>55d1c0a0f3c0,2,firefox,Mozilla Firefox — Ünïcödé, with commas
+movewindowv2>>55d1c0a0f3c0,3,3
+focusedmon>>HDMI-A-1,5
+workspace>>5
+windowtitlev2>>55d1c0a0f3c0,a>>b title
+closewindow>>55d1c0a0f3c0
+focusedmon>>DP-1,special:scratch
+workspace>>1
+"""
+
+TIMEOUT_MS = 5000
+
+
+def parse_expected(recording: str, events):
+    expected = []
+    for line in recording.splitlines():
+        name, sep, data = line.partition(">>")
+        if sep and name in events:
+            expected.append((name, data))
+    return expected
+
+
+def serve(server: socket.socket, payload: bytes, rounds: int):
+    """Send the recording `rounds` times, one connection per round."""
+    rng = random.Random(0)
+    for _ in range(rounds):
+        conn, _addr = server.accept()
+        with conn:
+            offset = 0
+            while offset < len(payload):
+                size = rng.randint(1, 64)
+                conn.sendall(payload[offset:offset + size])
+                offset += size
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding="utf-8") as f:
+            recording = f.read()
+    else:
+        recording = SAMPLE_RECORDING
+
+    events = {line.partition(">>")[0] for line in recording.splitlines() if ">>" in line}
+    expected = parse_expected(recording, events)
+    rounds = 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, ".socket2.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(1)
+
+        threading.Thread(
+            target=serve,
+            args=(server, recording.encode("utf-8"), rounds),
+            daemon=True,
+        ).start()
+
+        loop = GLib.MainLoop()
+        received = []
+        connections = []
+
+        reader = HyprlandEventReader(path)
+        for name in events:
+            reader.connect(name, lambda data, name=name: (
+                received.append((name, data)),
+                len(received) == len(expected) * rounds and loop.quit(),
+            ))
+        reader.on_connected(lambda: connections.append(True))
+        reader.start()
+
+        GLib.timeout_add(TIMEOUT_MS, loop.quit)
+        loop.run()
+        reader.stop()
+        server.close()
+
+    ok = received == expected * rounds
+    print(f"Connections:     {len(connections)}")
+    print(f"Events expected: {len(expected) * rounds}")
+    print(f"Events received: {len(received)}")
+
+    if not ok:
+        for i, (want, got) in enumerate(zip(expected * rounds, received)):
+            if want != got:
+                print(f"First mismatch at event {i}: expected {want!r}, got {got!r}")
+                break
+        print("FAIL")
+        sys.exit(1)
+
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+"""
+Startup time and memory report for the notch.
+
+For each monitor count from 1 to --max-monitors, a fresh Python process
+builds that many Notch instances and reports the construction time and
+the resident memory growth. With --eager every lazily built module and
+dashboard section is opened as well, which matches the cost of building
+everything up front and gives a baseline to compare against.
+
+Must be run from inside a Hyprland session.
+
+Usage:
+    python scripts/startup_report.py [--max-monitors 3] [--eager]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+SHELL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def read_rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def measure(monitor_count, eager):
+    """Build `monitor_count` notches in this process and return the measurements."""
+    sys.path.insert(0, SHELL_DIR)
+    os.chdir(SHELL_DIR)
+
+    import gi
+
+    gi.require_version("Gtk", "3.0")
+    from gi.repository import GLib
+
+    from modules.notch import Notch
+    from utils.monitor_manager import get_monitor_manager
+
+    monitors = get_monitor_manager().get_monitors() or [{"id": 0}]
+
+    rss_before = read_rss_kb()
+    start = time.perf_counter()
+
+    notches = []
+    for i in range(monitor_count):
+        monitor_id = monitors[i % len(monitors)]["id"]
+        notch = Notch(monitor_id=monitor_id)
+        if eager:
+            for name in notch._module_factories:
+                notch._get_module(name)
+            for name in notch.dashboard._section_factories:
+                notch.dashboard._get_section(name)
+        notches.append(notch)
+
+    # Let idle callbacks queued during construction run
+    context = GLib.MainContext.default()
+    while context.pending():
+        context.iteration(False)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "monitors": monitor_count,
+        "startup_ms": round(elapsed * 1000, 1),
+        "rss_kb": read_rss_kb() - rss_before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-monitors", type=int, default=3)
+    parser.add_argument("--eager", action="store_true", help="open every module after construction")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.eager)))
+        return
+
+    mode = "eager" if args.eager else "lazy"
+    print(f"Notch startup report ({mode})")
+    print(f"{'monitors':>8}  {'startup (ms)':>12}  {'RSS (MiB)':>10}")
+    for count in range(1, args.max_monitors + 1):
+        command = [sys.executable, os.path.abspath(__file__), "--child", str(count)]
+        if args.eager:
+            command.append("--eager")
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"{count:>8}  failed: {result.stderr.strip().splitlines()[-1:]}")
+            continue
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f"{count:>8}  {report['startup_ms']:>12.1f}  {report['rss_kb'] / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
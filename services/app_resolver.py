@@ -0,0 +1,143 @@
+from typing import Dict, List, Optional, Tuple
+
+from fabric.utils import DesktopApp
+
+from services.desktop_catalog import get_desktop_catalog
+
+# Suffixes dropped from window classes, e.g. "foo-bin" resolves like "foo"
+CLASS_SUFFIXES = (".bin", ".exe", ".so", "-bin", "-gtk")
+# Memoized lookups kept before the memo is reset; window titles make the key space open-ended
+MAX_MEMOIZED = 1024
+
+# Identifier keys of a pinned app or app data object, most specific first
+IDENTIFIER_KEYS = ("window_class", "executable", "command_line", "name", "display_name")
+
+
+def normalize_window_class(class_name: str) -> str:
+    if not class_name:
+        return ""
+    normalized = class_name.lower()
+    for suffix in CLASS_SUFFIXES:
+        if normalized.endswith(suffix):
+            normalized = normalized[:-len(suffix)]
+    return normalized
+
+
+def app_identifiers(app: DesktopApp) -> List[str]:
+    """Lowercase names an app can be looked up by: name, display name, class, executable and command."""
+    identifiers = []
+    if app.name: identifiers.append(app.name.lower())
+    if app.display_name: identifiers.append(app.display_name.lower())
+    if app.window_class: identifiers.append(app.window_class.lower())
+    if app.executable: identifiers.append(app.executable.split('/')[-1].lower())
+    if app.command_line: identifiers.append(app.command_line.split()[0].split('/')[-1].lower())
+    return identifiers
+
+
+class AppResolver:
+    """
+    Resolves window classes, titles and app identifiers to desktop apps.
+
+    The identifier table is built once per desktop catalog generation and
+    shared by every consumer. Lookups are memoized, misses included, so a
+    window class costs a dictionary lookup after its first resolution;
+    the fuzzy substring scan only runs on a miss of both.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self.catalog = get_desktop_catalog()
+        self.generation = -1
+        self._apps: List[DesktopApp] = []
+        self._table: Dict[str, DesktopApp] = {}
+        # Lowercase name, display name, class, executable and command line per app, for fuzzy matching
+        self._search_fields: List[Tuple[DesktopApp, Tuple[str, ...]]] = []
+        self._memo: Dict[tuple, Optional[DesktopApp]] = {}
+
+    def _ensure_current(self):
+        if self.generation == self.catalog.generation:
+            return
+        self.generation = self.catalog.generation
+        self._apps = self.catalog.get_apps()
+        self._table = {}
+        for app in self._apps:
+            for identifier in app_identifiers(app):
+                self._table[identifier] = app
+        self._search_fields = [
+            (app, tuple(
+                field.lower()
+                for field in (app.name, app.display_name, app.window_class, app.executable, app.command_line)
+                if field
+            ))
+            for app in self._apps
+        ]
+        self._memo = {}
+
+    def _remember(self, key: tuple, app: Optional[DesktopApp]) -> Optional[DesktopApp]:
+        if len(self._memo) >= MAX_MEMOIZED:
+            self._memo.clear()
+        self._memo[key] = app
+        return app
+
+    def find(self, key: str, fuzzy: bool = True) -> Optional[DesktopApp]:
+        """
+        App matching `key` exactly or once normalized as a window class.
+
+        With `fuzzy`, fall back to the first app with a name, class,
+        executable or command line containing the key.
+        """
+        if not key:
+            return None
+        self._ensure_current()
+        lowered = str(key).lower()
+        memo_key = (lowered, fuzzy)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+
+        app = self._table.get(lowered) or self._table.get(normalize_window_class(lowered))
+        if app is None and fuzzy:
+            app = next((app for app, fields in self._search_fields if any(lowered in f for f in fields)), None)
+        return self._remember(memo_key, app)
+
+    def find_app(self, app_identifier, fuzzy: bool = True) -> Optional[DesktopApp]:
+        """App of a string identifier or a pinned app data object."""
+        if not app_identifier:
+            return None
+        if isinstance(app_identifier, dict):
+            for key in IDENTIFIER_KEYS:
+                if app_identifier.get(key):
+                    app = self.find(app_identifier[key], fuzzy)
+                    if app: return app
+            return None
+        return self.find(app_identifier, fuzzy)
+
+    def resolve_window(self, window_class: str, title: str = "", fuzzy: bool = True) -> Optional[DesktopApp]:
+        """App of a window from its class, falling back to the app name leading its title."""
+        app = self.find(window_class, fuzzy)
+        if app is not None or not title:
+            return app
+        potential_name = title.split(" - ")[0].strip()
+        if len(potential_name) <= 2:
+            return None
+        return self.find(potential_name, fuzzy)
+
+
+# Singleton accessor
+_app_resolver_instance = None
+
+def get_app_resolver() -> AppResolver:
+    """Get the global AppResolver instance."""
+    global _app_resolver_instance
+    if _app_resolver_instance is None:
+        _app_resolver_instance = AppResolver()
+    return _app_resolver_instance
@@ -0,0 +1,199 @@
+import os
+from typing import Dict, List, Optional, Tuple
+
+from fabric.utils import DesktopApp
+from gi.repository import Gio, GLib
+
+from utils.signal import Signal
+
+# File monitor events are coalesced over this window before reparsing
+RELOAD_DELAY_MS = 300
+
+_RELOAD_EVENTS = {
+    Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+    Gio.FileMonitorEvent.CREATED,
+    Gio.FileMonitorEvent.DELETED,
+    Gio.FileMonitorEvent.MOVED_IN,
+    Gio.FileMonitorEvent.MOVED_OUT,
+    Gio.FileMonitorEvent.RENAMED,
+}
+
+
+class DesktopCatalog:
+    """
+    Shared catalog of desktop applications, updated incrementally.
+
+    Every applications directory under XDG_DATA_HOME and XDG_DATA_DIRS is
+    scanned once, on first use, and then watched with Gio file monitors.
+    Only .desktop files reported as changed are parsed again, so reading
+    the catalog does no filesystem I/O.
+
+    Desktop ids follow the XDG rules: a file in a subdirectory gets its
+    relative path with '/' replaced by '-', and the first directory in
+    XDG order that has an id shadows the rest, even when its entry is
+    hidden.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self._dirs = self._application_dirs()
+        # Directory -> desktop id -> (path, info or None if unparsable, app or None if not shown)
+        self._entries: Dict[str, Dict[str, Tuple[str, Optional[Gio.DesktopAppInfo], Optional[DesktopApp]]]] = {
+            directory: {} for directory in self._dirs
+        }
+        self._monitors: Dict[str, Gio.FileMonitor] = {}
+        self._dirty_paths = set()
+        self._reload_id = None
+        self._apps: Optional[List[DesktopApp]] = None
+        self._infos: Optional[List[Tuple[str, str, Gio.DesktopAppInfo]]] = None
+        self._loaded = False
+
+        # Bumped on every change, so consumers can tell when to rebuild derived data
+        self.generation = 0
+
+        # Signals
+        self.changed = Signal()
+
+    @staticmethod
+    def _application_dirs() -> List[str]:
+        candidates = [GLib.get_user_data_dir(), *GLib.get_system_data_dirs()]
+        dirs = []
+        seen = set()
+        for base in candidates:
+            directory = os.path.join(base, "applications")
+            real = os.path.realpath(directory)
+            if real not in seen:
+                seen.add(real)
+                dirs.append(directory)
+        return dirs
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        for directory in self._dirs:
+            for root, _subdirs, files in os.walk(directory):
+                self._watch(root)
+                for file_name in files:
+                    if file_name.endswith(".desktop"):
+                        self._load_file(directory, os.path.join(root, file_name))
+
+    def _watch(self, path: str):
+        if path in self._monitors:
+            return
+        try:
+            monitor = Gio.File.new_for_path(path).monitor_directory(
+                Gio.FileMonitorFlags.WATCH_MOVES, None
+            )
+        except GLib.Error as e:
+            print(f"DesktopCatalog: Error watching {path}: {e}")
+            return
+        monitor.connect("changed", self._on_changed)
+        self._monitors[path] = monitor
+
+    def _desktop_id(self, directory: str, path: str) -> str:
+        return os.path.relpath(path, directory).replace(os.sep, "-")
+
+    def _owning_dir(self, path: str) -> Optional[str]:
+        owner = None
+        for directory in self._dirs:
+            if path.startswith(directory + os.sep) and (owner is None or len(directory) > len(owner)):
+                owner = directory
+        return owner
+
+    def _load_file(self, directory: str, path: str):
+        desktop_id = self._desktop_id(directory, path)
+        app = None
+        try:
+            info = Gio.DesktopAppInfo.new_from_filename(path)
+        except Exception:
+            info = None
+        # Hidden=true entries still shadow the same id further down XDG_DATA_DIRS
+        if info is not None and info.should_show() and not info.get_is_hidden():
+            app = DesktopApp(info)
+        self._entries[directory][desktop_id] = (path, info, app)
+
+    def _on_changed(self, _monitor, file, other_file, event_type):
+        if event_type not in _RELOAD_EVENTS:
+            return
+        for changed in (file, other_file):
+            path = changed.get_path() if changed is not None else None
+            if not path:
+                continue
+            if path.endswith(".desktop"):
+                self._dirty_paths.add(path)
+            elif event_type in (Gio.FileMonitorEvent.CREATED, Gio.FileMonitorEvent.MOVED_IN) and os.path.isdir(path):
+                # New subdirectory: watch it and pick up whatever it already holds
+                for root, _subdirs, files in os.walk(path):
+                    self._watch(root)
+                    self._dirty_paths.update(
+                        os.path.join(root, name) for name in files if name.endswith(".desktop")
+                    )
+
+        if self._dirty_paths and self._reload_id is None:
+            self._reload_id = GLib.timeout_add(RELOAD_DELAY_MS, self._reload)
+
+    def _reload(self):
+        self._reload_id = None
+        dirty, self._dirty_paths = self._dirty_paths, set()
+        for path in dirty:
+            directory = self._owning_dir(path)
+            if directory is None:
+                continue
+            if os.path.isfile(path):
+                self._load_file(directory, path)
+            else:
+                self._entries[directory].pop(self._desktop_id(directory, path), None)
+
+        self._apps = None
+        self._infos = None
+        self.generation += 1
+        self.changed.emit()
+        return False
+
+    def _effective_entries(self):
+        """Yield the entry that wins for each desktop id, in XDG order."""
+        self._ensure_loaded()
+        seen = set()
+        for directory in self._dirs:
+            for desktop_id, entry in self._entries[directory].items():
+                if desktop_id not in seen:
+                    seen.add(desktop_id)
+                    yield desktop_id, entry
+
+    def get_apps(self) -> List[DesktopApp]:
+        """Get the visible desktop applications, like fabric's get_desktop_applications()."""
+        if self._apps is None:
+            self._apps = [app for _id, (_path, _info, app) in self._effective_entries() if app is not None]
+        return self._apps
+
+    def get_infos(self) -> List[Tuple[str, str, Gio.DesktopAppInfo]]:
+        """Get (desktop id, path, info) for every parsed entry, including hidden ones."""
+        if self._infos is None:
+            self._infos = [
+                (desktop_id, path, info)
+                for desktop_id, (path, info, _app) in self._effective_entries()
+                if info is not None
+            ]
+        return self._infos
+
+
+# Singleton accessor
+_desktop_catalog_instance = None
+
+def get_desktop_catalog() -> DesktopCatalog:
+    """Get the global DesktopCatalog instance."""
+    global _desktop_catalog_instance
+    if _desktop_catalog_instance is None:
+        _desktop_catalog_instance = DesktopCatalog()
+    return _desktop_catalog_instance
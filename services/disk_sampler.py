@@ -0,0 +1,136 @@
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+# /proc/diskstats counts sectors of 512 bytes, whatever the device's sector size
+SECTOR_SIZE = 512
+DISKSTATS_READ_SIZE = 64 * 1024
+
+
+class DiskIo(NamedTuple):
+    read: float  # Bytes per second
+    write: float
+    busy: float  # Percent of the interval with I/O in flight
+    latency: float  # Average milliseconds per completed request
+
+
+IDLE_IO = DiskIo(0.0, 0.0, 0.0, 0.0)
+
+
+def _mount_source(path: str, proc_root: str) -> Optional[str]:
+    """Source device of the mount holding `path`, from the longest matching mount point."""
+    path = os.path.realpath(path)
+    best, source = "", None
+    try:
+        with open(os.path.join(proc_root, "self/mountinfo")) as f:
+            for line in f:
+                fields = line.split()
+                # ID parent major:minor root mount-point options ... - fstype source options
+                mount_point = fields[4].replace("\\040", " ")
+                if path != mount_point and not path.startswith(mount_point.rstrip("/") + "/"):
+                    continue
+                if len(mount_point) >= len(best):
+                    best = mount_point
+                    source = fields[fields.index("-") + 2]
+    except (OSError, ValueError, IndexError):
+        return None
+    return source
+
+
+def resolve_block_device(path: str, proc_root: str = "/proc", sysfs_root: str = "/sys") -> Optional[str]:
+    """
+    Kernel name of the block device backing `path`, as listed in /proc/diskstats.
+
+    The file system's device number is looked up in /sys/dev/block. File
+    systems with anonymous device numbers, such as btrfs, fall back to the
+    source of the mount in mountinfo.
+    """
+    try:
+        st_dev = os.stat(path).st_dev
+    except OSError:
+        return None
+    block = os.path.join(sysfs_root, "dev/block", f"{os.major(st_dev)}:{os.minor(st_dev)}")
+    if os.path.exists(block):
+        return os.path.basename(os.path.realpath(block))
+
+    source = _mount_source(path, proc_root)
+    if source and source.startswith("/dev/"):
+        return os.path.basename(os.path.realpath(source))
+    return None
+
+
+class DiskSampler:
+    """
+    Throughput, saturation and latency of the block devices behind paths.
+
+    /proc/diskstats is kept open and read with one pread per sample; only
+    the lines of the tracked devices are split. Rates come from counter
+    deltas between samples, so the first sample reads idle.
+    """
+
+    def __init__(self, paths: List[str], proc_root: str = "/proc", sysfs_root: str = "/sys"):
+        self.paths = list(paths)
+        self.devices = [resolve_block_device(path, proc_root, sysfs_root) for path in self.paths]
+        self._names = {name.encode() for name in self.devices if name}
+        self._fd: Optional[int] = None
+        try:
+            self._fd = os.open(os.path.join(proc_root, "diskstats"), os.O_RDONLY)
+        except OSError:
+            pass
+        # Device name -> (reads, sectors read, ms reading, writes, sectors written, ms writing, ms doing I/O)
+        self._prev: Dict[bytes, tuple] = {}
+        self._prev_time = None
+
+    def _read_counters(self) -> Dict[bytes, tuple]:
+        if self._fd is None or not self._names:
+            return {}
+        try:
+            content = os.pread(self._fd, DISKSTATS_READ_SIZE, 0)
+        except OSError:
+            return {}
+        counters = {}
+        for line in content.split(b"\n"):
+            # major minor name, then the counters, which are only split for tracked devices
+            head = line.split(None, 3)
+            if len(head) < 4 or head[2] not in self._names:
+                continue
+            fields = line.split()
+            if len(fields) >= 13:
+                counters[fields[2]] = (
+                    int(fields[3]), int(fields[5]), int(fields[6]),
+                    int(fields[7]), int(fields[9]), int(fields[10]),
+                    int(fields[12]),
+                )
+        return counters
+
+    def sample(self, now: Optional[float] = None) -> List[DiskIo]:
+        """I/O of each path's device since the previous sample, in path order."""
+        now = time.monotonic() if now is None else now
+        elapsed = now - self._prev_time if self._prev_time is not None else 0.0
+        self._prev_time = now
+
+        counters = self._read_counters()
+        rates = {}
+        for name, current in counters.items():
+            previous = self._prev.get(name)
+            if previous is None or elapsed <= 0:
+                rates[name] = IDLE_IO
+                continue
+            reads, read_sectors, read_ms, writes, write_sectors, write_ms, io_ms = (
+                max(0, c - p) for c, p in zip(current, previous)
+            )
+            requests = reads + writes
+            rates[name] = DiskIo(
+                read=read_sectors * SECTOR_SIZE / elapsed,
+                write=write_sectors * SECTOR_SIZE / elapsed,
+                busy=min(100.0, io_ms / (elapsed * 10)),
+                latency=(read_ms + write_ms) / requests if requests else 0.0,
+            )
+        self._prev = counters
+
+        return [rates.get(name.encode(), IDLE_IO) if name else IDLE_IO for name in self.devices]
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
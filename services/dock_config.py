@@ -0,0 +1,199 @@
+import json
+import os
+from typing import List, Optional
+
+from fabric.utils import get_relative_path
+from gi.repository import Gio, GLib
+
+from services.desktop_catalog import get_desktop_catalog
+from utils.signal import Signal
+
+# File monitor events are coalesced over this window before reparsing
+RELOAD_DELAY_MS = 200
+
+# Pending changes are written in one batch after this delay
+FLUSH_DELAY_MS = 500
+
+_RELOAD_EVENTS = {
+    Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+    Gio.FileMonitorEvent.CREATED,
+    Gio.FileMonitorEvent.DELETED,
+    Gio.FileMonitorEvent.MOVED_IN,
+    Gio.FileMonitorEvent.MOVED_OUT,
+    Gio.FileMonitorEvent.RENAMED,
+}
+
+
+def app_data(app) -> dict:
+    """Pinned-app data object of a DesktopApp."""
+    return {
+        "name": app.name,
+        "display_name": app.display_name,
+        "window_class": app.window_class,
+        "executable": app.executable,
+        "command_line": app.command_line
+    }
+
+
+def parse_config(text: str) -> dict:
+    """Parse dock.json, upgrading pinned apps stored as plain names to data objects."""
+    config_data = json.loads(text)
+    if not isinstance(config_data, dict):
+        raise ValueError("dock config is not an object")
+
+    pinned = config_data.get("pinned_apps")
+    if pinned and isinstance(pinned[0], str):
+        app_map = {app.name: app for app in get_desktop_catalog().get_apps() if app.name}
+        config_data["pinned_apps"] = [
+            app_data(app_map[app_id]) if app_id in app_map else {"name": app_id}
+            for app_id in pinned
+        ]
+    return config_data
+
+
+class DockConfigStore:
+    """
+    Shared, parsed copy of config/dock.json.
+
+    The file is parsed once, then only again when a Gio file monitor on its
+    directory reports it changed, so idle docks do no disk I/O. `changed`
+    is emitted with the new config after every change, whether it came
+    from the file or from `set_pinned_apps`.
+
+    Updates are applied in memory at once and written in one batch after
+    FLUSH_DELAY_MS, through a temporary file renamed over dock.json, so
+    readers never see a partial file. The store's own writes are
+    recognised by their stat and not reparsed.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self.path = get_relative_path("../config/dock.json")
+        self._config = self._read()
+        self._reload_id = None
+        self._flush_id = None
+        self._written_stat = None
+
+        # Signals
+        self.changed = Signal()
+
+        # The directory is watched so a dock.json replaced by rename is still seen
+        self._monitor = None
+        try:
+            self._monitor = Gio.File.new_for_path(os.path.dirname(self.path)).monitor_directory(
+                Gio.FileMonitorFlags.WATCH_MOVES, None
+            )
+            self._monitor.connect("changed", self._on_changed)
+        except GLib.Error as e:
+            print(f"DockConfigStore: Error watching {self.path}: {e}")
+
+    @staticmethod
+    def _stat(path: str) -> Optional[tuple]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r") as file:
+                return parse_config(file.read())
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"DockConfigStore: Error reading {self.path}: {e}")
+        return {"pinned_apps": []}
+
+    def _on_changed(self, _monitor, file, other_file, event_type):
+        if event_type not in _RELOAD_EVENTS:
+            return
+        paths = {changed.get_path() for changed in (file, other_file) if changed is not None}
+        if self.path in paths and self._reload_id is None:
+            self._reload_id = GLib.timeout_add(RELOAD_DELAY_MS, self._reload)
+
+    def _reload(self):
+        self._reload_id = None
+        # A pending write holds newer state than the file
+        if self._flush_id is not None:
+            return False
+        if self._written_stat is not None and self._stat(self.path) == self._written_stat:
+            return False
+        self._written_stat = None
+
+        config = self._read()
+        if config != self._config:
+            self._config = config
+            self.changed.emit(self.get_config())
+        return False
+
+    def get_config(self) -> dict:
+        """A copy of the config, safe to modify."""
+        config = dict(self._config)
+        config["pinned_apps"] = list(self._config.get("pinned_apps", []))
+        return config
+
+    def get_pinned_apps(self) -> List:
+        return list(self._config.get("pinned_apps", []))
+
+    def set_pinned_apps(self, pinned_apps: List):
+        if pinned_apps == self._config.get("pinned_apps", []):
+            return
+        self._config = dict(self._config)
+        self._config["pinned_apps"] = list(pinned_apps)
+        self._schedule_flush()
+        self.changed.emit(self.get_config())
+
+    def pin_app(self, data: dict):
+        """Pin an app data object, or refresh the pinned entry with the same name."""
+        pinned = self.get_pinned_apps()
+        for i, pinned_app in enumerate(pinned):
+            if isinstance(pinned_app, dict) and pinned_app.get("name") == data["name"]:
+                pinned[i] = {**pinned_app, **data}
+                break
+            if isinstance(pinned_app, str) and pinned_app == data["name"]:
+                pinned.pop(i)
+                pinned.append(data)
+                break
+        else:
+            pinned.append(data)
+        self.set_pinned_apps(pinned)
+
+    def _schedule_flush(self):
+        if self._flush_id is None:
+            self._flush_id = GLib.timeout_add(FLUSH_DELAY_MS, self._flush)
+
+    def _flush(self):
+        self._flush_id = None
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump(self._config, file, indent=4)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.path)
+            self._written_stat = self._stat(self.path)
+        except OSError as e:
+            print(f"DockConfigStore: Error writing {self.path}: {e}")
+        return False
+
+
+# Singleton accessor
+_dock_config_store_instance = None
+
+def get_dock_config_store() -> DockConfigStore:
+    """Get the global DockConfigStore instance."""
+    global _dock_config_store_instance
+    if _dock_config_store_instance is None:
+        _dock_config_store_instance = DockConfigStore()
+    return _dock_config_store_instance
@@ -0,0 +1,169 @@
+import ctypes
+import glob
+import os
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from loguru import logger
+
+# GPUs nvtop can read but sysfs has no utilization for. i915 and xe only
+# expose engine busyness through perf and per-client fdinfo, which nvtop reads
+_NVTOP_ONLY_DRIVERS = ("nvidia", "nouveau", "msm", "panfrost", "panthor", "i915", "xe")
+
+
+def _read_int(fd: int) -> Optional[int]:
+    # sysfs attributes are regenerated on every read from offset 0
+    try:
+        return int(os.pread(fd, 32, 0).split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _open(path: str) -> Optional[int]:
+    try:
+        return os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+class GpuDevice(ABC):
+    """A GPU whose utilization can be sampled cheaply, in percent."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    @abstractmethod
+    def read(self) -> Optional[int]:
+        """Current utilization in percent, or None when it cannot be read."""
+
+    def close(self):
+        pass
+
+
+class AmdGpuDevice(GpuDevice):
+    """amdgpu reports its busy percentage directly in gpu_busy_percent."""
+
+    def __init__(self, name: str, busy_path: str):
+        super().__init__(name)
+        self._fd = _open(busy_path)
+
+    def read(self) -> Optional[int]:
+        return _read_int(self._fd) if self._fd is not None else None
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class _NvmlUtilization(ctypes.Structure):
+    _fields_ = [("gpu", ctypes.c_uint), ("memory", ctypes.c_uint)]
+
+
+class NvmlGpuDevice(GpuDevice):
+    """NVIDIA GPU sampled through NVML, loaded with ctypes."""
+
+    def __init__(self, name: str, lib, handle):
+        super().__init__(name)
+        self._lib = lib
+        self._handle = handle
+        self._utilization = _NvmlUtilization()
+
+    def read(self) -> Optional[int]:
+        if self._lib.nvmlDeviceGetUtilizationRates(self._handle, ctypes.byref(self._utilization)) != 0:
+            return None
+        return int(self._utilization.gpu)
+
+
+def _discover_nvml() -> List[GpuDevice]:
+    try:
+        lib = ctypes.CDLL("libnvidia-ml.so.1")
+    except OSError:
+        return []
+    try:
+        if lib.nvmlInit_v2() != 0:
+            return []
+        count = ctypes.c_uint()
+        if lib.nvmlDeviceGetCount_v2(ctypes.byref(count)) != 0:
+            return []
+        devices = []
+        for index in range(count.value):
+            handle = ctypes.c_void_p()
+            if lib.nvmlDeviceGetHandleByIndex_v2(index, ctypes.byref(handle)) != 0:
+                continue
+            name = ctypes.create_string_buffer(96)
+            lib.nvmlDeviceGetName(handle, name, len(name))
+            devices.append(NvmlGpuDevice(name.value.decode(errors="replace") or f"NVIDIA {index}", lib, handle))
+        return devices
+    except AttributeError as e:
+        logger.warning(f"NVML is missing expected symbols: {e}")
+        return []
+
+
+def _discover_drm(sysfs_root: str, skip_drivers=()):
+    """Return the sampleable DRM cards and how many cards only nvtop can sample."""
+    devices = []
+    unsupported = 0
+    for card in sorted(glob.glob(os.path.join(sysfs_root, "class/drm/card[0-9]*"))):
+        card_name = os.path.basename(card)
+        if "-" in card_name:
+            # Connectors such as card0-DP-1
+            continue
+        device_dir = os.path.join(card, "device")
+        driver = os.path.basename(os.path.realpath(os.path.join(device_dir, "driver")))
+        if driver in skip_drivers:
+            continue
+        name = _read_text(os.path.join(device_dir, "product_name")) or f"{driver} ({card_name})"
+
+        device = None
+        if driver == "amdgpu":
+            busy_path = os.path.join(device_dir, "gpu_busy_percent")
+            if os.path.exists(busy_path):
+                device = AmdGpuDevice(name, busy_path)
+
+        if device is not None:
+            devices.append(device)
+        elif driver in _NVTOP_ONLY_DRIVERS:
+            unsupported += 1
+    return devices, unsupported
+
+
+class GpuSampler:
+    """
+    Samples GPU utilization without spawning processes.
+
+    Devices are discovered once: NVIDIA GPUs through NVML when libnvidia-ml
+    is available, and AMD GPUs from /sys/class/drm. `sysfs_root`
+    can point at a fake tree for testing. When no device is found, or a
+    card has no native source (e.g. NVIDIA without NVML), `available` is
+    False and callers fall back to nvtop, which covers every vendor.
+    """
+
+    def __init__(self, sysfs_root: str = "/sys", use_nvml: bool = True):
+        nvml_devices = _discover_nvml() if use_nvml else []
+        skip = ("nvidia",) if nvml_devices else ()
+        drm_devices, self.unsupported = _discover_drm(sysfs_root, skip)
+        self.devices: List[GpuDevice] = nvml_devices + drm_devices
+
+    @property
+    def available(self) -> bool:
+        return bool(self.devices) and not self.unsupported
+
+    def device_names(self) -> List[str]:
+        return [device.name for device in self.devices]
+
+    def sample(self) -> List[int]:
+        """Utilization of every device in percent, 0 when a read fails."""
+        return [device.read() or 0 for device in self.devices]
+
+    def close(self):
+        for device in self.devices:
+            device.close()
@@ -0,0 +1,204 @@
+import os
+import socket
+from typing import Callable, Dict, List, Optional
+
+from gi.repository import GLib
+
+# Bytes read from the socket per wakeup
+RECV_SIZE = 8192
+
+# Reconnect backoff bounds
+RECONNECT_MIN_MS = 250
+RECONNECT_MAX_MS = 10000
+
+
+def get_socket2_path(signature: Optional[str] = None) -> Optional[str]:
+    """
+    Locate the Hyprland event socket (.socket2.sock).
+
+    Hyprland keeps its sockets under $XDG_RUNTIME_DIR/hypr/<signature>;
+    releases before 0.40 used /tmp/hypr/<signature> instead.
+    Returns None when no Hyprland instance signature is known.
+    """
+    signature = signature or os.environ.get("HYPRLAND_INSTANCE_SIGNATURE")
+    if not signature:
+        return None
+
+    candidates = []
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        candidates.append(os.path.join(runtime_dir, "hypr", signature, ".socket2.sock"))
+    candidates.append(os.path.join("/tmp", "hypr", signature, ".socket2.sock"))
+
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return candidates[0]
+
+
+class HyprlandEventReader:
+    """
+    Non-blocking reader for the Hyprland event socket, driven by the GLib loop.
+
+    Events are `name>>data` lines. Callbacks are registered per event name
+    and receive the raw data string. Event names are matched in place in
+    the receive buffer, so lines for events nobody listens to are skipped
+    without allocating anything. The reader reconnects with exponential
+    backoff when the socket goes away (e.g. Hyprland restarting).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self._socket: Optional[socket.socket] = None
+        self._watch_id = None
+        self._reconnect_id = None
+        self._backoff_ms = RECONNECT_MIN_MS
+        self._running = False
+
+        self._buffer = bytearray()
+        self._chunk = bytearray(RECV_SIZE)
+        self._chunk_view = memoryview(self._chunk)
+
+        self._handlers: Dict[bytes, List[Callable[[str], None]]] = {}
+        # Name length -> names with handlers, to match names without slicing the buffer
+        self._names_by_length: Dict[int, List[bytes]] = {}
+        self._connected_callbacks: List[Callable[[], None]] = []
+
+    @property
+    def is_connected(self) -> bool:
+        return self._socket is not None
+
+    def connect(self, event: str, callback: Callable[[str], None]):
+        """Call `callback(data)` for every `event>>data` line."""
+        name = event.encode()
+        if name not in self._handlers:
+            self._handlers[name] = []
+            self._names_by_length.setdefault(len(name), []).append(name)
+        self._handlers[name].append(callback)
+
+    def on_connected(self, callback: Callable[[], None]):
+        """Call `callback()` each time the socket is (re)connected."""
+        self._connected_callbacks.append(callback)
+
+    def start(self):
+        """Connect to the socket and start dispatching events."""
+        if self._running:
+            return
+        self._running = True
+        self._connect()
+
+    def stop(self):
+        """Disconnect and cancel any pending reconnect."""
+        self._running = False
+        if self._reconnect_id is not None:
+            GLib.source_remove(self._reconnect_id)
+            self._reconnect_id = None
+        self._disconnect()
+
+    def _connect(self) -> bool:
+        self._reconnect_id = None
+        if not self._running:
+            return False
+
+        path = self._path or get_socket2_path()
+        if not path:
+            print("HyprlandEventReader: HYPRLAND_INSTANCE_SIGNATURE is not set")
+            return False
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(path)
+        except OSError as e:
+            sock.close()
+            print(f"HyprlandEventReader: Error connecting to {path}: {e}")
+            self._schedule_reconnect()
+            return False
+
+        sock.setblocking(False)
+        self._socket = sock
+        self._buffer.clear()
+        self._watch_id = GLib.io_add_watch(
+            sock.fileno(),
+            GLib.PRIORITY_DEFAULT,
+            GLib.IO_IN | GLib.IO_HUP | GLib.IO_ERR,
+            self._on_io,
+        )
+
+        for callback in self._connected_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"HyprlandEventReader: Error in connected callback: {e}")
+        return False
+
+    def _disconnect(self):
+        if self._watch_id is not None:
+            GLib.source_remove(self._watch_id)
+            self._watch_id = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        self._buffer.clear()
+
+    def _schedule_reconnect(self):
+        if not self._running or self._reconnect_id is not None:
+            return
+        delay = self._backoff_ms
+        self._backoff_ms = min(self._backoff_ms * 2, RECONNECT_MAX_MS)
+        self._reconnect_id = GLib.timeout_add(delay, self._connect)
+
+    def _on_io(self, _fd, condition) -> bool:
+        closed = bool(condition & (GLib.IO_HUP | GLib.IO_ERR))
+        if condition & GLib.IO_IN:
+            closed = False
+            try:
+                while True:
+                    received = self._socket.recv_into(self._chunk)
+                    if received == 0:
+                        closed = True
+                        break
+                    self._buffer += self._chunk_view[:received]
+                    self._backoff_ms = RECONNECT_MIN_MS
+                    if received < RECV_SIZE:
+                        break
+            except BlockingIOError:
+                pass
+            except OSError as e:
+                print(f"HyprlandEventReader: Error reading socket: {e}")
+                closed = True
+            self._dispatch()
+
+        if not closed:
+            return True
+
+        # Peer closed the socket
+        self._watch_id = None
+        self._disconnect()
+        self._schedule_reconnect()
+        return False
+
+    def _dispatch(self):
+        buffer = self._buffer
+        handlers = self._handlers
+        names_by_length = self._names_by_length
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                break
+            sep = buffer.find(b">>", start, end)
+            for name in names_by_length.get(sep - start, ()) if sep >= 0 else ():
+                if not buffer.startswith(name, start):
+                    continue
+                data = buffer[sep + 2:end].decode("utf-8", "replace")
+                for callback in handlers[name]:
+                    try:
+                        callback(data)
+                    except Exception as e:
+                        print(f"HyprlandEventReader: Error in event callback: {e}")
+                break
+            start = end + 1
+
+        # Keep only the trailing partial line
+        if start:
+            del buffer[:start]
@@ -0,0 +1,487 @@
+import json
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional
+
+from fabric.hyprland.widgets import get_hyprland_connection
+from gi.repository import GLib
+
+from services.hyprland_events import HyprlandEventReader
+from utils.signal import Signal
+
+# Coalesce bursts of geometry events (a window opening reflows its whole
+# workspace and emits several events) into a single j/clients request.
+RESYNC_DELAY_MS = 30
+
+EMPTY_MAPPING = MappingProxyType({})
+
+
+class HyprlandSnapshot(NamedTuple):
+    """Read-only view of the Hyprland state at one point in time."""
+    clients: Mapping[str, Mapping]
+    monitors: tuple
+    workspaces: Mapping[int, Mapping]
+    active_window: Optional[Mapping]
+    generation: int
+
+
+def _freeze(obj: dict) -> Mapping:
+    return MappingProxyType(obj)
+
+
+def _normalize_address(address: str) -> str:
+    return address if address.startswith("0x") else f"0x{address}"
+
+
+class HyprlandStateStore:
+    """
+    In-process cache of Hyprland clients, workspaces, monitors and the active window.
+
+    The store reads socket2 once for the whole shell, through a
+    HyprlandEventReader, and applies events as deltas; other services
+    subscribe to its signals instead of opening their own listener. A full j/clients request is only made when an event can
+    change window geometry, and bursts of such events share one request.
+
+    Published records are never mutated in place: every change replaces the
+    record, so snapshots handed to consumers stay valid.
+
+    Signals:
+        client_added(address), client_removed(address),
+        client_moved(address, workspace_id), client_updated(address),
+        ready(): the initial sync finished,
+        clients_synced(): geometry of all clients refreshed,
+        active_window_changed(address),
+        monitor_focused(monitor_name, workspace_id),
+        workspace_changed(monitor_name, workspace_id),
+        workspaces_changed(), monitors_changed()
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self._clients: Dict[str, Mapping] = {}
+        self._monitors: List[Mapping] = []
+        self._workspaces: Dict[int, Mapping] = {}
+        self._active_address = ""
+        self._active_class = ""
+        self._focused_monitor_name = ""
+        self._generation = 0
+        self._resync_id = None
+        self._snapshot = None
+        self.is_ready = False
+
+        # Signals
+        self.ready = Signal()
+        self.client_added = Signal()
+        self.client_removed = Signal()
+        self.client_moved = Signal()
+        self.client_updated = Signal()
+        self.clients_synced = Signal()
+        self.active_window_changed = Signal()
+        self.monitor_focused = Signal()
+        self.workspace_changed = Signal()
+        self.workspaces_changed = Signal()
+        self.monitors_changed = Signal()
+
+        self.conn = get_hyprland_connection()
+
+        handlers = {
+            "openwindow": self._on_open_window,
+            "closewindow": self._on_close_window,
+            "movewindowv2": self._on_move_window,
+            "windowtitlev2": self._on_window_title,
+            "changefloatingmode": self._on_floating_mode,
+            "fullscreen": self._on_fullscreen,
+            "activewindow": self._on_active_window_class,
+            "activewindowv2": self._on_active_window,
+            "workspacev2": self._on_workspace,
+            "focusedmon": self._on_focused_monitor,
+            "activespecial": self._on_active_special,
+            "createworkspacev2": self._on_create_workspace,
+            "destroyworkspacev2": self._on_destroy_workspace,
+            "moveworkspacev2": self._on_move_workspace,
+            "renameworkspace": self._on_rename_workspace,
+            "monitoradded": self._on_monitors_event,
+            "monitorremoved": self._on_monitors_event,
+        }
+        self._reader = HyprlandEventReader()
+        for event, handler in handlers.items():
+            # Arguments are comma separated; handlers rejoin the trailing ones that may hold commas
+            self._reader.connect(event, lambda data, handler=handler: handler(data.split(",")))
+        # Events may have been missed while disconnected
+        self._reader.on_connected(self.sync)
+        self._reader.start()
+
+    # ------------------------------------------------------------------
+    # Full synchronisation
+    # ------------------------------------------------------------------
+
+    def _request(self, command: str):
+        try:
+            return json.loads(self.conn.send_command(command).reply.decode())
+        except Exception as e:
+            print(f"HyprlandStateStore: Error requesting '{command}': {e}")
+            return None
+
+    def sync(self):
+        """Reload everything from Hyprland, at startup and after reconnecting to socket2."""
+        self._load_monitors()
+        self._load_workspaces()
+        self._load_clients()
+
+        active = self._request("j/activewindow") or {}
+        self._active_address = active.get("address", "")
+        self._active_class = active.get("class", "")
+
+        self._touch()
+        if not self.is_ready:
+            self.is_ready = True
+            self.ready.emit()
+        self.monitors_changed.emit()
+        self.workspaces_changed.emit()
+        self.clients_synced.emit()
+        self.active_window_changed.emit(self._active_address)
+
+    def _load_monitors(self):
+        monitors = self._request("j/monitors")
+        if monitors is None:
+            return
+        self._monitors = [_freeze(monitor) for monitor in monitors]
+        for monitor in monitors:
+            if monitor.get("focused", False):
+                self._focused_monitor_name = monitor.get("name", "")
+
+    def _load_workspaces(self):
+        workspaces = self._request("j/workspaces")
+        if workspaces is None:
+            return
+        self._workspaces = {ws["id"]: _freeze(ws) for ws in workspaces if "id" in ws}
+
+    def _load_clients(self):
+        clients = self._request("j/clients")
+        if clients is None:
+            return
+        self._clients = {client["address"]: _freeze(client) for client in clients if "address" in client}
+
+    def _schedule_resync(self):
+        if self._resync_id is None:
+            self._resync_id = GLib.timeout_add(RESYNC_DELAY_MS, self._resync_clients)
+
+    def _resync_clients(self):
+        self._resync_id = None
+        self._load_clients()
+        self._touch()
+        self.clients_synced.emit()
+        return False
+
+    def _touch(self):
+        self._generation += 1
+        self._snapshot = None
+
+    # ------------------------------------------------------------------
+    # Event deltas
+    # ------------------------------------------------------------------
+
+    def _workspace_from_name(self, name: str) -> Mapping:
+        for workspace in self._workspaces.values():
+            if workspace.get("name") == name:
+                return workspace
+        try:
+            return _freeze({"id": int(name), "name": name})
+        except ValueError:
+            return _freeze({"id": -1, "name": name})
+
+    def _replace_client(self, address: str, **changes) -> bool:
+        client = self._clients.get(address)
+        if client is None:
+            return False
+        updated = dict(client)
+        updated.update(changes)
+        self._clients[address] = _freeze(updated)
+        return True
+
+    def _on_open_window(self, args):
+        # openwindow>>ADDRESS,WORKSPACENAME,CLASS,TITLE
+        if len(args) < 3:
+            self._schedule_resync()
+            return
+        address = _normalize_address(args[0])
+        workspace = self._workspace_from_name(args[1])
+        title = ",".join(args[3:])
+        self._clients[address] = _freeze({
+            "address": address,
+            "mapped": True,
+            "hidden": False,
+            "at": None,
+            "size": None,
+            "workspace": _freeze({"id": workspace.get("id", -1), "name": workspace.get("name", args[1])}),
+            "floating": False,
+            "fullscreen": 0,
+            "class": args[2],
+            "initialClass": args[2],
+            "title": title,
+            "initialTitle": title,
+        })
+        self._touch()
+        self.client_added.emit(address)
+        self._schedule_resync()
+
+    def _on_close_window(self, args):
+        # closewindow>>ADDRESS
+        if not args:
+            return
+        address = _normalize_address(args[0])
+        if self._clients.pop(address, None) is not None:
+            self._touch()
+            self.client_removed.emit(address)
+        self._schedule_resync()
+
+    def _on_move_window(self, args):
+        # movewindowv2>>ADDRESS,WORKSPACEID,WORKSPACENAME
+        if len(args) < 3:
+            self._schedule_resync()
+            return
+        address = _normalize_address(args[0])
+        try:
+            workspace_id = int(args[1])
+        except ValueError:
+            workspace_id = -1
+        workspace = _freeze({"id": workspace_id, "name": ",".join(args[2:])})
+        if self._replace_client(address, workspace=workspace):
+            self._touch()
+            self.client_moved.emit(address, workspace_id)
+        self._schedule_resync()
+
+    def _on_window_title(self, args):
+        # windowtitlev2>>ADDRESS,TITLE (no geometry change, no resync)
+        if len(args) < 2:
+            return
+        address = _normalize_address(args[0])
+        if self._replace_client(address, title=",".join(args[1:])):
+            self._touch()
+            self.client_updated.emit(address)
+
+    def _on_floating_mode(self, args):
+        # changefloatingmode>>ADDRESS,FLOATING
+        if len(args) >= 2:
+            address = _normalize_address(args[0])
+            if self._replace_client(address, floating=args[1] == "1"):
+                self._touch()
+                self.client_updated.emit(address)
+        self._schedule_resync()
+
+    def _on_fullscreen(self, args):
+        # fullscreen>>0/1, applies to the active window
+        if args and self._replace_client(self._active_address, fullscreen=int(args[0] == "1")):
+            self._touch()
+            self.client_updated.emit(self._active_address)
+        self._schedule_resync()
+
+    def _on_active_window_class(self, args):
+        # activewindow>>CLASS,TITLE arrives before activewindowv2
+        self._active_class = args[0] if args else ""
+
+    def _on_active_window(self, args):
+        # activewindowv2>>ADDRESS (empty when no window is focused)
+        address = args[0] if args else ""
+        address = _normalize_address(address) if address and address != "," else ""
+        if address == self._active_address:
+            return
+        self._active_address = address
+        self._touch()
+        self.active_window_changed.emit(address)
+
+        # Floating windows can be dragged without Hyprland emitting any event,
+        # focusing one is the best hint we get that its geometry may be stale.
+        client = self._clients.get(address)
+        if client is not None and client.get("floating", False):
+            self._schedule_resync()
+
+    def _set_monitor_workspace(self, monitor_name: str, workspace: Mapping, key: str = "activeWorkspace") -> bool:
+        for index, monitor in enumerate(self._monitors):
+            if monitor.get("name") == monitor_name:
+                updated = dict(monitor)
+                updated[key] = _freeze({"id": workspace.get("id", -1), "name": workspace.get("name", "")})
+                self._monitors[index] = _freeze(updated)
+                return True
+        return False
+
+    def _on_workspace(self, args):
+        # workspacev2>>WORKSPACEID,WORKSPACENAME, on the focused monitor
+        if len(args) < 2:
+            return
+        try:
+            workspace = _freeze({"id": int(args[0]), "name": ",".join(args[1:])})
+        except ValueError:
+            return
+        if self._set_monitor_workspace(self._focused_monitor_name, workspace):
+            self._touch()
+            self.workspace_changed.emit(self._focused_monitor_name, workspace["id"])
+
+    def _on_focused_monitor(self, args):
+        # focusedmon>>MONITORNAME,WORKSPACENAME
+        if not args:
+            return
+        self._focused_monitor_name = args[0]
+        if len(args) > 1:
+            workspace = self._workspace_from_name(",".join(args[1:]))
+            self._set_monitor_workspace(args[0], workspace)
+            self._touch()
+            self.monitor_focused.emit(args[0], workspace.get("id", -1))
+            self.workspace_changed.emit(args[0], workspace.get("id", -1))
+
+    def _on_active_special(self, args):
+        # activespecial>>WORKSPACENAME,MONITORNAME (empty name when closed)
+        if len(args) < 2:
+            return
+        monitor_name = args[-1]
+        name = ",".join(args[:-1])
+        workspace = self._workspace_from_name(name) if name else _freeze({"id": 0, "name": ""})
+        if self._set_monitor_workspace(monitor_name, workspace, key="specialWorkspace"):
+            self._touch()
+            self.workspace_changed.emit(monitor_name, workspace.get("id", 0))
+
+    def _on_create_workspace(self, args):
+        # createworkspacev2>>WORKSPACEID,WORKSPACENAME
+        if len(args) < 2:
+            return
+        try:
+            workspace_id = int(args[0])
+        except ValueError:
+            return
+        self._workspaces[workspace_id] = _freeze({
+            "id": workspace_id,
+            "name": ",".join(args[1:]),
+            "monitor": self._focused_monitor_name,
+        })
+        self._touch()
+        self.workspaces_changed.emit()
+
+    def _on_destroy_workspace(self, args):
+        # destroyworkspacev2>>WORKSPACEID,WORKSPACENAME
+        try:
+            workspace_id = int(args[0])
+        except (IndexError, ValueError):
+            return
+        if self._workspaces.pop(workspace_id, None) is not None:
+            self._touch()
+            self.workspaces_changed.emit()
+
+    def _on_move_workspace(self, args):
+        # moveworkspacev2>>WORKSPACEID,WORKSPACENAME,MONITORNAME
+        if len(args) < 3:
+            return
+        try:
+            workspace_id = int(args[0])
+        except ValueError:
+            return
+        workspace = dict(self._workspaces.get(workspace_id, {"id": workspace_id, "name": args[1]}))
+        workspace["monitor"] = args[-1]
+        self._workspaces[workspace_id] = _freeze(workspace)
+        self._touch()
+        self.workspaces_changed.emit()
+        # Moving a workspace changes which workspace monitors show
+        self._on_monitors_event()
+
+    def _on_rename_workspace(self, args):
+        # renameworkspace>>WORKSPACEID,NEWNAME
+        if len(args) < 2:
+            return
+        try:
+            workspace_id = int(args[0])
+        except ValueError:
+            return
+        if workspace_id in self._workspaces:
+            workspace = dict(self._workspaces[workspace_id])
+            workspace["name"] = ",".join(args[1:])
+            self._workspaces[workspace_id] = _freeze(workspace)
+            self._touch()
+            self.workspaces_changed.emit()
+
+    def _on_monitors_event(self, _args=None):
+        self._load_monitors()
+        self._touch()
+        self.monitors_changed.emit()
+        self._schedule_resync()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get_snapshot(self) -> HyprlandSnapshot:
+        """Get a read-only snapshot of the whole state. Cached until the next change."""
+        if self._snapshot is None:
+            self._snapshot = HyprlandSnapshot(
+                clients=MappingProxyType(dict(self._clients)),
+                monitors=tuple(self._monitors),
+                workspaces=MappingProxyType(dict(self._workspaces)),
+                active_window=self.get_active_window(),
+                generation=self._generation,
+            )
+        return self._snapshot
+
+    def get_clients(self) -> List[Mapping]:
+        """Get all clients, in the order Hyprland reported them."""
+        return list(self._clients.values())
+
+    def get_client(self, address: str) -> Optional[Mapping]:
+        return self._clients.get(_normalize_address(address)) if address else None
+
+    def get_monitors(self) -> List[Mapping]:
+        return list(self._monitors)
+
+    def get_workspaces(self) -> List[Mapping]:
+        return list(self._workspaces.values())
+
+    def get_focused_monitor_name(self) -> str:
+        return self._focused_monitor_name
+
+    def get_focused_monitor(self) -> Optional[Mapping]:
+        for monitor in self._monitors:
+            if monitor.get("name") == self._focused_monitor_name:
+                return monitor
+        return self._monitors[0] if self._monitors else None
+
+    def get_active_workspace_id(self) -> int:
+        """Get the id of the workspace shown on the focused monitor."""
+        monitor = self.get_focused_monitor()
+        if monitor is None:
+            return 0
+        return (monitor.get("activeWorkspace") or EMPTY_MAPPING).get("id", 0)
+
+    def get_active_address(self) -> str:
+        return self._active_address
+
+    def get_active_window(self) -> Optional[Mapping]:
+        """Get the active client, or None when no window is focused."""
+        if not self._active_address:
+            return None
+        client = self._clients.get(self._active_address)
+        if client is not None:
+            return client
+        return _freeze({"address": self._active_address, "class": self._active_class, "initialClass": ""})
+
+    def get_active_window_class(self) -> str:
+        window = self.get_active_window()
+        if window is None:
+            return ""
+        return window.get("initialClass", "") or window.get("class", "")
+
+
+# Singleton accessor
+_hyprland_state_store_instance = None
+
+def get_hyprland_state() -> HyprlandStateStore:
+    """Get the global HyprlandStateStore instance."""
+    global _hyprland_state_store_instance
+    if _hyprland_state_store_instance is None:
+        _hyprland_state_store_instance = HyprlandStateStore()
+    return _hyprland_state_store_instance
@@ -0,0 +1,178 @@
+import math
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from gi.repository import GLib
+
+import config.data as data
+
+HISTORY_FILE = os.path.join(data.CACHE_DIR, "launch_history.tsv")
+
+# A launch counts half as much after this long
+HALF_LIFE_SECONDS = 7 * 24 * 3600
+
+# Pending launches are written in one batch after this delay
+FLUSH_DELAY_MS = 2000
+
+# The log is rewritten as one snapshot line per app past this many launch lines
+COMPACT_THRESHOLD = 500
+
+_DECAY = math.log(2) / HALF_LIFE_SECONDS
+
+
+def app_key(app) -> str:
+    """Stable key for a DesktopApp (or a dock pinned-app dict)."""
+    if isinstance(app, dict):
+        return app.get("name") or app.get("display_name") or ""
+    return getattr(app, "name", None) or getattr(app, "display_name", None) or ""
+
+
+class LaunchHistory:
+    """
+    Frecency store for application launches.
+
+    Each app has a score that gains 1 per launch and halves every
+    HALF_LIFE_SECONDS, so frequent and recent launches both rank high.
+    Scores are kept as (score, timestamp) pairs and decayed on read.
+
+    The history file is append-only: snapshot lines `S<TAB>key<TAB>score<TAB>ts`
+    followed by launch lines `L<TAB>ts<TAB>key`. Launches are recorded in
+    memory immediately and appended in batches from a worker thread;
+    once enough launch lines pile up the file is compacted back to one
+    snapshot line per app. Nothing is read until scores are first needed.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self._entries: Optional[Dict[str, Tuple[float, float]]] = None
+        self._pending: List[Tuple[float, str]] = []
+        self._flush_id = None
+        self._log_lines = 0
+        self._write_queue = None
+
+    def _load(self):
+        entries: Dict[str, Tuple[float, float]] = {}
+        log_lines = 0
+        try:
+            with open(HISTORY_FILE, "r") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    try:
+                        if parts[0] == "S" and len(parts) == 4:
+                            entries[parts[1]] = (float(parts[2]), float(parts[3]))
+                        elif parts[0] == "L" and len(parts) == 3:
+                            self._add(entries, parts[2], float(parts[1]))
+                            log_lines += 1
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"LaunchHistory: Error loading {HISTORY_FILE}: {e}")
+
+        self._entries = entries
+        self._log_lines = log_lines
+
+    @staticmethod
+    def _add(entries: Dict[str, Tuple[float, float]], key: str, timestamp: float):
+        score, last = entries.get(key, (0.0, timestamp))
+        elapsed = max(0.0, timestamp - last)
+        entries[key] = (score * math.exp(-_DECAY * elapsed) + 1.0, max(last, timestamp))
+
+    def _ensure_loaded(self) -> Dict[str, Tuple[float, float]]:
+        if self._entries is None:
+            self._load()
+        return self._entries
+
+    def record(self, app):
+        """Record a launch of `app` (a DesktopApp, pinned-app dict or key)."""
+        key = app if isinstance(app, str) else app_key(app)
+        if not key or "\t" in key or "\n" in key:
+            return
+
+        now = time.time()
+        self._add(self._ensure_loaded(), key, now)
+        self._pending.append((now, key))
+        if self._flush_id is None:
+            self._flush_id = GLib.timeout_add(FLUSH_DELAY_MS, self._flush)
+
+    def score(self, app) -> float:
+        """Current frecency score of `app`, 0 if it was never launched."""
+        key = app if isinstance(app, str) else app_key(app)
+        entry = self._ensure_loaded().get(key)
+        if entry is None:
+            return 0.0
+        score, last = entry
+        return score * math.exp(-_DECAY * max(0.0, time.time() - last))
+
+    def scores(self) -> Dict[str, float]:
+        """Current frecency scores of every launched app, by key."""
+        now = time.time()
+        return {
+            key: score * math.exp(-_DECAY * max(0.0, now - last))
+            for key, (score, last) in self._ensure_loaded().items()
+        }
+
+    def _flush(self):
+        self._flush_id = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return False
+
+        self._log_lines += len(pending)
+        snapshot = None
+        if self._log_lines >= COMPACT_THRESHOLD:
+            snapshot = dict(self._entries)
+            self._log_lines = 0
+
+        # A single writer thread keeps batches in order
+        if self._write_queue is None:
+            self._write_queue = queue.Queue()
+            threading.Thread(target=self._writer, daemon=True).start()
+        self._write_queue.put((pending, snapshot))
+        return False
+
+    def _writer(self):
+        while True:
+            pending, snapshot = self._write_queue.get()
+            try:
+                os.makedirs(os.path.dirname(HISTORY_FILE), exist_ok=True)
+                if snapshot is None:
+                    with open(HISTORY_FILE, "a") as f:
+                        f.writelines(f"L\t{ts:.0f}\t{key}\n" for ts, key in pending)
+                    continue
+
+                # The snapshot already includes the pending launches
+                tmp_path = HISTORY_FILE + ".tmp"
+                with open(tmp_path, "w") as f:
+                    f.writelines(
+                        f"S\t{key}\t{score:.6g}\t{last:.0f}\n"
+                        for key, (score, last) in snapshot.items()
+                    )
+                os.replace(tmp_path, HISTORY_FILE)
+            except Exception as e:
+                print(f"LaunchHistory: Error writing {HISTORY_FILE}: {e}")
+
+
+# Singleton accessor
+_launch_history_instance = None
+
+def get_launch_history() -> LaunchHistory:
+    """Get the global LaunchHistory instance."""
+    global _launch_history_instance
+    if _launch_history_instance is None:
+        _launch_history_instance = LaunchHistory()
+    return _launch_history_instance
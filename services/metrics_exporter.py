@@ -0,0 +1,203 @@
+import json
+import math
+import os
+import socket
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from gi.repository import GLib
+
+# A request line is at most this long; anything longer is answered with an error
+MAX_REQUEST_SIZE = 4096
+
+
+class Metric(NamedTuple):
+    """A gauge family: name, help text and (labels, value) samples."""
+    name: str
+    help: str
+    samples: List[Tuple[Dict[str, str], float]]
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def format_prometheus(metrics: List[Metric]) -> str:
+    """Render gauges in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for metric in metrics:
+        if not metric.samples:
+            continue
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} gauge")
+        for labels, value in metric.samples:
+            if labels:
+                rendered = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+                lines.append(f"{metric.name}{{{rendered}}} {_format_value(value)}")
+            else:
+                lines.append(f"{metric.name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def format_json(metrics: List[Metric]) -> str:
+    """Render gauges as JSON; NaN and infinite values, which JSON cannot hold, become null."""
+    return json.dumps({
+        metric.name: {
+            "help": metric.help,
+            "samples": [
+                {"labels": labels, "value": value if math.isfinite(value) else None}
+                for labels, value in metric.samples
+            ],
+        }
+        for metric in metrics
+    })
+
+
+class MetricsExporter:
+    """
+    Serves the shell's latest metrics over a local UNIX socket.
+
+    `snapshot` returns the current gauges from already collected values,
+    so a request never triggers sampling. A client sends one request line
+    and gets the response before the connection is closed:
+
+        prometheus | json                 plain protocol
+        GET /metrics | GET /metrics.json  HTTP, e.g. curl --unix-socket
+
+    The listening socket and every client are non-blocking and driven by
+    GLib IO watches on the main loop; a response is queued and written as
+    the client's socket accepts it.
+    """
+
+    def __init__(self, snapshot: Callable[[], List[Metric]], path: str):
+        self._snapshot = snapshot
+        self.path = path
+        self._socket: Optional[socket.socket] = None
+        self._watch_id = None
+        # Client fd -> (socket, watch id, received request, then the unsent response)
+        self._clients: Dict[int, Tuple[socket.socket, int, bytearray]] = {}
+
+    def start(self):
+        if self._socket is not None:
+            return
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(self.path)
+            os.chmod(self.path, 0o600)
+            sock.listen(8)
+        except OSError as e:
+            sock.close()
+            print(f"MetricsExporter: Error listening on {self.path}: {e}")
+            return
+        sock.setblocking(False)
+        self._socket = sock
+        self._watch_id = GLib.io_add_watch(sock.fileno(), GLib.PRIORITY_DEFAULT, GLib.IO_IN, self._on_accept)
+
+    def stop(self):
+        for fd in list(self._clients):
+            self._close_client(fd)
+        if self._watch_id is not None:
+            GLib.source_remove(self._watch_id)
+            self._watch_id = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _on_accept(self, _fd, _condition) -> bool:
+        try:
+            while True:
+                client, _ = self._socket.accept()
+                client.setblocking(False)
+                watch_id = GLib.io_add_watch(
+                    client.fileno(), GLib.PRIORITY_DEFAULT,
+                    GLib.IO_IN | GLib.IO_HUP | GLib.IO_ERR, self._on_client,
+                )
+                self._clients[client.fileno()] = (client, watch_id, bytearray())
+        except BlockingIOError:
+            pass
+        except OSError as e:
+            print(f"MetricsExporter: Error accepting a client: {e}")
+        return True
+
+    def _on_client(self, fd, condition) -> bool:
+        client, _, buffer = self._clients[fd]
+        try:
+            chunk = client.recv(MAX_REQUEST_SIZE)
+        except BlockingIOError:
+            return True
+        except OSError:
+            chunk = b""
+        if not chunk:
+            self._close_client(fd, remove_watch=False)
+            return False
+
+        buffer += chunk
+        end = buffer.find(b"\n")
+        if end < 0 and len(buffer) < MAX_REQUEST_SIZE:
+            return True
+
+        request = bytes(buffer[:end if end >= 0 else MAX_REQUEST_SIZE]).decode("utf-8", "replace").strip()
+        watch_id = GLib.io_add_watch(
+            fd, GLib.PRIORITY_DEFAULT, GLib.IO_OUT | GLib.IO_HUP | GLib.IO_ERR, self._on_writable,
+        )
+        self._clients[fd] = (client, watch_id, bytearray(self._respond(request)))
+        return False
+
+    def _on_writable(self, fd, _condition) -> bool:
+        client, _, pending = self._clients[fd]
+        try:
+            sent = client.send(pending)
+        except BlockingIOError:
+            return True
+        except OSError:
+            # The client went away
+            sent = len(pending)
+        del pending[:sent]
+        if pending:
+            return True
+        self._close_client(fd, remove_watch=False)
+        return False
+
+    def _respond(self, request: str) -> bytes:
+        http = request.startswith("GET ")
+        target = request.split()[1] if http and len(request.split()) > 1 else request
+
+        if target in ("json", "/json", "/metrics.json"):
+            body, content_type, status = format_json(self._snapshot()), "application/json", "200 OK"
+        elif target in ("prometheus", "/", "/metrics"):
+            body, content_type, status = format_prometheus(self._snapshot()), "text/plain; version=0.0.4", "200 OK"
+        else:
+            body, content_type, status = "unknown request, use 'prometheus' or 'json'\n", "text/plain", "404 Not Found"
+
+        payload = body.encode()
+        if not http:
+            return payload
+        header = (
+            f"HTTP/1.0 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n"
+        )
+        return header.encode() + payload
+
+    def _close_client(self, fd: int, remove_watch: bool = True):
+        client, watch_id, _ = self._clients.pop(fd)
+        if remove_watch:
+            GLib.source_remove(watch_id)
+        client.close()
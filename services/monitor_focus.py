@@ -1,34 +1,16 @@
-import json
-import subprocess
-import threading
 from typing import Optional
 
-
-class Signal:
-    """Simple signal implementation for monitor focus service."""
-    
-    def __init__(self):
-        self._callbacks = []
-    
-    def connect(self, callback):
-        """Connect a callback to this signal."""
-        self._callbacks.append(callback)
-    
-    def emit(self, *args, **kwargs):
-        """Emit the signal to all connected callbacks."""
-        for callback in self._callbacks:
-            try:
-                callback(*args, **kwargs)
-            except Exception as e:
-                print(f"Error in signal callback: {e}")
+from services.hyprland_state import get_hyprland_state
+from utils.signal import Signal
 
 
 class MonitorFocusService:
     """
     Service to track monitor focus changes through Hyprland events.
     
-    Listens to 'focusedmon' and 'workspace' events and emits signals
-    when monitor focus changes.
+    Follows the focusedmon and workspace events applied by the shared
+    HyprlandStateStore, which owns the socket2 connection, and emits
+    signals when monitor focus changes.
     """
     
     _instance = None
@@ -47,8 +29,7 @@ class MonitorFocusService:
         self._monitor_info = {}  # Store rich monitor information
         self._current_workspace = 1
         self._current_monitor_name = ""
-        self._listening = False
-        self._thread = None
+        self._store = None
         
         # Signals
         self.monitor_focused = Signal()
@@ -86,103 +67,49 @@ class MonitorFocusService:
             self._monitor_info = {}
     
     def start_listening(self):
-        """Start listening to Hyprland events in a separate thread."""
-        if self._listening:
+        """Start following the focus events of the Hyprland state store."""
+        if self._store is not None:
             return
-        
-        self._listening = True
-        self._thread = threading.Thread(target=self._listen_to_hyprland, daemon=True)
-        self._thread.start()
+
+        self._store = get_hyprland_state()
+        self._current_monitor_name = self._store.get_focused_monitor_name()
+        self._store.monitor_focused.connect(self._handle_focused_monitor)
+        self._store.workspace_changed.connect(self._handle_workspace_change)
+        # Resynced after reconnecting, when events may have been missed
+        self._store.monitors_changed.connect(self._update_monitor_mapping)
     
     def stop_listening(self):
-        """Stop listening to Hyprland events."""
-        self._listening = False
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=1.0)
-    
-    def _listen_to_hyprland(self):
-        """Listen to Hyprland events via socat."""
-        try:
-            process = subprocess.Popen(
-                ["socat", "-U", "-", "UNIX-CONNECT:/tmp/hypr/$HYPRLAND_INSTANCE_SIGNATURE/.socket2.sock"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1
-            )
-            
-            while self._listening and process.poll() is None:
-                if process.stdout:
-                    line = process.stdout.readline()
-                    if line:
-                        self._handle_hyprland_event(line.strip())
-                    
-        except (subprocess.SubprocessError, FileNotFoundError) as e:
-            print(f"MonitorFocusService: Error listening to Hyprland: {e}")
-        except Exception as e:
-            print(f"MonitorFocusService: Unexpected error: {e}")
-    
-    def _handle_hyprland_event(self, event_line: str):
-        """Parse and handle Hyprland event."""
+        """Stop following the Hyprland state store."""
+        if self._store is not None:
+            self._store.monitor_focused.disconnect(self._handle_focused_monitor)
+            self._store.workspace_changed.disconnect(self._handle_workspace_change)
+            self._store.monitors_changed.disconnect(self._update_monitor_mapping)
+            self._store = None
+    
+    def _handle_focused_monitor(self, monitor_name: str, workspace_id: int):
+        """Handle focusedmon event: monitor_name,workspace_name"""
         try:
-            if '>>' not in event_line:
-                return
+            # Update monitor mapping if needed
+            if monitor_name not in self._monitor_name_to_id:
+                self._update_monitor_mapping()
             
-            parts = event_line.split('>>')
-            if len(parts) < 2:
-                return
+            monitor_id = self._monitor_name_to_id.get(monitor_name, 0)
             
-            event_type = parts[0]
-            event_data = parts[1]
+            self._current_monitor_name = monitor_name
+            self._current_workspace = workspace_id
             
-            if event_type == "focusedmon":
-                self._handle_focused_monitor(event_data)
-            elif event_type == "workspace":
-                self._handle_workspace_change(event_data)
-                
-        except Exception as e:
-            print(f"MonitorFocusService: Error handling event '{event_line}': {e}")
-    
-    def _handle_focused_monitor(self, data: str):
-        """Handle focusedmon event: monitor_name,workspace_name"""
-        try:
-            parts = data.split(',')
-            if len(parts) >= 2:
-                monitor_name = parts[0]
-                workspace_name = parts[1]
-                
-                # Update monitor mapping if needed
-                if monitor_name not in self._monitor_name_to_id:
-                    self._update_monitor_mapping()
-                
-                monitor_id = self._monitor_name_to_id.get(monitor_name, 0)
-                
-                # Extract workspace ID from name
-                try:
-                    workspace_id = int(workspace_name)
-                except ValueError:
-                    workspace_id = 1
-                
-                self._current_monitor_name = monitor_name
-                self._current_workspace = workspace_id
-                
-                # Emit signal
-                self.monitor_focused.emit(monitor_name, monitor_id, workspace_id)
+            # Emit signal
+            self.monitor_focused.emit(monitor_name, monitor_id, workspace_id)
                 
         except Exception as e:
             print(f"MonitorFocusService: Error in _handle_focused_monitor: {e}")
     
-    def _handle_workspace_change(self, data: str):
-        """Handle workspace event: workspace_name"""
+    def _handle_workspace_change(self, monitor_name: str, workspace_id: int):
+        """Handle a workspace shown on the focused monitor"""
+        # Special workspaces (negative ids, 0 once closed) overlay the workspace instead of replacing it
+        if monitor_name != self._current_monitor_name or workspace_id <= 0 or workspace_id == self._current_workspace:
+            return
         try:
-            workspace_name = data.strip()
-            
-            # Extract workspace ID
-            try:
-                workspace_id = int(workspace_name)
-            except ValueError:
-                workspace_id = 1
-            
             self._current_workspace = workspace_id
             
             # Emit signal
@@ -0,0 +1,144 @@
+import math
+import os
+import time
+from typing import Dict, NamedTuple, Optional
+
+from services.network import NetworkClient
+from services.sampler_scheduler import get_sampler_scheduler
+
+# Seconds over which a rate change is mostly (63%) reflected
+EWMA_TIME_CONSTANT = 2.0
+SAMPLE_INTERVAL = 1
+
+
+class InterfaceRate(NamedTuple):
+    kind: str  # 'wifi', 'wired', 'vpn' or 'other', as reported by NetworkClient
+    down: float  # Bytes per second, smoothed
+    up: float
+
+
+def _read_counter(fd: int) -> Optional[int]:
+    try:
+        return int(os.pread(fd, 32, 0))
+    except (OSError, ValueError):
+        return None
+
+
+class _Interface:
+    def __init__(self, name: str, kind: str, sysfs_root: str):
+        self.name = name
+        self.kind = kind
+        statistics = os.path.join(sysfs_root, "class/net", name, "statistics")
+        self.rx_fd = self._open(os.path.join(statistics, "rx_bytes"))
+        self.tx_fd = self._open(os.path.join(statistics, "tx_bytes"))
+        self.rx = None
+        self.tx = None
+        self.down = 0.0
+        self.up = 0.0
+
+    @staticmethod
+    def _open(path: str) -> Optional[int]:
+        try:
+            return os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+
+    def close(self):
+        for fd in (self.rx_fd, self.tx_fd):
+            if fd is not None:
+                os.close(fd)
+        self.rx_fd = self.tx_fd = None
+
+
+class NetRateSampler:
+    """
+    Per-interface network throughput from sysfs byte counters.
+
+    Only the interfaces of active connections are read, two kept-open
+    statistics files each, instead of every counter psutil collects.
+    Rates are smoothed with an exponentially weighted moving average
+    whose weight follows the actual time between samples, so slowed-down
+    sampling does not skew them.
+
+    With a `network_client`, the interface set follows its active
+    connections and the sampler registers itself with the sampler
+    scheduler. Widgets register their own task every SAMPLE_INTERVAL,
+    bound to the widget, and read `rates()`: the scheduler runs them in
+    the same wake-up, after the sampler, which registered first.
+    """
+
+    def __init__(self, sysfs_root: str = "/sys", network_client=None):
+        self.sysfs_root = sysfs_root
+        self.primary: Optional[str] = None
+        self._interfaces: Dict[str, _Interface] = {}
+        self._last_time = None
+
+        self._network_client = network_client
+        if network_client is not None:
+            network_client.connect("interfaces-changed", lambda *_: self._on_interfaces_changed())
+            self._on_interfaces_changed()
+            get_sampler_scheduler().register(self.sample, SAMPLE_INTERVAL)
+
+    def _on_interfaces_changed(self):
+        self.set_interfaces(self._network_client.get_interfaces())
+
+    def set_interfaces(self, interfaces: Dict[str, str]):
+        """Sample these interfaces, given as name -> kind with the primary one first."""
+        for name in list(self._interfaces):
+            if name not in interfaces:
+                self._interfaces.pop(name).close()
+        for name, kind in interfaces.items():
+            if name in self._interfaces:
+                self._interfaces[name].kind = kind
+            else:
+                self._interfaces[name] = _Interface(name, kind, self.sysfs_root)
+        self.primary = next(iter(interfaces), None)
+
+    def sample(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        elapsed = now - self._last_time if self._last_time is not None else 0.0
+        self._last_time = now
+        weight = 1.0 - math.exp(-elapsed / EWMA_TIME_CONSTANT) if elapsed > 0 else 0.0
+
+        for interface in self._interfaces.values():
+            rx = _read_counter(interface.rx_fd) if interface.rx_fd is not None else None
+            tx = _read_counter(interface.tx_fd) if interface.tx_fd is not None else None
+            if rx is not None and interface.rx is not None and elapsed > 0:
+                # Counters go backwards when an interface is recreated
+                down = max(0, rx - interface.rx) / elapsed
+                interface.down += weight * (down - interface.down)
+            if tx is not None and interface.tx is not None and elapsed > 0:
+                up = max(0, tx - interface.tx) / elapsed
+                interface.up += weight * (up - interface.up)
+            interface.rx = rx
+            interface.tx = tx
+        return True
+
+    def rates(self) -> Dict[str, InterfaceRate]:
+        """Smoothed rates of every sampled interface, the primary one first."""
+        return {
+            name: InterfaceRate(interface.kind, interface.down, interface.up)
+            for name, interface in self._interfaces.items()
+        }
+
+    def primary_rate(self) -> InterfaceRate:
+        interface = self._interfaces.get(self.primary) if self.primary else None
+        if interface is None:
+            return InterfaceRate("other", 0.0, 0.0)
+        return InterfaceRate(interface.kind, interface.down, interface.up)
+
+    def close(self):
+        for interface in self._interfaces.values():
+            interface.close()
+        self._interfaces = {}
+
+
+# Singleton accessor
+_net_rate_sampler_instance = None
+
+def get_net_rate_sampler() -> NetRateSampler:
+    """Get the global NetRateSampler, following NetworkManager's active connections."""
+    global _net_rate_sampler_instance
+    if _net_rate_sampler_instance is None:
+        _net_rate_sampler_instance = NetRateSampler(network_client=NetworkClient())
+    return _net_rate_sampler_instance
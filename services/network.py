@@ -1,4 +1,4 @@
-from typing import Any, List, Literal
+from typing import Any, Dict, List, Literal
 
 import gi
 from fabric.core.service import Property, Service, Signal
@@ -309,6 +309,9 @@ class NetworkClient(Service):
     @Signal
     def device_ready(self) -> None: ...
 
+    @Signal
+    def interfaces_changed(self) -> None: ...
+
     def __init__(self, **kwargs):
         self._client: NM.Client | None = None
         self.wifi_device: Wifi | None = None
@@ -327,6 +330,8 @@ class NetworkClient(Service):
         if self._client:
             self._client.connect("device-added", self._on_device_added)
             self._client.connect("device-removed", self._on_device_removed)
+            self._client.connect("notify::active-connections", lambda *_: self.emit("interfaces-changed"))
+            self._client.connect("notify::primary-connection", self._on_primary_connection_changed)
         
         self._scan_and_setup_devices()
         
@@ -351,6 +356,11 @@ class NetworkClient(Service):
         # Always emit device-ready signal, even if no devices found
         self.emit("device-ready")
         self.notify("primary-device")
+        self.emit("interfaces-changed")
+
+    def _on_primary_connection_changed(self, *_):
+        self.notify("primary-device")
+        self.emit("interfaces-changed")
 
     def _on_device_added(self, client, device):
         """Handle when a new network device is added"""
@@ -545,6 +555,40 @@ class NetworkClient(Service):
                     lambda *args: print(f"Connection result: {args}")
                 )
 
+    def get_interfaces(self) -> Dict[str, str]:
+        """
+        Kernel interfaces of the active connections, the primary one first.
+
+        Each maps to 'wifi', 'wired', 'vpn' (WireGuard, tun and VPN plugin
+        tunnels) or 'other'. A VPN plugin connection is listed through its
+        base device, so only interfaces not seen yet are added.
+        """
+        if not self._client:
+            return {}
+
+        primary = self._client.get_primary_connection()
+        active = list(self._client.get_active_connections() or [])
+        if primary in active:
+            active.remove(primary)
+            active.insert(0, primary)
+
+        interfaces = {}
+        for connection in active:
+            connection_type = str(connection.get_connection_type())
+            if connection_type == "loopback":
+                continue
+            kind = (
+                "wifi" if "wireless" in connection_type
+                else "wired" if "ethernet" in connection_type
+                else "vpn" if connection_type in ("vpn", "wireguard", "tun")
+                else "other"
+            )
+            for device in connection.get_devices() or []:
+                name = device.get_ip_iface() or device.get_iface()
+                if name and name not in interfaces:
+                    interfaces[name] = kind
+        return interfaces
+
     @Property(str, "readable") # type: ignore
     def primary_device(self) -> Literal["wifi", "wired"] | None:
         return self._get_primary_device()
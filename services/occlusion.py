@@ -0,0 +1,195 @@
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from services.hyprland_state import get_hyprland_state
+from utils.signal import Signal
+
+
+class OcclusionService:
+    """
+    Event-driven occlusion engine.
+
+    Window geometry and the workspace shown on each monitor come from the
+    shared HyprlandStateStore, which is kept current from socket2 events.
+    Occlusion queries are answered from memory, and watchers are notified
+    only when the occlusion state of their region actually changes.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self._watchers: Dict[int, Tuple[int, object, Callable[[bool], None], bool]] = {}
+        self._next_watch_id = 1
+
+        # Signals
+        self.changed = Signal()
+
+        self.store = get_hyprland_state()
+        self.store.clients_synced.connect(self._notify_watchers)
+        self.store.client_removed.connect(lambda *_: self._notify_watchers())
+        self.store.client_updated.connect(lambda *_: self._notify_watchers())
+        self.store.workspace_changed.connect(lambda *_: self._notify_watchers())
+        self.store.monitors_changed.connect(self._notify_watchers)
+
+    @staticmethod
+    def _logical_monitor(monitor: Mapping) -> Dict:
+        """Convert a Hyprland monitor record to logical coordinates."""
+        scale = monitor.get('scale', 1.0) or 1.0
+        width = monitor.get('width', 0) / scale
+        height = monitor.get('height', 0) / scale
+        # Rotated monitors swap their logical dimensions
+        if monitor.get('transform', 0) % 2 == 1:
+            width, height = height, width
+
+        return {
+            'name': monitor.get('name', ''),
+            'x': monitor.get('x', 0),
+            'y': monitor.get('y', 0),
+            'width': int(width),
+            'height': int(height),
+            'workspace': (monitor.get('activeWorkspace') or {}).get('id', -1),
+            'special': (monitor.get('specialWorkspace') or {}).get('id', 0),
+        }
+
+    def _get_monitor(self, monitor_id: Optional[int]) -> Optional[Dict]:
+        """Resolve a shell monitor id (index in the monitor list) or the focused monitor."""
+        if monitor_id is None:
+            monitor = self.store.get_focused_monitor()
+        else:
+            monitors = self.store.get_monitors()
+            monitor = monitors[monitor_id] if 0 <= monitor_id < len(monitors) else None
+        return self._logical_monitor(monitor) if monitor is not None else None
+
+    def _resolve_region(self, region, monitor: Dict) -> Optional[Tuple[int, int, int, int]]:
+        """Convert a (side, size) or (x, y, width, height) region to monitor-local coordinates."""
+        if isinstance(region, tuple) and len(region) == 2 and isinstance(region[0], str):
+            side, size = region
+            width, height = monitor['width'], monitor['height']
+            side = side.lower()
+            if side == "bottom":
+                return (0, height - size, width, size)
+            if side == "top":
+                return (0, 0, width, size)
+            if side == "left":
+                return (0, 0, size, height)
+            if side == "right":
+                return (width - size, 0, size, height)
+            return None
+        if isinstance(region, tuple) and len(region) == 4:
+            return region
+        return None
+
+    def get_current_workspace(self, monitor_id: Optional[int] = None) -> int:
+        """Get the workspace shown on a monitor (the focused one by default)."""
+        monitor = self._get_monitor(monitor_id)
+        return monitor['workspace'] if monitor else -1
+
+    def get_screen_dimensions(self, monitor_id: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """Get the logical (width, height) of a monitor (the focused one by default)."""
+        monitor = self._get_monitor(monitor_id)
+        return (monitor['width'], monitor['height']) if monitor else None
+
+    def is_occluded(self, region, monitor_id: Optional[int] = None, workspace: Optional[int] = None) -> bool:
+        """
+        Check if a region is covered by any window, using the in-memory model.
+
+        Parameters:
+            region: (side, size) with side in "top", "bottom", "left", "right",
+                or (x, y, width, height) relative to the monitor.
+            monitor_id: Monitor to check. If None, the focused monitor is used.
+            workspace: Workspace to check. If None, the workspaces currently
+                shown on the monitor are used.
+        """
+        monitor = self._get_monitor(monitor_id)
+        if monitor is None:
+            return False
+
+        rect = self._resolve_region(region, monitor)
+        if rect is None:
+            print(f"Invalid occlusion region format: {region}")
+            return False
+
+        if workspace is None:
+            workspaces = {monitor['workspace'], monitor['special']} - {0}
+        else:
+            workspaces = {workspace}
+
+        occ_x1 = monitor['x'] + rect[0]
+        occ_y1 = monitor['y'] + rect[1]
+        occ_x2 = occ_x1 + rect[2]
+        occ_y2 = occ_y1 + rect[3]
+
+        for client in self.store.get_clients():
+            if not client.get("mapped", False) or client.get("hidden", False):
+                continue
+            if (client.get("workspace") or {}).get("id") not in workspaces:
+                continue
+            if client.get("fullscreen", False):
+                return True
+
+            # Geometry is unknown until the store resyncs a freshly opened window
+            position = client.get("at")
+            size = client.get("size")
+            if not position or not size:
+                continue
+
+            x, y = position
+            width, height = size
+            if not (x + width <= occ_x1 or x >= occ_x2 or y + height <= occ_y1 or y >= occ_y2):
+                return True
+
+        return False
+
+    def watch(self, monitor_id: int, region, callback: Callable[[bool], None]) -> int:
+        """
+        Call `callback(is_occluded)` whenever the occlusion state of a region changes.
+
+        The callback is invoked once immediately with the current state.
+        Returns an id that can be passed to `unwatch`.
+        """
+        watch_id = self._next_watch_id
+        self._next_watch_id += 1
+
+        state = self.is_occluded(region, monitor_id)
+        self._watchers[watch_id] = (monitor_id, region, callback, state)
+        callback(state)
+        return watch_id
+
+    def unwatch(self, watch_id: int):
+        """Stop notifying a watcher registered with `watch`."""
+        self._watchers.pop(watch_id, None)
+
+    def _notify_watchers(self):
+        changed_monitors = set()
+        for watch_id, (monitor_id, region, callback, state) in list(self._watchers.items()):
+            new_state = self.is_occluded(region, monitor_id)
+            if new_state == state:
+                continue
+            self._watchers[watch_id] = (monitor_id, region, callback, new_state)
+            changed_monitors.add(monitor_id)
+            try:
+                callback(new_state)
+            except Exception as e:
+                print(f"OcclusionService: Error in watcher callback: {e}")
+
+        for monitor_id in changed_monitors:
+            self.changed.emit(monitor_id)
+
+
+# Singleton accessor
+_occlusion_service_instance = None
+
+def get_occlusion_service() -> OcclusionService:
+    """Get the global OcclusionService instance."""
+    global _occlusion_service_instance
+    if _occlusion_service_instance is None:
+        _occlusion_service_instance = OcclusionService()
+    return _occlusion_service_instance
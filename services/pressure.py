@@ -0,0 +1,145 @@
+import os
+from typing import Dict, NamedTuple, Optional
+
+from gi.repository import GLib
+from loguru import logger
+
+from utils.signal import Signal
+
+RESOURCES = ("cpu", "memory", "io")
+
+# Raise an alert when tasks stall on a resource for 200 ms within a 2 s window.
+# Unprivileged triggers need a window that is a multiple of 2 s.
+TRIGGER_STALL_US = 200_000
+TRIGGER_WINDOW_US = 2_000_000
+# The kernel only reports a trigger while the stall goes on, at most once per
+# window, so an alert is cleared after two windows without one
+ALERT_CLEAR_MS = 2 * TRIGGER_WINDOW_US // 1000
+
+
+class Pressure(NamedTuple):
+    # Percent of time some (or all non-idle) tasks stalled, over 10 s and 60 s
+    some10: float
+    some60: float
+    full10: float
+    full60: float
+
+
+NO_PRESSURE = Pressure(0.0, 0.0, 0.0, 0.0)
+
+
+def _parse_averages(line: bytes):
+    # some avg10=1.09 avg60=0.85 avg300=0.96 total=105753563
+    fields = line.split()
+    return float(fields[1][6:]), float(fields[2][6:])
+
+
+class PressureMonitor:
+    """
+    Pressure Stall Information for CPU, memory and I/O.
+
+    `sample()` re-reads the kept-open /proc/pressure files with one pread
+    each. Alerts do not depend on sampling: a kernel trigger is armed on
+    each file and its fd is watched by the GLib main loop, which wakes up
+    only when the kernel reports a stall over the threshold. `changed` is
+    emitted with the resource and its new alert state.
+    """
+
+    def __init__(self, proc_root: str = "/proc"):
+        self.pressure_dir = os.path.join(proc_root, "pressure")
+        self.changed = Signal()
+        self.alerts = {resource: False for resource in RESOURCES}
+        self._fds: Dict[str, int] = {}
+        self._trigger_fds: Dict[str, int] = {}
+        self._clear_ids: Dict[str, int] = {}
+
+        for resource in RESOURCES:
+            try:
+                self._fds[resource] = os.open(os.path.join(self.pressure_dir, resource), os.O_RDONLY)
+            except OSError:
+                pass
+        if not self._fds:
+            logger.info("PSI is not available (kernel without CONFIG_PSI or psi=0)")
+
+    @property
+    def available(self) -> bool:
+        return bool(self._fds)
+
+    def sample(self) -> Dict[str, Pressure]:
+        pressures = {}
+        for resource, fd in self._fds.items():
+            try:
+                lines = os.pread(fd, 256, 0).split(b"\n")
+                some = _parse_averages(lines[0])
+                # The cpu file has no meaningful "full" line on older kernels
+                full = _parse_averages(lines[1]) if lines[1].startswith(b"full") else (0.0, 0.0)
+            except (OSError, ValueError, IndexError):
+                continue
+            pressures[resource] = Pressure(some[0], some[1], full[0], full[1])
+        return pressures
+
+    def start_triggers(self):
+        """Arm a kernel trigger per resource, once."""
+        for resource in RESOURCES:
+            if resource in self._trigger_fds or resource not in self._fds:
+                continue
+            fd = self._arm_trigger(resource)
+            if fd is not None:
+                self._trigger_fds[resource] = fd
+                GLib.unix_fd_add_full(
+                    GLib.PRIORITY_DEFAULT, fd, GLib.IOCondition.PRI | GLib.IOCondition.ERR,
+                    self._on_trigger, resource,
+                )
+
+    def _arm_trigger(self, resource: str) -> Optional[int]:
+        try:
+            fd = os.open(os.path.join(self.pressure_dir, resource), os.O_RDWR | os.O_NONBLOCK)
+        except OSError as e:
+            logger.warning(f"Cannot open PSI trigger for {resource}: {e}")
+            return None
+        try:
+            os.write(fd, f"some {TRIGGER_STALL_US} {TRIGGER_WINDOW_US}\0".encode())
+        except OSError as e:
+            logger.warning(f"Cannot arm PSI trigger for {resource}: {e}")
+            os.close(fd)
+            return None
+        return fd
+
+    def _on_trigger(self, fd, condition, resource):
+        if condition & GLib.IOCondition.ERR:
+            # The pressure file went away, e.g. its cgroup was removed
+            logger.warning(f"PSI trigger for {resource} failed")
+            os.close(self._trigger_fds.pop(resource))
+            clear_id = self._clear_ids.get(resource)
+            if clear_id is not None:
+                GLib.source_remove(clear_id)
+            self._clear(resource)
+            return False
+
+        clear_id = self._clear_ids.pop(resource, None)
+        if clear_id is not None:
+            GLib.source_remove(clear_id)
+        self._clear_ids[resource] = GLib.timeout_add(ALERT_CLEAR_MS, self._clear, resource)
+        if not self.alerts[resource]:
+            self.alerts[resource] = True
+            self.changed.emit(resource, True)
+        return True
+
+    def _clear(self, resource):
+        self._clear_ids.pop(resource, None)
+        if self.alerts[resource]:
+            self.alerts[resource] = False
+            self.changed.emit(resource, False)
+        return False
+
+
+# Singleton accessor
+_pressure_monitor_instance = None
+
+def get_pressure_monitor() -> PressureMonitor:
+    """Get the global PressureMonitor instance, with its triggers armed."""
+    global _pressure_monitor_instance
+    if _pressure_monitor_instance is None:
+        _pressure_monitor_instance = PressureMonitor()
+        _pressure_monitor_instance.start_triggers()
+    return _pressure_monitor_instance
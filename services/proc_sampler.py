@@ -0,0 +1,204 @@
+import heapq
+import os
+import resource
+import time
+from array import array
+from typing import List, NamedTuple, Optional, Tuple
+
+# Kernel clock ticks per second, the unit of /proc CPU times
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+# Large enough for /proc/stat on machines with a few hundred cores
+STAT_READ_SIZE = 64 * 1024
+# /proc/[pid]/stat is one line of about 300 bytes
+PID_STAT_READ_SIZE = 1024
+# Processes whose stat did not change are re-read every this many samples,
+# staggered by pid; the others every sample
+IDLE_RESCAN_SAMPLES = 4
+
+
+class ProcessSample(NamedTuple):
+    pid: int
+    name: str
+    cpu: float  # Percent of one core, as in top
+    rss: int  # Bytes
+
+
+class ProcSampler:
+    """
+    Per-core and per-process CPU sampling straight from /proc.
+
+    /proc/stat is kept open and re-read with a single pread per sample;
+    the previous per-core counters live in preallocated arrays, so a
+    core sample allocates nothing per core. Each process is sampled with
+    one pread of its /proc/[pid]/stat, which holds the CPU times, RSS and
+    name; the file stays open between samples, and is only parsed when
+    its content changed. Most processes sleep, so one whose stat did not
+    change is only re-read every IDLE_RESCAN_SAMPLES samples: CPU use
+    is computed over the time since the previous read, so a process
+    waking up between reads still reports its average. Only the top
+    entries get their name decoded. `proc_root` can point at a fake tree
+    for testing.
+    """
+
+    def __init__(self, proc_root: str = "/proc"):
+        self.proc_root = proc_root
+        self._stat_fd: Optional[int] = None
+        try:
+            self._stat_fd = os.open(os.path.join(proc_root, "stat"), os.O_RDONLY)
+        except OSError:
+            pass
+
+        self.core_count = len(self._read_core_lines())
+        self._prev_total = array('d', bytes(8 * self.core_count))
+        self._prev_idle = array('d', bytes(8 * self.core_count))
+        self.cores = array('f', bytes(4 * self.core_count))
+
+        # pid -> [stat fd or None, last stat content, utime + stime, name, read time, idle]
+        self._procs = {}
+        # pid -> RSS in pages, from the last read of its stat
+        self._pages = {}
+        self._samples = 0
+        self._open_fds = 0
+        # Keep stat files open across samples, within a share of the fd limit
+        soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        self._max_open_fds = max(0, (soft_limit if soft_limit != resource.RLIM_INFINITY else 4096) // 4)
+
+    def _read_core_lines(self) -> List[bytes]:
+        if self._stat_fd is None:
+            return []
+        try:
+            content = os.pread(self._stat_fd, STAT_READ_SIZE, 0)
+        except OSError:
+            return []
+        # Per-core lines are "cpuN ..." and follow the aggregate "cpu " line
+        return [line for line in content.split(b"\n") if line[:3] == b"cpu" and line[3:4].isdigit()]
+
+    def sample_cores(self) -> array:
+        """Utilization of every core in percent since the previous call."""
+        lines = self._read_core_lines()
+        for i, line in enumerate(lines[:self.core_count]):
+            fields = line.split()
+            # user nice system idle iowait irq softirq steal
+            total = float(sum(int(v) for v in fields[1:9]))
+            idle = float(int(fields[4]) + int(fields[5]))
+            delta_total = total - self._prev_total[i]
+            delta_idle = idle - self._prev_idle[i]
+            self._prev_total[i] = total
+            self._prev_idle[i] = idle
+            self.cores[i] = 100.0 * (1.0 - delta_idle / delta_total) if delta_total > 0 else 0.0
+        return self.cores
+
+    def _open_pid_stat(self, entry: str) -> Optional[int]:
+        try:
+            return os.open(f"{self.proc_root}/{entry}/stat", os.O_RDONLY)
+        except OSError:
+            return None  # Exited since the listing
+
+    def sample_processes(self, top: int = 5) -> Tuple[List[ProcessSample], List[ProcessSample]]:
+        """
+        Return the `top` processes by CPU since the previous call, and by RSS.
+
+        The first call has no previous CPU times, so every process reads 0%.
+        """
+        now = time.monotonic()
+        self._samples += 1
+        rescan = self._samples % IDLE_RESCAN_SAMPLES
+
+        prev = self._procs
+        pages = self._pages
+        procs = {}
+        # pid -> CPU percent, only for processes that used any
+        cpu = {}
+        for entry in os.listdir(self.proc_root):
+            if not entry.isdigit():
+                continue
+            pid = int(entry)
+            state = prev.pop(pid, None)
+            if state is not None and state[5] and pid % IDLE_RESCAN_SAMPLES != rescan:
+                procs[pid] = state
+                continue
+            content = None
+            if state is not None and state[0] is not None:
+                try:
+                    content = os.pread(state[0], PID_STAT_READ_SIZE, 0)
+                except OSError:
+                    # The process exited and its pid was reused
+                    os.close(state[0])
+                    self._open_fds -= 1
+                    state = None
+
+            if content is None:
+                fd = self._open_pid_stat(entry)
+                if fd is None:
+                    pages.pop(pid, None)
+                    continue
+                try:
+                    content = os.pread(fd, PID_STAT_READ_SIZE, 0)
+                except OSError:
+                    content = b""
+                if self._open_fds < self._max_open_fds:
+                    self._open_fds += 1
+                else:
+                    os.close(fd)
+                    fd = None
+                if state is None:
+                    state = [fd, b"", 0, b"", now, False]
+                else:
+                    state[0] = fd
+
+            if content == state[1]:
+                # Nothing changed since the previous read, which is the common
+                # case for sleeping processes
+                state[5] = True
+            else:
+                # The name may itself contain spaces and parentheses
+                name_end = content.rfind(b")")
+                fields = content[name_end + 2:].split(b" ", 22)
+                if len(fields) < 23:
+                    # Not kept in procs, so its fd would never be closed
+                    if state[0] is not None:
+                        os.close(state[0])
+                        self._open_fds -= 1
+                    pages.pop(pid, None)
+                    continue
+                # Fields are numbered from 3 (state) after the name
+                total = int(fields[11]) + int(fields[12])  # utime + stime
+                if state[1] and total > state[2] and now > state[4]:
+                    cpu[pid] = (total - state[2]) * 100.0 / ((now - state[4]) * CLK_TCK)
+                state[1] = content
+                state[2] = total
+                state[3] = content[content.find(b"(") + 1:name_end]
+                state[5] = False
+                pages[pid] = int(fields[21])
+            state[4] = now
+            procs[pid] = state
+
+        # Whatever is left has exited
+        for pid, state in prev.items():
+            if state[0] is not None:
+                os.close(state[0])
+                self._open_fds -= 1
+            pages.pop(pid, None)
+        self._procs = procs
+
+        def to_sample(pid):
+            return ProcessSample(pid, procs[pid][3].decode(errors="replace"), cpu.get(pid, 0.0), pages[pid] * PAGE_SIZE)
+
+        rss_pids = heapq.nlargest(top, pages, key=pages.__getitem__)
+        # Few processes use CPU in any sample; idle ones fill up the list by RSS
+        cpu_pids = heapq.nlargest(top, cpu, key=cpu.__getitem__)
+        cpu_pids += [pid for pid in rss_pids if pid not in cpu][:top - len(cpu_pids)]
+        return [to_sample(pid) for pid in cpu_pids], [to_sample(pid) for pid in rss_pids]
+
+    def close(self):
+        if self._stat_fd is not None:
+            os.close(self._stat_fd)
+            self._stat_fd = None
+        for state in self._procs.values():
+            if state[0] is not None:
+                os.close(state[0])
+        self._procs = {}
+        self._pages = {}
+        self._open_fds = 0
@@ -0,0 +1,203 @@
+import math
+import time
+from typing import Callable, Dict
+
+from gi.repository import Gio, GLib
+
+# Sampling slows down by these factors while the session is idle or locked, and on battery
+IDLE_FACTOR = 4
+BATTERY_FACTOR = 2
+
+# Tasks due within this window are run in the same wake-up
+WAKE_TOLERANCE = 0.5
+
+
+class _Task:
+    def __init__(self, handle: int, callback: Callable, interval: float, widget=None):
+        self.handle = handle
+        self.callback = callback
+        self.interval = interval
+        self.widget = widget
+        self.next_due = 0.0
+        # Set when a due run was skipped because the widget was not mapped
+        self.stale = False
+        self.signal_ids = []
+
+
+class SamplerScheduler:
+    """
+    Single timer for periodic sampling work, such as metrics widgets.
+
+    Tasks register a callback, an interval in seconds and, optionally, a
+    widget. Instead of one GLib timer per task, the scheduler keeps one
+    timeout_add_seconds source armed for the earliest due task. Due times
+    are aligned to multiples of each task's interval, so tasks with the
+    same interval, or multiples of it, run in the same wake-up.
+
+    A task bound to a widget is skipped while that widget is unmapped, for
+    example on a hidden notch page. It runs as soon as the widget is mapped
+    again, and is unregistered when the widget is destroyed. While the
+    session is idle or locked (logind IdleHint/LockedHint), or the system
+    is on battery (UPower OnBattery), every interval is stretched.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self._tasks: Dict[int, _Task] = {}
+        self._next_handle = 1
+        self._source_id = None
+
+        self.idle = False
+        self.on_battery = False
+        self._upower = None
+        self._session = None
+        self._watch_power_state()
+
+    def _watch_power_state(self):
+        try:
+            self._upower = Gio.DBusProxy.new_for_bus_sync(
+                Gio.BusType.SYSTEM, Gio.DBusProxyFlags.NONE, None,
+                "org.freedesktop.UPower", "/org/freedesktop/UPower",
+                "org.freedesktop.UPower", None,
+            )
+            self._upower.connect("g-properties-changed", lambda *_: self._update_power_state())
+        except GLib.Error as e:
+            print(f"SamplerScheduler: Error connecting to UPower: {e}")
+            self._upower = None
+
+        try:
+            self._session = Gio.DBusProxy.new_for_bus_sync(
+                Gio.BusType.SYSTEM, Gio.DBusProxyFlags.NONE, None,
+                "org.freedesktop.login1", "/org/freedesktop/login1/session/auto",
+                "org.freedesktop.login1.Session", None,
+            )
+            self._session.connect("g-properties-changed", lambda *_: self._update_power_state())
+        except GLib.Error as e:
+            print(f"SamplerScheduler: Error connecting to logind: {e}")
+            self._session = None
+
+        self._update_power_state()
+
+    @staticmethod
+    def _get_bool(proxy, name: str) -> bool:
+        if proxy is None:
+            return False
+        value = proxy.get_cached_property(name)
+        return bool(value.unpack()) if value is not None else False
+
+    def _update_power_state(self):
+        idle = self._get_bool(self._session, "IdleHint") or self._get_bool(self._session, "LockedHint")
+        on_battery = self._get_bool(self._upower, "OnBattery")
+        if (idle, on_battery) == (self.idle, self.on_battery):
+            return
+        self.idle = idle
+        self.on_battery = on_battery
+
+        # Re-align every task to the new cadence, starting from now
+        now = time.monotonic()
+        for task in self._tasks.values():
+            task.next_due = self._align(now, task.interval)
+        self._reschedule()
+
+    def slowdown(self) -> int:
+        """Current factor applied to every interval."""
+        factor = 1
+        if self.idle:
+            factor *= IDLE_FACTOR
+        if self.on_battery:
+            factor *= BATTERY_FACTOR
+        return factor
+
+    def _align(self, now: float, interval: float) -> float:
+        step = interval * self.slowdown()
+        return (math.floor(now / step) + 1) * step
+
+    def register(self, callback: Callable, interval: float, widget=None) -> int:
+        """
+        Run `callback()` every `interval` seconds and return a handle.
+
+        With `widget`, runs are skipped while it is unmapped and the task
+        ends when it is destroyed. Returning False from the callback also
+        ends the task, as with GLib timeouts.
+        """
+        handle = self._next_handle
+        self._next_handle += 1
+        task = _Task(handle, callback, interval, widget)
+        task.next_due = self._align(time.monotonic(), interval)
+        if widget is not None:
+            task.signal_ids = [
+                widget.connect("map", lambda *_: self._on_widget_mapped(task)),
+                widget.connect("destroy", lambda *_: self.unregister(handle)),
+            ]
+        self._tasks[handle] = task
+        self._reschedule()
+        return handle
+
+    def unregister(self, handle: int):
+        task = self._tasks.pop(handle, None)
+        if task is None:
+            return
+        if task.widget is not None:
+            for signal_id in task.signal_ids:
+                if task.widget.handler_is_connected(signal_id):
+                    task.widget.disconnect(signal_id)
+        self._reschedule()
+
+    def _on_widget_mapped(self, task: _Task):
+        if task.stale and task.handle in self._tasks:
+            task.stale = False
+            GLib.idle_add(self._run, task)
+
+    def _run(self, task: _Task):
+        try:
+            if task.callback() is False:
+                self.unregister(task.handle)
+        except Exception as e:
+            print(f"SamplerScheduler: Error in {task.callback}: {e}")
+        return False
+
+    def _reschedule(self):
+        if self._source_id is not None:
+            GLib.source_remove(self._source_id)
+            self._source_id = None
+        if not self._tasks:
+            return
+        delay = min(task.next_due for task in self._tasks.values()) - time.monotonic()
+        # Second-granularity timers are batched by GLib with other wake-ups
+        self._source_id = GLib.timeout_add_seconds(max(1, math.ceil(delay)), self._on_wake)
+
+    def _on_wake(self):
+        self._source_id = None
+        now = time.monotonic()
+        for task in list(self._tasks.values()):
+            if task.next_due > now + WAKE_TOLERANCE:
+                continue
+            task.next_due = self._align(max(now, task.next_due), task.interval)
+            if task.widget is not None and not task.widget.get_mapped():
+                task.stale = True
+                continue
+            task.stale = False
+            self._run(task)
+        self._reschedule()
+        return False
+
+
+# Singleton accessor
+_sampler_scheduler_instance = None
+
+def get_sampler_scheduler() -> SamplerScheduler:
+    """Get the global SamplerScheduler instance."""
+    global _sampler_scheduler_instance
+    if _sampler_scheduler_instance is None:
+        _sampler_scheduler_instance = SamplerScheduler()
+    return _sampler_scheduler_instance
@@ -0,0 +1,178 @@
+import glob
+import os
+from typing import Dict, List, Optional
+
+import gi
+from gi.repository import GLib
+from loguru import logger
+
+from utils.signal import Signal
+
+try:
+    gi.require_version("GUdev", "1.0")
+    from gi.repository import GUdev
+except (ValueError, ImportError):
+    GUdev = None
+
+# hwmon chip names by kind of sensor
+CPU_CHIPS = ("coretemp", "k10temp", "zenpower", "cpu_thermal", "cpu-thermal")
+GPU_CHIPS = ("amdgpu", "radeon", "nouveau", "i915", "xe")
+NVME_CHIPS = ("nvme",)
+# Preferred temperature labels per chip, the package or die sensor before cores
+PREFERRED_LABELS = ("Package id 0", "Tctl", "Tdie", "edge", "Composite")
+# Thermal zones used for the CPU when no hwmon chip reports it
+CPU_THERMAL_ZONES = ("x86_pkg_temp", "cpu-thermal", "cpu_thermal", "soc_thermal")
+
+# Hotplug events come in bursts (a chip registers many attributes), so rediscovery waits
+REDISCOVER_DELAY_MS = 500
+
+
+class Sensor:
+    """One kept-open sysfs sensor input; temperatures are in millidegrees."""
+
+    def __init__(self, key: str, kind: str, label: str, path: str):
+        self.key = key
+        self.kind = kind  # 'cpu', 'gpu', 'nvme' or 'fan'
+        self.label = label
+        self.path = path
+        self._scale = 1.0 if kind == "fan" else 0.001
+        try:
+            self._fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            self._fd = None
+
+    def read(self) -> Optional[float]:
+        if self._fd is None:
+            return None
+        try:
+            return int(os.pread(self._fd, 16, 0)) * self._scale
+        except (OSError, ValueError):
+            return None
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _pick_temp_input(hwmon: str) -> Optional[str]:
+    inputs = sorted(glob.glob(os.path.join(hwmon, "temp*_input")))
+    if not inputs:
+        return None
+    labels = {path: _read_text(path.replace("_input", "_label")) for path in inputs}
+    for wanted in PREFERRED_LABELS:
+        for path, label in labels.items():
+            if label == wanted:
+                return path
+    return inputs[0]
+
+
+def discover_sensors(sysfs_root: str = "/sys") -> List[Sensor]:
+    """CPU package, GPU and NVMe temperatures, and fans, from hwmon and thermal zones."""
+    sensors = []
+    counts: Dict[str, int] = {}
+
+    def add(kind: str, label: str, path: str):
+        index = counts.get(kind, 0)
+        counts[kind] = index + 1
+        sensors.append(Sensor(f"{kind}{index}", kind, label, path))
+
+    for hwmon in sorted(glob.glob(os.path.join(sysfs_root, "class/hwmon/hwmon*"))):
+        chip = _read_text(os.path.join(hwmon, "name"))
+        kind = (
+            "cpu" if chip in CPU_CHIPS
+            else "gpu" if chip in GPU_CHIPS
+            else "nvme" if chip in NVME_CHIPS
+            else None
+        )
+        if kind is not None:
+            path = _pick_temp_input(hwmon)
+            if path is not None:
+                if kind == "nvme":
+                    # Drives are told apart by their controller, e.g. nvme0
+                    device = os.path.basename(os.path.realpath(os.path.join(hwmon, "device")))
+                    label = f"NVMe ({device})"
+                else:
+                    index = counts.get(kind, 0)
+                    label = f"{kind.upper()} {index + 1}" if index else kind.upper()
+                add(kind, label, path)
+
+        for fan in sorted(glob.glob(os.path.join(hwmon, "fan*_input"))):
+            label = _read_text(fan.replace("_input", "_label")) or f"{chip} {os.path.basename(fan)[:-6]}"
+            add("fan", label, fan)
+
+    if not counts.get("cpu"):
+        for zone in sorted(glob.glob(os.path.join(sysfs_root, "class/thermal/thermal_zone*"))):
+            if _read_text(os.path.join(zone, "type")) in CPU_THERMAL_ZONES:
+                add("cpu", "CPU", os.path.join(zone, "temp"))
+                break
+
+    return sensors
+
+
+class SensorMonitor:
+    """
+    Temperatures and fan speeds, read from sensor files opened once.
+
+    Discovery walks /sys/class/hwmon and the thermal zones once and keeps
+    every useful input open, so a sample is one pread per sensor. Sensors
+    are only rediscovered when udev reports a hwmon or thermal device
+    being added or removed (GUdev, optional); `changed` is then emitted.
+    """
+
+    def __init__(self, sysfs_root: str = "/sys", watch_hotplug: bool = True):
+        self.sysfs_root = sysfs_root
+        self.changed = Signal()
+        self.sensors: List[Sensor] = discover_sensors(sysfs_root)
+        self._rediscover_id = None
+
+        self._udev = None
+        if watch_hotplug:
+            if GUdev is None:
+                logger.info("GUdev is not available, sensors will not be rediscovered on hotplug")
+            else:
+                self._udev = GUdev.Client(subsystems=["hwmon", "thermal"])
+                self._udev.connect("uevent", self._on_uevent)
+
+    def _on_uevent(self, _client, action, _device):
+        if action not in ("add", "remove"):
+            return
+        if self._rediscover_id is not None:
+            GLib.source_remove(self._rediscover_id)
+        self._rediscover_id = GLib.timeout_add(REDISCOVER_DELAY_MS, self._rediscover)
+
+    def _rediscover(self):
+        self._rediscover_id = None
+        for sensor in self.sensors:
+            sensor.close()
+        self.sensors = discover_sensors(self.sysfs_root)
+        self.changed.emit()
+        return False
+
+    def sample(self) -> Dict[str, float]:
+        """Sensor key -> degrees Celsius, or RPM for fans; unreadable sensors are left out."""
+        values = {}
+        for sensor in self.sensors:
+            value = sensor.read()
+            if value is not None:
+                values[sensor.key] = value
+        return values
+
+
+# Singleton accessor
+_sensor_monitor_instance = None
+
+def get_sensor_monitor() -> SensorMonitor:
+    """Get the global SensorMonitor instance."""
+    global _sensor_monitor_instance
+    if _sensor_monitor_instance is None:
+        _sensor_monitor_instance = SensorMonitor()
+    return _sensor_monitor_instance
@@ -0,0 +1,293 @@
+import mmap
+import os
+import socket
+import struct
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+MANAGER_INTERFACE = "hyprland_toplevel_export_manager_v1"
+
+# wl_shm formats: ARGB8888 and XRGB8888 have their own codes, the others are DRM fourccs
+SHM_ARGB8888 = 0
+SHM_XRGB8888 = 1
+SHM_ABGR8888 = 0x34324241
+SHM_XBGR8888 = 0x34324258
+SUPPORTED_FORMATS = (SHM_ARGB8888, SHM_XRGB8888, SHM_ABGR8888, SHM_XBGR8888)
+
+# hyprland_toplevel_export_frame_v1.flags
+FLAG_Y_INVERT = 1
+
+_DISPLAY_ID = 1
+
+# Request opcodes
+_DISPLAY_SYNC = 0
+_DISPLAY_GET_REGISTRY = 1
+_REGISTRY_BIND = 0
+_SHM_CREATE_POOL = 0
+_POOL_CREATE_BUFFER = 0
+_POOL_DESTROY = 1
+_BUFFER_DESTROY = 0
+_MANAGER_CAPTURE_TOPLEVEL = 0
+_FRAME_COPY = 0
+_FRAME_DESTROY = 1
+
+# Event opcodes
+_DISPLAY_ERROR = 0
+_DISPLAY_DELETE_ID = 1
+_REGISTRY_GLOBAL = 0
+_CALLBACK_DONE = 0
+_FRAME_BUFFER = 0
+_FRAME_FLAGS = 2
+_FRAME_READY = 3
+_FRAME_FAILED = 4
+_FRAME_BUFFER_DONE = 6
+
+
+class ExportError(Exception):
+    """The compositor reported a protocol error, or does not support toplevel export."""
+
+
+class Frame(NamedTuple):
+    width: int
+    height: int
+    stride: int
+    format: int  # wl_shm format, one of SUPPORTED_FORMATS
+    y_invert: bool
+    data: bytearray
+
+
+def get_wayland_socket_path() -> Optional[str]:
+    """Path of the compositor socket named by WAYLAND_DISPLAY, relative to XDG_RUNTIME_DIR."""
+    display = os.environ.get("WAYLAND_DISPLAY", "wayland-0")
+    if os.path.isabs(display):
+        return display
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    return os.path.join(runtime_dir, display) if runtime_dir else None
+
+
+def _uint(value: int) -> bytes:
+    return struct.pack("=I", value)
+
+
+def _int(value: int) -> bytes:
+    return struct.pack("=i", value)
+
+
+def _string(value: str) -> bytes:
+    data = value.encode() + b"\0"
+    return _uint(len(data)) + data + b"\0" * (-len(data) % 4)
+
+
+def _read_string(payload: bytes, offset: int) -> Tuple[str, int]:
+    length, = struct.unpack_from("=I", payload, offset)
+    start = offset + 4
+    value = payload[start:start + length - 1].decode(errors="replace")
+    return value, start + length + (-length % 4)
+
+
+class ToplevelExportClient:
+    """
+    Minimal Wayland client for hyprland-toplevel-export-v1.
+
+    Speaks the wire protocol on its own connection to the compositor, so
+    it needs no bindings for Hyprland's protocol: it binds wl_shm and the
+    export manager, then copies one window at a time into a shared memory
+    buffer. The compositor renders the window itself, so what covers it
+    on screen does not matter. Calls block, up to `timeout` seconds per
+    read, and are meant for a worker thread; the client is not thread
+    safe.
+    """
+
+    def __init__(self, path: Optional[str] = None, timeout: float = 2.0):
+        self.path = path or get_wayland_socket_path()
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._input = bytearray()
+        self._next_id = _DISPLAY_ID + 1
+        # Ids the compositor confirmed deleted, reused before new ones
+        self._free_ids: List[int] = []
+        self._shm_id = 0
+        self._manager_id = 0
+
+    @property
+    def is_connected(self) -> bool:
+        return self._socket is not None
+
+    def connect(self):
+        """Connect and bind the globals; raises ExportError when toplevel export is not offered."""
+        if self._socket is not None:
+            return
+        if not self.path:
+            raise ExportError("XDG_RUNTIME_DIR is not set")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        self._socket = sock
+
+        try:
+            registry_id = self._new_id()
+            self._send(_DISPLAY_ID, _DISPLAY_GET_REGISTRY, _uint(registry_id))
+            callback_id = self._new_id()
+            self._send(_DISPLAY_ID, _DISPLAY_SYNC, _uint(callback_id))
+
+            # Interface -> (name, version) of every global, announced before the sync is done
+            globals_: Dict[str, Tuple[int, int]] = {}
+            while True:
+                object_id, opcode, payload = self._next_event()
+                if object_id == registry_id and opcode == _REGISTRY_GLOBAL:
+                    name, = struct.unpack_from("=I", payload)
+                    interface, offset = _read_string(payload, 4)
+                    version, = struct.unpack_from("=I", payload, offset)
+                    globals_[interface] = (name, version)
+                elif object_id == callback_id and opcode == _CALLBACK_DONE:
+                    break
+
+            for interface in ("wl_shm", MANAGER_INTERFACE):
+                if interface not in globals_:
+                    raise ExportError(f"the compositor does not offer {interface}")
+            self._shm_id = self._bind(registry_id, "wl_shm", globals_["wl_shm"][0])
+            self._manager_id = self._bind(registry_id, MANAGER_INTERFACE, globals_[MANAGER_INTERFACE][0])
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        self._input.clear()
+        self._next_id = _DISPLAY_ID + 1
+        self._free_ids = []
+
+    def capture(self, handle: int) -> Optional[Frame]:
+        """
+        Copy the window with this handle, the low 32 bits of its address.
+
+        Returns None when the compositor cannot export the window (it was
+        closed, or only offers buffers that are not shared memory). Raises
+        OSError or ExportError when the connection fails, after which the
+        client is closed.
+        """
+        self.connect()
+        try:
+            return self._capture(handle)
+        except BaseException:
+            self.close()
+            raise
+
+    def _capture(self, handle: int) -> Optional[Frame]:
+        frame_id = self._new_id()
+        # overlay_cursor = 0: the cursor is not part of a thumbnail
+        self._send(self._manager_id, _MANAGER_CAPTURE_TOPLEVEL, _uint(frame_id) + _int(0) + _uint(handle & 0xFFFFFFFF))
+
+        shm_info = None
+        flags = 0
+        while True:
+            opcode, payload = self._next_frame_event(frame_id)
+            if opcode == _FRAME_BUFFER:
+                shm_info = struct.unpack_from("=IIII", payload)
+            elif opcode == _FRAME_FLAGS:
+                flags, = struct.unpack_from("=I", payload)
+            elif opcode == _FRAME_FAILED:
+                self._send(frame_id, _FRAME_DESTROY)
+                return None
+            elif opcode == _FRAME_BUFFER_DONE:
+                break
+
+        if shm_info is None or shm_info[0] not in SUPPORTED_FORMATS:
+            self._send(frame_id, _FRAME_DESTROY)
+            return None
+
+        format_, width, height, stride = shm_info
+        size = stride * height
+        fd = os.memfd_create("yz-shell-window-preview", os.MFD_CLOEXEC)
+        try:
+            os.ftruncate(fd, size)
+            pool_id = self._new_id()
+            self._send(self._shm_id, _SHM_CREATE_POOL, _uint(pool_id) + _int(size), fd=fd)
+            buffer_id = self._new_id()
+            self._send(
+                pool_id, _POOL_CREATE_BUFFER,
+                _uint(buffer_id) + _int(0) + _int(width) + _int(height) + _int(stride) + _uint(format_),
+            )
+            self._send(pool_id, _POOL_DESTROY)
+            # ignore_damage = 1: copy right away instead of waiting for the window to change
+            self._send(frame_id, _FRAME_COPY, _uint(buffer_id) + _int(1))
+
+            while True:
+                opcode, payload = self._next_frame_event(frame_id)
+                if opcode == _FRAME_FLAGS:
+                    flags, = struct.unpack_from("=I", payload)
+                elif opcode in (_FRAME_READY, _FRAME_FAILED):
+                    break
+            self._send(frame_id, _FRAME_DESTROY)
+            self._send(buffer_id, _BUFFER_DESTROY)
+            if opcode == _FRAME_FAILED:
+                return None
+
+            with mmap.mmap(fd, size, prot=mmap.PROT_READ) as mapped:
+                data = bytearray(mapped)
+        finally:
+            os.close(fd)
+        return Frame(width, height, stride, format_, bool(flags & FLAG_Y_INVERT), data)
+
+    # Wire protocol
+
+    def _new_id(self) -> int:
+        if self._free_ids:
+            return self._free_ids.pop()
+        object_id = self._next_id
+        self._next_id += 1
+        return object_id
+
+    def _bind(self, registry_id: int, interface: str, name: int) -> int:
+        object_id = self._new_id()
+        # bind takes an untyped new_id: interface and version precede the id
+        self._send(registry_id, _REGISTRY_BIND, _uint(name) + _string(interface) + _uint(1) + _uint(object_id))
+        return object_id
+
+    def _send(self, object_id: int, opcode: int, payload: bytes = b"", fd: Optional[int] = None):
+        message = struct.pack("=II", object_id, (8 + len(payload)) << 16 | opcode) + payload
+        if fd is None:
+            self._socket.sendall(message)
+        else:
+            self._socket.sendmsg([message], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, struct.pack("=i", fd))])
+
+    def _next_event(self) -> Tuple[int, int, bytes]:
+        """Read the next event, handling the display's own events on the way."""
+        while True:
+            while len(self._input) < 8:
+                self._receive()
+            object_id, header = struct.unpack_from("=II", self._input)
+            size, opcode = header >> 16, header & 0xFFFF
+            if size < 8:
+                raise ExportError(f"malformed event header of size {size}")
+            while len(self._input) < size:
+                self._receive()
+            payload = bytes(self._input[8:size])
+            del self._input[:size]
+
+            if object_id != _DISPLAY_ID:
+                return object_id, opcode, payload
+            if opcode == _DISPLAY_ERROR:
+                failed_id, code = struct.unpack_from("=II", payload)
+                message, _ = _read_string(payload, 8)
+                raise ExportError(f"protocol error {code} on object {failed_id}: {message}")
+            if opcode == _DISPLAY_DELETE_ID:
+                self._free_ids.append(struct.unpack_from("=I", payload)[0])
+
+    def _next_frame_event(self, frame_id: int) -> Tuple[int, bytes]:
+        while True:
+            object_id, opcode, payload = self._next_event()
+            # Other objects only send events nothing here needs, e.g. wl_shm.format or wl_buffer.release
+            if object_id == frame_id:
+                return opcode, payload
+
+    def _receive(self):
+        chunk = self._socket.recv(4096)
+        if not chunk:
+            raise ConnectionResetError("the compositor closed the connection")
+        self._input += chunk
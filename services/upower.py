@@ -0,0 +1,180 @@
+from typing import Dict, Optional, Tuple
+
+from fabric.core.service import Service, Signal
+from gi.repository import Gio, GLib
+from loguru import logger
+
+UPOWER_NAME = "org.freedesktop.UPower"
+UPOWER_PATH = "/org/freedesktop/UPower"
+DEVICE_INTERFACE = "org.freedesktop.UPower.Device"
+
+# UPower device states
+STATE_CHARGING = 1
+
+# Substrings of a device path, model or vendor that mark a game controller
+CONTROLLER_INDICATORS = (
+    'gamepad', 'controller', 'joystick', 'xbox', 'playstation',
+    'ps4', 'ps5', 'nintendo', 'switch', 'pro controller',
+    'dualshock', 'dualsense', 'joycon', 'joy-con'
+)
+
+
+def _get(proxy: Gio.DBusProxy, name: str, default=None):
+    value = proxy.get_cached_property(name)
+    return value.unpack() if value is not None else default
+
+
+def _is_controller(path: str, proxy: Gio.DBusProxy) -> bool:
+    """A present peripheral battery that looks like a game controller."""
+    if not _get(proxy, "IsPresent", False) or _get(proxy, "PowerSupply", True):
+        return False
+    if _get(proxy, "Percentage", 0) <= 0:
+        return False
+    haystack = (path.lower(), _get(proxy, "Model", "").lower(), _get(proxy, "Vendor", "").lower())
+    return any(indicator in field for indicator in CONTROLLER_INDICATORS for field in haystack)
+
+
+class UPowerService(Service):
+    """
+    Battery and controller state from UPower, kept up to date by signals.
+
+    Proxies are created asynchronously: one for the manager, which reports
+    DeviceAdded and DeviceRemoved, one for the display device and one per
+    device. Gio caches each proxy's properties and refreshes them from
+    PropertiesChanged, so reading state never blocks on D-Bus and nothing
+    is polled. `battery-changed` and `controllers-changed` are emitted
+    when the corresponding state changes.
+    """
+
+    @Signal
+    def battery_changed(self) -> None: ...
+
+    @Signal
+    def controllers_changed(self) -> None: ...
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._manager: Optional[Gio.DBusProxy] = None
+        self._display: Optional[Gio.DBusProxy] = None
+        # Device path -> proxy, for every device UPower enumerates
+        self._devices: Dict[str, Gio.DBusProxy] = {}
+        # Devices whose proxy is still being created
+        self._pending = set()
+        self._controller_paths = set()
+
+        self._new_proxy(UPOWER_PATH, UPOWER_NAME, self._on_manager_ready)
+
+    def _new_proxy(self, path: str, interface: str, callback, *args):
+        def on_ready(_source, result):
+            try:
+                proxy = Gio.DBusProxy.new_for_bus_finish(result)
+            except GLib.Error as e:
+                logger.warning(f"UPowerService: Error connecting to {path}: {e}")
+                self._pending.discard(path)
+                return
+            callback(path, proxy, *args)
+
+        Gio.DBusProxy.new_for_bus(
+            Gio.BusType.SYSTEM, Gio.DBusProxyFlags.NONE, None,
+            UPOWER_NAME, path, interface, None, on_ready,
+        )
+
+    def _on_manager_ready(self, _path, proxy: Gio.DBusProxy):
+        self._manager = proxy
+        proxy.connect("g-signal", self._on_manager_signal)
+        proxy.call("GetDisplayDevice", None, Gio.DBusCallFlags.NONE, -1, None, self._on_display_path)
+        proxy.call("EnumerateDevices", None, Gio.DBusCallFlags.NONE, -1, None, self._on_devices_enumerated)
+
+    def _on_display_path(self, proxy, result):
+        try:
+            (path,) = proxy.call_finish(result).unpack()
+        except GLib.Error as e:
+            logger.warning(f"UPowerService: Error getting display device: {e}")
+            return
+        self._new_proxy(path, DEVICE_INTERFACE, self._on_display_ready)
+
+    def _on_display_ready(self, _path, proxy: Gio.DBusProxy):
+        self._display = proxy
+        proxy.connect("g-properties-changed", lambda *_: self.emit("battery-changed"))
+        self.emit("battery-changed")
+
+    def _on_devices_enumerated(self, proxy, result):
+        try:
+            (paths,) = proxy.call_finish(result).unpack()
+        except GLib.Error as e:
+            logger.warning(f"UPowerService: Error enumerating devices: {e}")
+            return
+        for path in paths:
+            self._add_device(path)
+
+    def _on_manager_signal(self, _proxy, _sender, signal_name, parameters):
+        if signal_name == "DeviceAdded":
+            self._add_device(parameters.unpack()[0])
+        elif signal_name == "DeviceRemoved":
+            self._remove_device(parameters.unpack()[0])
+
+    def _add_device(self, path: str):
+        if path not in self._devices and path not in self._pending:
+            self._pending.add(path)
+            self._new_proxy(path, DEVICE_INTERFACE, self._on_device_ready)
+
+    def _on_device_ready(self, path: str, proxy: Gio.DBusProxy):
+        if path not in self._pending:
+            return  # Removed while the proxy was being created
+        self._pending.discard(path)
+        self._devices[path] = proxy
+        proxy.connect("g-properties-changed", lambda *_: self._on_device_changed(path))
+        self._on_device_changed(path)
+
+    def _remove_device(self, path: str):
+        self._pending.discard(path)
+        self._devices.pop(path, None)
+        if path in self._controller_paths:
+            self._controller_paths.discard(path)
+            self.emit("controllers-changed")
+
+    def _on_device_changed(self, path: str):
+        proxy = self._devices.get(path)
+        if proxy is None:
+            return
+        was_controller = path in self._controller_paths
+        if _is_controller(path, proxy):
+            self._controller_paths.add(path)
+        else:
+            self._controller_paths.discard(path)
+        if was_controller or path in self._controller_paths:
+            self.emit("controllers-changed")
+
+    def get_battery(self) -> Tuple[float, Optional[bool], int]:
+        """(percentage, charging, seconds to full or empty) of the display device."""
+        if self._display is None or not _get(self._display, "IsPresent", False):
+            return (0.0, None, 0)
+        charging = _get(self._display, "State", 0) == STATE_CHARGING
+        time = _get(self._display, "TimeToFull" if charging else "TimeToEmpty", 0)
+        return (_get(self._display, "Percentage", 0.0), charging, time)
+
+    def get_controllers(self) -> Dict[str, dict]:
+        """Battery data of connected controllers, keyed by device path."""
+        controllers = {}
+        for path in self._controller_paths:
+            proxy = self._devices[path]
+            charging = _get(proxy, "State", 0) == STATE_CHARGING
+            controllers[path] = {
+                'percentage': _get(proxy, "Percentage", 0),
+                'charging': charging,
+                'time': _get(proxy, "TimeToFull" if charging else "TimeToEmpty", 0),
+                'model': _get(proxy, "Model", "Controller"),
+                'vendor': _get(proxy, "Vendor", "Unknown"),
+            }
+        return controllers
+
+
+# Singleton accessor
+_upower_service_instance = None
+
+def get_upower_service() -> UPowerService:
+    """Get the global UPowerService instance."""
+    global _upower_service_instance
+    if _upower_service_instance is None:
+        _upower_service_instance = UPowerService()
+    return _upower_service_instance
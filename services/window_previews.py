@@ -0,0 +1,324 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Optional
+
+import cairo
+from gi.repository import GLib
+
+from services.hyprland_state import get_hyprland_state
+from services.toplevel_export import SHM_ABGR8888, SHM_ARGB8888, SHM_XBGR8888, ExportError, ToplevelExportClient
+from utils.signal import Signal
+
+# Longest side of a thumbnail, in pixels
+THUMBNAIL_SIZE = 320
+# Memory kept for thumbnails; least recently used ones are dropped past it
+MEMORY_BUDGET = 32 * 1024 * 1024
+# A window is captured at most this often, however often it is damaged
+MIN_REFRESH_INTERVAL = 2.0
+# One capture runs at a time, with at least this long between two captures
+CAPTURE_SPACING_MS = 100
+CAPTURE_TIMEOUT = 2
+
+
+def downscale(surface: cairo.ImageSurface, max_size: int = THUMBNAIL_SIZE) -> cairo.ImageSurface:
+    """Copy of `surface` whose longest side is at most `max_size`; safe to run off the main loop."""
+    width, height = surface.get_width(), surface.get_height()
+    factor = min(1.0, max_size / max(width, height, 1))
+    target = cairo.ImageSurface(cairo.FORMAT_ARGB32, max(1, round(width * factor)), max(1, round(height * factor)))
+    cr = cairo.Context(target)
+    cr.scale(factor, factor)
+    cr.set_source_surface(surface, 0, 0)
+    cr.get_source().set_filter(cairo.FILTER_GOOD)
+    cr.paint()
+    target.flush()
+    return target
+
+
+class PreviewCache:
+    """Thumbnails by window address, evicting the least recently used past a byte budget."""
+
+    def __init__(self, budget: int = MEMORY_BUDGET):
+        self.budget = budget
+        self.size = 0
+        self._surfaces: "OrderedDict[str, cairo.ImageSurface]" = OrderedDict()
+
+    @staticmethod
+    def _cost(surface: cairo.ImageSurface) -> int:
+        return surface.get_stride() * surface.get_height()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._surfaces
+
+    def get(self, address: str) -> Optional[cairo.ImageSurface]:
+        surface = self._surfaces.get(address)
+        if surface is not None:
+            self._surfaces.move_to_end(address)
+        return surface
+
+    def put(self, address: str, surface: cairo.ImageSurface):
+        self.discard(address)
+        self._surfaces[address] = surface
+        self.size += self._cost(surface)
+        while self.size > self.budget and len(self._surfaces) > 1:
+            _, evicted = self._surfaces.popitem(last=False)
+            self.size -= self._cost(evicted)
+
+    def discard(self, address: str):
+        surface = self._surfaces.pop(address, None)
+        if surface is not None:
+            self.size -= self._cost(surface)
+
+
+class CaptureBackend(ABC):
+    """Source of window frames. `capture` runs in a worker thread."""
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def capture(self, client: Mapping) -> Optional[cairo.ImageSurface]:
+        """Frame of the window, or None when it cannot be captured right now."""
+
+
+class ToplevelExportBackend(CaptureBackend):
+    """
+    Captures windows through Hyprland's toplevel export protocol.
+
+    The compositor renders the window itself into shared memory, so it
+    does not need to be on screen or uncovered, and nothing is spawned
+    per capture: one ToplevelExportClient connection is kept and only
+    reopened after an error.
+    """
+
+    def __init__(self):
+        self._client = ToplevelExportClient(timeout=CAPTURE_TIMEOUT)
+        self._available = True
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    def capture(self, client: Mapping) -> Optional[cairo.ImageSurface]:
+        # Hyprland identifies windows by the low 32 bits of their address
+        handle = int(client["address"], 16) & 0xFFFFFFFF
+        try:
+            self._client.connect()
+        except ExportError as e:
+            # The compositor does not offer toplevel export; there is nothing to retry
+            print(f"ToplevelExportBackend: Window previews are unavailable: {e}")
+            self._available = False
+            return None
+        except OSError as e:
+            print(f"ToplevelExportBackend: Error connecting to the compositor: {e}")
+            return None
+        try:
+            frame = self._client.capture(handle)
+        except (ExportError, OSError) as e:
+            # The client closed the connection and reconnects on the next capture
+            print(f"ToplevelExportBackend: Error capturing {client['address']}: {e}")
+            return None
+        if frame is None:
+            return None
+
+        data = frame.data
+        if frame.format in (SHM_ABGR8888, SHM_XBGR8888):
+            # Cairo wants ARGB: swap the red and blue bytes
+            data[0::4], data[2::4] = data[2::4], data[0::4]
+        cairo_format = cairo.FORMAT_ARGB32 if frame.format in (SHM_ARGB8888, SHM_ABGR8888) else cairo.FORMAT_RGB24
+        surface = cairo.ImageSurface.create_for_data(data, cairo_format, frame.width, frame.height, frame.stride)
+        if not frame.y_invert:
+            return surface
+        flipped = cairo.ImageSurface(cairo_format, frame.width, frame.height)
+        cr = cairo.Context(flipped)
+        cr.translate(0, frame.height)
+        cr.scale(1, -1)
+        cr.set_source_surface(surface, 0, 0)
+        cr.paint()
+        flipped.flush()
+        return flipped
+
+
+class FakeCaptureBackend(CaptureBackend):
+    """Solid frames of the window's size, for tests; records every capture, failed ones included."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.captured: List[str] = []
+        # Addresses whose captures fail
+        self.failing = set()
+
+    def capture(self, client: Mapping) -> Optional[cairo.ImageSurface]:
+        if self.delay:
+            time.sleep(self.delay)
+        self.captured.append(client["address"])
+        if client["address"] in self.failing:
+            return None
+        width, height = client["size"]
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        cr = cairo.Context(surface)
+        shade = (int(client["address"], 16) % 255) / 255
+        cr.set_source_rgb(shade, 0.5, 1 - shade)
+        cr.paint()
+        return surface
+
+
+class WindowPreviewService:
+    """
+    Live window thumbnails for the overview.
+
+    Windows are marked stale when Hyprland reports something that changes
+    their content or visibility: a new title, focus moving in or out, a
+    new geometry, their workspace being shown. Stale windows are only
+    captured while at least one consumer is shown (see `acquire`), one
+    at a time, CAPTURE_SPACING_MS apart and at most once per
+    MIN_REFRESH_INTERVAL each. Frames are downscaled in the capture
+    thread and kept in a PreviewCache; `changed` is emitted with the
+    address of every new thumbnail. A failed capture leaves the window
+    stale, so it is tried again.
+    """
+
+    def __init__(self, backend: CaptureBackend, store=None, budget: int = MEMORY_BUDGET):
+        self.backend = backend
+        self.store = store if store is not None else get_hyprland_state()
+        self.cache = PreviewCache(budget)
+        self.changed = Signal()
+
+        self._consumers = set()
+        self._stale = set()
+        self._last_capture: Dict[str, float] = {}
+        self._geometry: Dict[str, tuple] = {}
+        self._capturing = False
+        self._pump_id = None
+
+        self.store.client_updated.connect(self.invalidate)
+        self.store.client_removed.connect(self._on_client_removed)
+        self.store.active_window_changed.connect(self._on_active_window_changed)
+        self.store.clients_synced.connect(self._on_clients_synced)
+        self.store.workspace_changed.connect(self._on_workspace_changed)
+        self._active_address = self.store.get_active_address()
+        self._on_clients_synced()
+
+    # Consumers
+
+    def acquire(self, consumer):
+        """Start capturing while `consumer` is shown."""
+        self._consumers.add(consumer)
+        # Windows never captured yet are stale too
+        self._stale.update(client["address"] for client in self.store.get_clients() if client["address"] not in self.cache)
+        self._schedule_pump(0)
+
+    def release(self, consumer):
+        self._consumers.discard(consumer)
+
+    def get(self, address: str) -> Optional[cairo.ImageSurface]:
+        return self.cache.get(address)
+
+    def invalidate(self, *addresses: str):
+        self._stale.update(address for address in addresses if address)
+        self._schedule_pump(0)
+
+    # Store events
+
+    def _on_client_removed(self, address):
+        self._stale.discard(address)
+        self._last_capture.pop(address, None)
+        self._geometry.pop(address, None)
+        self.cache.discard(address)
+
+    def _on_active_window_changed(self, address):
+        # The window losing focus and the one gaining it both redraw
+        self.invalidate(self._active_address, address)
+        self._active_address = address
+
+    def _on_clients_synced(self):
+        geometry = {
+            client["address"]: (tuple(client["at"] or ()), tuple(client["size"] or ()), client["workspace"]["id"])
+            for client in self.store.get_clients()
+        }
+        changed = [address for address, value in geometry.items() if self._geometry.get(address) != value]
+        self._geometry = geometry
+        self.invalidate(*changed)
+
+    def _on_workspace_changed(self, _monitor_name, workspace_id):
+        self.invalidate(*(
+            client["address"] for client in self.store.get_clients()
+            if client["workspace"]["id"] == workspace_id
+        ))
+
+    # Capture pipeline
+
+    @staticmethod
+    def _capturable(client: Mapping) -> bool:
+        return bool(client.get("size")) and not client.get("hidden")
+
+    def _schedule_pump(self, delay_ms: int):
+        if self._pump_id is None and not self._capturing and self._consumers and self._stale:
+            self._pump_id = GLib.timeout_add(delay_ms, self._pump)
+
+    def _pump(self):
+        self._pump_id = None
+        if self._capturing or not self._consumers or not self.backend.available:
+            return False
+
+        now = time.monotonic()
+        wait = None
+        for address in list(self._stale):
+            client = self.store.get_client(address)
+            if client is None:
+                self._stale.discard(address)
+                continue
+            if not self._capturable(client):
+                # Stays stale until it is mapped
+                continue
+            remaining = self._last_capture.get(address, -MIN_REFRESH_INTERVAL) + MIN_REFRESH_INTERVAL - now
+            if remaining > 0:
+                wait = remaining if wait is None else min(wait, remaining)
+                continue
+
+            self._stale.discard(address)
+            self._last_capture[address] = now
+            self._capturing = True
+            GLib.Thread.new("window-preview-thread", lambda _: self._capture_in_thread(client), None)
+            return False
+
+        if wait is not None:
+            self._schedule_pump(int(wait * 1000) + 1)
+        return False
+
+    def _capture_in_thread(self, client: Mapping):
+        thumbnail = None
+        try:
+            surface = self.backend.capture(client)
+            if surface is not None:
+                thumbnail = downscale(surface)
+        except Exception as e:
+            print(f"WindowPreviewService: Error capturing {client['address']}: {e}")
+        GLib.idle_add(self._on_captured, client["address"], thumbnail)
+
+    def _on_captured(self, address, thumbnail):
+        self._capturing = False
+        if self.store.get_client(address) is not None:
+            if thumbnail is not None:
+                self.cache.put(address, thumbnail)
+                self.changed.emit(address)
+            else:
+                # Retried once MIN_REFRESH_INTERVAL has passed
+                self._stale.add(address)
+        self._schedule_pump(CAPTURE_SPACING_MS)
+        return False
+
+
+# Singleton accessor
+_window_preview_service_instance = None
+
+def get_window_preview_service() -> WindowPreviewService:
+    """Get the global WindowPreviewService, capturing through Hyprland's toplevel export."""
+    global _window_preview_service_instance
+    if _window_preview_service_instance is None:
+        _window_preview_service_instance = WindowPreviewService(ToplevelExportBackend())
+    return _window_preview_service_instance
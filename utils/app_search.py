@@ -0,0 +1,208 @@
+import re
+from math import ceil
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Match tiers, best first
+TIER_PREFIX = 0
+TIER_WORD = 1
+TIER_SUBSTRING = 2
+TIER_SUBSEQUENCE = 3
+TIER_FUZZY = 4
+
+# Share of the query's trigrams an app must contain to be a fuzzy match
+FUZZY_MIN_OVERLAP = 0.5
+
+_WORD_SPLIT = re.compile(r"[\W_]+")
+
+
+def extract_command_name(command_line: str) -> str:
+    """Extract base command name from command line, removing paths and arguments"""
+    if not command_line:
+        return ""
+    # Shell-wrapped commands like '/bin/sh -c "$SHELL -i -c scrcpy"' carry no useful name
+    if command_line.startswith("/bin/sh -c"):
+        return ""
+    parts = command_line.split()
+    cmd = parts[0] if parts else ""
+    return cmd.rsplit("/", 1)[-1]
+
+
+def _ngrams(text: str, n: int) -> set:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class AppSearchIndex:
+    """
+    Precomputed search index over desktop applications.
+
+    Built once per application list. Every field is normalized up front,
+    aliases from search_aliases.json are expanded onto the apps they
+    belong to, and posting lists keyed by word initial, bigram, trigram
+    and character bound each query to the apps that can possibly match.
+    Apps are stored in alphabetical order and posting lists are built in
+    that order, so collecting matches per tier yields ranked results
+    without sorting.
+
+    Results are ranked by match tier (prefix, word boundary, substring,
+    subsequence, fuzzy), then by boost (e.g. launch frecency) and
+    alphabetically within a tier. Single-character
+    queries only match at word starts, and subsequence matching starts at
+    three characters, where shorter queries would match nearly everything.
+    """
+
+    def __init__(self, apps: Sequence, search_aliases: Optional[dict] = None):
+        self.apps = sorted(apps, key=lambda app: (app.display_name or "").casefold())
+
+        # Per app, indexed by position in self.apps
+        self._heads: List[str] = []
+        self._words: List[str] = []
+        self._haystacks: List[str] = []
+        self._short_texts: List[str] = []
+
+        # Posting lists of app positions
+        self._initial_index: Dict[str, List[int]] = {}
+        self._bigram_index: Dict[str, List[int]] = {}
+        self._trigram_index: Dict[str, List[int]] = {}
+        self._char_index: Dict[str, set] = {}
+
+        self._boosts: Dict[int, float] = {}
+
+        self.aliases = self._expand_aliases(search_aliases or {})
+
+        for i, app in enumerate(self.apps):
+            display = (app.display_name or "").casefold()
+            name = (app.name or "").casefold()
+            generic = (app.generic_name or "").casefold()
+            command_line = (getattr(app, "command_line", "") or "").casefold()
+            executable = (getattr(app, "executable", "") or "").casefold()
+            command = extract_command_name(command_line)
+            executable_name = executable.rsplit("/", 1)[-1]
+            aliases = self.aliases.get(i, ())
+
+            heads = [head for head in (display, name, command, executable_name, *aliases) if head]
+            # Newline-prefixed so a prefix test is a single substring test
+            self._heads.append("".join("\n" + head for head in heads))
+
+            words = []
+            for field in (display, name, generic, command, executable_name, *aliases):
+                words.extend(word for word in _WORD_SPLIT.split(field) if word)
+            self._words.append(" " + " ".join(words))
+
+            haystack = " ".join(
+                field for field in (display, name, generic, command_line, executable, command, *aliases) if field
+            )
+            self._haystacks.append(haystack)
+            short_text = " ".join((display, *aliases))
+            self._short_texts.append(short_text)
+
+            for initial in {text[0] for text in heads + words}:
+                self._initial_index.setdefault(initial, []).append(i)
+            for gram in _ngrams(haystack, 2):
+                self._bigram_index.setdefault(gram, []).append(i)
+            for gram in _ngrams(haystack, 3):
+                self._trigram_index.setdefault(gram, []).append(i)
+            for char in set(short_text):
+                self._char_index.setdefault(char, set()).add(i)
+
+    def _expand_aliases(self, search_aliases: dict) -> Dict[int, Tuple[str, ...]]:
+        """Map app positions to the alias search terms configured for them."""
+        expanded: Dict[int, List[str]] = {}
+        for alias_config in search_aliases.get("application_aliases", []):
+            app_names = [name.casefold() for name in alias_config.get("app_names", [])]
+            terms = [term.casefold() for term in alias_config.get("search_terms", [])]
+            if not app_names or not terms:
+                continue
+            for i, app in enumerate(self.apps):
+                display = (app.display_name or "").casefold()
+                name = (app.name or "").casefold()
+                if any(app_name in display or app_name in name for app_name in app_names):
+                    expanded.setdefault(i, []).extend(terms)
+        return {i: tuple(terms) for i, terms in expanded.items()}
+
+    def set_boosts(self, boosts: Dict[int, float]):
+        """Set per-app ranking boosts, keyed by position in self.apps."""
+        self._boosts = {i: boost for i, boost in boosts.items() if boost > 0}
+
+    def _apply_boosts(self, tier: List[int]) -> List[int]:
+        boosts = self._boosts
+        members = set(tier)
+        boosted = [i for i in boosts if i in members]
+        if not boosted:
+            return tier
+        boosted.sort(key=lambda i: (-boosts[i], i))
+        return boosted + [i for i in tier if i not in boosts]
+
+    def match(self, query: str) -> List[List[int]]:
+        """Return app positions matching `query`, bucketed by tier and sorted within each."""
+        query = query.strip().casefold()
+        tiers: List[List[int]] = [[] for _ in range(TIER_FUZZY + 1)]
+        if not query:
+            return tiers
+
+        prefix, word, substring, subsequence, fuzzy = tiers
+        haystacks = self._haystacks
+        heads = self._heads
+        words = self._words
+        head = "\n" + query
+        boundary = " " + query
+
+        if len(query) == 1:
+            for i in self._initial_index.get(query, ()):
+                if head in heads[i]:
+                    prefix.append(i)
+                else:
+                    word.append(i)
+            return tiers
+
+        if len(query) == 2:
+            candidates = self._bigram_index.get(query, ())
+        else:
+            # The rarest trigram of the query bounds the substring matches
+            postings = [self._trigram_index.get(gram, ()) for gram in _ngrams(query, 3)]
+            candidates = min(postings, key=len)
+
+        matched = set()
+        for i in candidates:
+            if query in haystacks[i]:
+                matched.add(i)
+                if head in heads[i]:
+                    prefix.append(i)
+                elif boundary in words[i]:
+                    word.append(i)
+                else:
+                    substring.append(i)
+
+        if len(query) < 3:
+            return tiers
+
+        # Only apps containing every character of the query can match as a subsequence
+        char_sets = [self._char_index.get(char, set()) for char in set(query)]
+        candidates = set.intersection(*char_sets) - matched
+        if candidates:
+            # Possessive gaps make this a linear greedy scan, with no backtracking
+            search = re.compile("".join(
+                f"[^{char}]*+{char}" for char in map(re.escape, query)
+            )).match
+            short_texts = self._short_texts
+            subsequence.extend(i for i in sorted(candidates) if search(short_texts[i]))
+
+        # Typo tolerance, only when nothing matched more precisely
+        if not matched and not subsequence:
+            grams = _ngrams(query, 3)
+            needed = max(1, ceil(len(grams) * FUZZY_MIN_OVERLAP))
+            counts: Dict[int, int] = {}
+            for gram in grams:
+                for i in self._trigram_index.get(gram, ()):
+                    counts[i] = counts.get(i, 0) + 1
+            fuzzy.extend(sorted(i for i, count in counts.items() if count >= needed))
+        return tiers
+
+    def search(self, query: str) -> list:
+        """Return the apps matching `query`, best matches first."""
+        if not query.strip():
+            return list(self.apps)
+        apps = self.apps
+        tiers = self.match(query)
+        if self._boosts:
+            tiers = [self._apply_boosts(tier) for tier in tiers]
+        return [apps[i] for tier in tiers for i in tier]
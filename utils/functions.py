@@ -103,6 +103,17 @@ def convert_bytes(bytes: int, to: Literal["kb", "mb", "gb"], format_spec=".1f"):
     return f"{format(bytes / (1024**multiplier), format_spec)}{to.upper()}"
 
 
+# Function to format a transfer rate given in bytes per second, in bits
+def format_speed(speed: float):
+    speed_bits = speed * 8
+    if speed_bits < 1000:
+        return f"{speed_bits:.0f} bps"
+    elif speed_bits < 1000000:
+        return f"{speed_bits / 1000:.1f} Kbps"
+    else:
+        return f"{speed_bits / 1000000:.1f} Mbps"
+
+
 # Function to get the system uptime
 def uptime():
     boot_time = psutil.boot_time()
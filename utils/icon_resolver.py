@@ -1,22 +1,68 @@
+import hashlib
 import json
 import os
+import queue
 import re
+import shutil
+import threading
+from collections import OrderedDict
 
 import gi
 
 gi.require_version("Gtk", "3.0")
-from gi.repository import GLib, Gtk
+from gi.repository import GdkPixbuf, GLib, Gtk
 from loguru import logger
 
 import config.data as data
+from services.desktop_catalog import get_desktop_catalog
 
 ICON_CACHE_FILE = data.CACHE_DIR + "/icons.json"
+# Pre-rendered icons, in one subdirectory per icon theme state
+PIXBUF_CACHE_DIR = data.CACHE_DIR + "/icon-pixbufs"
 if not os.path.exists(data.CACHE_DIR):
     os.makedirs(data.CACHE_DIR)
 
+# Rendered pixbufs kept in memory, keyed by (app_id, size, scale)
+PIXBUF_CACHE_SIZE = 256
+
+# New app id -> icon name entries are written in one batch after this delay
+NAME_MAP_SAVE_DELAY_MS = 1000
+
+_TOKEN_SPLIT = re.compile(r"[-._\s]+")
+
+
+def _normalize(value: str) -> str:
+    return "".join(value.lower().split())
+
+
+def _tokens(value: str) -> list:
+    return [token for token in _TOKEN_SPLIT.split(value.lower()) if token]
+
 
 class IconResolver:
+    """
+    Resolves app ids to themed icons and caches the rendered pixbufs.
+
+    There is one shared instance. Icon names found for app ids are kept in
+    icons.json, saved atomically and debounced. Rendered pixbufs go through
+    two cache levels: an in-memory LRU keyed by (app_id, size, scale) and
+    PNGs on disk, stored under a directory named after the current icon
+    theme and its modification time, so switching or updating the theme
+    starts a fresh cache. Disk writes happen on a worker thread.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
     def __init__(self, default_applicaiton_icon: str = "application-x-executable-symbolic"):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
         if os.path.exists(ICON_CACHE_FILE):
             with open(ICON_CACHE_FILE) as f:
                 try:
@@ -29,6 +75,20 @@ class IconResolver:
 
         self.default_applicaiton_icon = default_applicaiton_icon
 
+        # Desktop file lookup index, rebuilt when the desktop catalog changes
+        self._desktop_keys = {}
+        self._desktop_tokens = {}
+        self._desktop_icons = {}
+        self._desktop_index_generation = -1
+
+        self._pixbufs = OrderedDict()
+        self._theme_dir = None
+        self._save_id = None
+        self._write_queue = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        Gtk.IconTheme.get_default().connect("changed", self._on_theme_changed)
+
     def get_icon_name(self, app_id: str):
         if app_id in self._icon_dict:
             return self._icon_dict[app_id]
@@ -39,20 +99,77 @@ class IconResolver:
         self._store_new_icon(app_id, new_icon)
         return new_icon
 
-    def get_icon_pixbuf(self, app_id: str, size: int = 16):
+    def get_icon_pixbuf(self, app_id: str, size: int = 16, scale: int = 1):
+        return self._get_cached_pixbuf(
+            app_id, size, scale, lambda: self._load_themed_pixbuf(app_id, size, scale)
+        )
+
+    def get_desktop_app_pixbuf(self, desktop_app, size: int = 16, scale: int = 1):
+        """Icon of a DesktopApp, through the same caches as get_icon_pixbuf()."""
+        key = f"desktop:{desktop_app.name}:{desktop_app.icon_name}"
+        return self._get_cached_pixbuf(
+            key, size, scale, lambda: desktop_app.get_icon_pixbuf(size=size * scale)
+        )
+
+    def cache_stats(self) -> dict:
+        """Hit counters of the pixbuf caches, with the overall hit rate."""
+        total = sum(self.stats.values())
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        return {**self.stats, "hit_rate": hits / total if total else 0.0}
+
+    def _get_cached_pixbuf(self, key: str, size: int, scale: int, load):
+        cache_key = (key, size, scale)
+        pixbuf = self._pixbufs.get(cache_key)
+        if pixbuf is not None:
+            self._pixbufs.move_to_end(cache_key)
+            self.stats["memory_hits"] += 1
+            return pixbuf
+
+        path = self._pixbuf_path(key, size, scale)
+        if path and os.path.exists(path):
+            try:
+                pixbuf = GdkPixbuf.Pixbuf.new_from_file(path)
+                self.stats["disk_hits"] += 1
+            except GLib.Error:
+                pixbuf = None
+
+        if pixbuf is None:
+            self.stats["misses"] += 1
+            pixbuf = load()
+            if pixbuf is None:
+                return None
+            # Cache icons at their final size so callers never rescale
+            pixel_size = size * scale
+            width, height = pixbuf.get_width(), pixbuf.get_height()
+            if max(width, height) != pixel_size:
+                factor = pixel_size / max(width, height)
+                pixbuf = pixbuf.scale_simple(
+                    max(1, round(width * factor)),
+                    max(1, round(height * factor)),
+                    GdkPixbuf.InterpType.BILINEAR,
+                )
+            if path:
+                self._write(self._write_pixbuf, path, pixbuf)
+
+        self._pixbufs[cache_key] = pixbuf
+        if len(self._pixbufs) > PIXBUF_CACHE_SIZE:
+            self._pixbufs.popitem(last=False)
+        return pixbuf
+
+    def _load_themed_pixbuf(self, app_id: str, size: int, scale: int):
         icon_theme = Gtk.IconTheme.get_default()
         icon_name = self.get_icon_name(app_id)
         try:
             # Try to load the resolved icon.
-            return icon_theme.load_icon(icon_name, size, Gtk.IconLookupFlags.FORCE_SIZE)
+            return icon_theme.load_icon_for_scale(icon_name, size, scale, Gtk.IconLookupFlags.FORCE_SIZE)
         except GLib.Error as primary_error:
             logger.warning(
                 f"Warning: Icon '{icon_name}' not found in theme. Error: {primary_error}"
             )
             try:
                 # Fallback to the default application icon.
-                return icon_theme.load_icon(
-                    self.default_applicaiton_icon, size, Gtk.IconLookupFlags.FORCE_SIZE
+                return icon_theme.load_icon_for_scale(
+                    self.default_applicaiton_icon, size, scale, Gtk.IconLookupFlags.FORCE_SIZE
                 )
             except GLib.Error as fallback_error:
                 logger.error(
@@ -60,32 +177,129 @@ class IconResolver:
                 )
                 return None
 
+    def _pixbuf_path(self, key: str, size: int, scale: int) -> str | None:
+        if self._theme_dir is None:
+            self._theme_dir = self._current_theme_dir()
+        if not self._theme_dir:
+            return None
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self._theme_dir, f"{digest}-{size}@{scale}.png")
+
+    def _current_theme_dir(self) -> str:
+        """Cache directory for the current icon theme, named after its state."""
+        settings = Gtk.Settings.get_default()
+        theme_name = settings.get_property("gtk-icon-theme-name") if settings else "hicolor"
+        stamp = [theme_name]
+        for base in Gtk.IconTheme.get_default().get_search_path():
+            for name in (theme_name, "hicolor"):
+                try:
+                    stamp.append(f"{base}/{name}:{os.stat(os.path.join(base, name)).st_mtime_ns}")
+                except OSError:
+                    continue
+        digest = hashlib.sha1("\n".join(stamp).encode()).hexdigest()[:16]
+        return os.path.join(PIXBUF_CACHE_DIR, digest)
+
+    def _on_theme_changed(self, *args):
+        self._pixbufs.clear()
+        self._theme_dir = self._current_theme_dir()
+        self._write(self._prune_theme_dirs, self._theme_dir)
+
     def _store_new_icon(self, app_id: str, icon: str):
         self._icon_dict[app_id] = icon
-        with open(ICON_CACHE_FILE, "w") as f:
-            json.dump(self._icon_dict, f)
+        if self._save_id is None:
+            self._save_id = GLib.timeout_add(NAME_MAP_SAVE_DELAY_MS, self._save_icon_dict)
+
+    def _save_icon_dict(self):
+        self._save_id = None
+        self._write(self._write_icon_dict, dict(self._icon_dict))
+        return False
+
+    def _write(self, func, *args):
+        # A single writer thread keeps disk writes off the main loop and in order
+        if self._write_queue is None:
+            self._write_queue = queue.Queue()
+            threading.Thread(target=self._writer, daemon=True).start()
+        self._write_queue.put((func, args))
+
+    def _writer(self):
+        while True:
+            func, args = self._write_queue.get()
+            try:
+                func(*args)
+            except Exception as e:
+                logger.warning(f"[ICONS] Error writing icon cache: {e}")
+
+    @staticmethod
+    def _write_icon_dict(icon_dict: dict):
+        tmp_path = ICON_CACHE_FILE + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(icon_dict, f)
+        os.replace(tmp_path, ICON_CACHE_FILE)
+
+    @staticmethod
+    def _write_pixbuf(path: str, pixbuf):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        pixbuf.savev(tmp_path, "png", [], [])
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _prune_theme_dirs(current_dir: str):
+        if not os.path.isdir(PIXBUF_CACHE_DIR):
+            return
+        for name in os.listdir(PIXBUF_CACHE_DIR):
+            path = os.path.join(PIXBUF_CACHE_DIR, name)
+            if path != current_dir:
+                shutil.rmtree(path, ignore_errors=True)
 
     def _get_icon_from_desktop_file(self, desktop_file_path: str):
         # Retrieve the icon specified in the [Desktop Entry] section.
+        icon = self._desktop_icons.get(desktop_file_path)
+        if icon is not None:
+            return icon or self.default_applicaiton_icon
         with open(desktop_file_path) as f:
             for line in f.readlines():
                 if "Icon=" in line:
                     return "".join(line[5:].split())
             return self.default_applicaiton_icon
 
+    def _build_desktop_index(self):
+        """
+        Index desktop files by normalized basename, StartupWMClass and Icon,
+        both whole and split into tokens. Entries come from the shared
+        desktop catalog, in XDG order, so the first key wins.
+        """
+        catalog = get_desktop_catalog()
+        keys = {}
+        tokens = {}
+        icons = {}
+        for desktop_id, path, info in catalog.get_infos():
+            icon = info.get_string("Icon") or ""
+            icons[path] = "".join(icon.split())
+            names = [desktop_id[:-len(".desktop")] if desktop_id.endswith(".desktop") else desktop_id]
+            names.append(info.get_startup_wm_class() or "")
+            names.append(os.path.basename(icon) if icon else "")
+            for name in filter(None, names):
+                keys.setdefault(_normalize(name), path)
+                for token in _tokens(name):
+                    tokens.setdefault(token, path)
+
+        self._desktop_keys = keys
+        self._desktop_tokens = tokens
+        self._desktop_icons = icons
+        self._desktop_index_generation = catalog.generation
+
     def _get_desktop_file(self, app_id: str) -> str | None:
-        data_dirs = GLib.get_system_data_dirs()
-        for data_dir in data_dirs:
-            data_dir = os.path.join(data_dir, "applications")
-            if os.path.exists(data_dir):
-                files = os.listdir(data_dir)
-                matching = [s for s in files if "".join(app_id.lower().split()) in s.lower()]
-                if matching:
-                    return os.path.join(data_dir, matching[0])
-                for word in list(filter(None, re.split(r"-|\.|_|\s", app_id))):
-                    matching = [s for s in files if word.lower() in s.lower()]
-                    if matching:
-                        return os.path.join(data_dir, matching[0])
+        if self._desktop_index_generation != get_desktop_catalog().generation:
+            self._build_desktop_index()
+
+        path = self._desktop_keys.get(_normalize(app_id))
+        if path:
+            return path
+        for word in _tokens(app_id):
+            path = self._desktop_tokens.get(word)
+            if path:
+                return path
         return None
 
     def _compositor_find_icon(self, app_id: str):
@@ -0,0 +1,48 @@
+from array import array
+from typing import Optional, Tuple
+
+
+class RingBuffer:
+    """
+    Fixed-size history of float samples, stored in a single array('f').
+
+    Appending overwrites the oldest sample once the buffer is full, so
+    memory stays at 4 bytes per slot (about 7 KB for an hour at 2 s).
+    Reads return arrays or plain numbers and aggregate with builtins, so
+    no Python object is kept per sample.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = array('f', bytes(4 * capacity))
+        self._head = 0  # Next slot to write
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value: float):
+        self._data[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def latest(self) -> Optional[float]:
+        if not self._count:
+            return None
+        return self._data[self._head - 1]
+
+    def values(self, last: Optional[int] = None) -> array:
+        """The most recent `last` samples (all by default), oldest first."""
+        count = self._count if last is None else max(0, min(last, self._count))
+        start = self._head - count
+        if start >= 0:
+            return self._data[start:self._head]
+        return self._data[start:] + self._data[:self._head]
+
+    def stats(self, last: Optional[int] = None) -> Optional[Tuple[float, float, float]]:
+        """(min, avg, max) over the most recent `last` samples, or None if empty."""
+        window = self.values(last)
+        if not window:
+            return None
+        return min(window), sum(window) / len(window), max(window)
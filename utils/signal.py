@@ -0,0 +1,22 @@
+class Signal:
+    """Simple signal implementation for services that are not GObjects."""
+    
+    def __init__(self):
+        self._callbacks = []
+    
+    def connect(self, callback):
+        """Connect a callback to this signal."""
+        self._callbacks.append(callback)
+    
+    def disconnect(self, callback):
+        """Disconnect a callback connected to this signal."""
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+    
+    def emit(self, *args, **kwargs):
+        """Emit the signal to all connected callbacks."""
+        for callback in list(self._callbacks):
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                print(f"Error in signal callback: {e}")
@@ -0,0 +1,55 @@
+import gi
+
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gtk  # noqa: E402
+
+from utils.ring_buffer import RingBuffer  # noqa: E402
+
+
+class Sparkline(Gtk.DrawingArea):
+    """
+    Line graph of a RingBuffer, drawn as one cairo path in the CSS color.
+
+    When there are more samples than pixels, every nth sample is drawn, so
+    the cost of a redraw is bounded by the widget width.
+    """
+
+    def __init__(
+        self,
+        buffer: RingBuffer,
+        width: int = 120,
+        height: int = 28,
+        max_value: float | None = 100.0,
+        name: str = "sparkline",
+    ):
+        super().__init__(name=name)
+        self.buffer = buffer
+        # None scales the graph to the largest visible sample
+        self.max_value = max_value
+        self.set_size_request(width, height)
+        self.connect("draw", self.on_draw)
+
+    def on_draw(self, widget, cr):
+        samples = self.buffer.values()
+        if len(samples) < 2:
+            return False
+
+        width = self.get_allocated_width()
+        height = self.get_allocated_height()
+        step = max(1, len(samples) // max(1, width))
+        if step > 1:
+            samples = samples[::step]
+
+        top = self.max_value or max(samples) or 1.0
+        x_scale = width / (len(samples) - 1)
+        y_scale = (height - 2) / top
+
+        color = self.get_style_context().get_color(self.get_state_flags())
+        cr.set_source_rgba(color.red, color.green, color.blue, color.alpha)
+        cr.set_line_width(1.5)
+
+        cr.move_to(0, height - 1 - min(samples[0], top) * y_scale)
+        for i in range(1, len(samples)):
+            cr.line_to(i * x_scale, height - 1 - min(samples[i], top) * y_scale)
+        cr.stroke()
+        return False
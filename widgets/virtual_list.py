@@ -0,0 +1,235 @@
+from bisect import bisect_right
+from typing import Callable, Dict, List, Optional, Sequence
+
+from fabric.widgets.box import Box
+from gi.repository import GLib, Gtk
+
+
+class VirtualList(Box):
+    """
+    A vertical list that only builds row widgets for the visible area.
+
+    Rows come from a fixed pool sized to the scrolled window's page (plus
+    a few rows of overscan). On scroll or when the items change, pooled
+    rows are rebound to the items now in view, and two spacers stand in
+    for the rows above and below, so the scrollbar still reflects the full
+    list. Building and allocation cost stays bounded by what is on screen,
+    however many items there are.
+
+    `create_row(kind)` builds an empty row and `bind_row(row, item)` fills
+    it in. Before binding, the list sets `row.item` and `row.index`, which
+    row signal handlers can read instead of capturing the item. Items of
+    different `row_kind` get separate pools and separate row heights; each
+    kind's height is measured from its first allocated row.
+    """
+
+    def __init__(
+        self,
+        scrolled_window,
+        create_row: Callable[[str], Gtk.Widget],
+        bind_row: Callable[[Gtk.Widget, object], None],
+        row_kind: Callable[[object], str] = lambda item: "row",
+        row_height: int = 40,
+        overscan: int = 2,
+        placeholder: Optional[Gtk.Widget] = None,
+        spacing: int = 0,
+        **kwargs,
+    ):
+        super().__init__(orientation="v", spacing=spacing, **kwargs)
+        self.scrolled_window = scrolled_window
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.row_kind = row_kind
+        self.overscan = overscan
+        self._spacing = spacing
+        self._default_height = row_height
+
+        self.items: Sequence = []
+        self._kinds: List[str] = []
+        self._heights: Dict[str, int] = {}
+        # Top edge of every item, plus the total height as the last entry
+        self._offsets: List[int] = [0]
+
+        self._pool: Dict[str, List[Gtk.Widget]] = {}
+        # Item index -> row currently bound to it
+        self._bound: Dict[int, Gtk.Widget] = {}
+        self._selected = -1
+        self._relayout_id = None
+
+        self._top_spacer = self._make_spacer()
+        self._bottom_spacer = self._make_spacer()
+        self.add(self._top_spacer)
+        self.add(self._bottom_spacer)
+
+        self.placeholder = placeholder
+        if placeholder is not None:
+            placeholder.set_no_show_all(True)
+            placeholder.set_visible(False)
+            self.add(placeholder)
+
+        adjustment = scrolled_window.get_vadjustment()
+        adjustment.connect("value-changed", lambda *_: self._layout())
+        adjustment.connect("changed", lambda *_: self._layout())
+
+    def _make_spacer(self) -> Gtk.Widget:
+        spacer = Gtk.Box()
+        spacer.set_no_show_all(True)
+        spacer.set_visible(False)
+        return spacer
+
+    def _height(self, kind: str) -> int:
+        return self._heights.get(kind, self._default_height)
+
+    def _compute_offsets(self):
+        offsets = [0] * (len(self.items) + 1)
+        total = 0
+        stride = self._spacing
+        for i, kind in enumerate(self._kinds):
+            offsets[i] = total
+            total += self._height(kind) + stride
+        offsets[-1] = max(0, total - stride)
+        self._offsets = offsets
+
+    def set_items(self, items: Sequence):
+        """Show `items`, rebinding pooled rows to the ones in view."""
+        self.items = items
+        self._kinds = [self.row_kind(item) for item in items]
+        self._selected = -1
+        self._compute_offsets()
+        if self.placeholder is not None:
+            self.placeholder.set_visible(not items)
+        self._layout()
+
+    def _visible_range(self):
+        count = len(self.items)
+        if not count:
+            return 0, 0
+        adjustment = self.scrolled_window.get_vadjustment()
+        top = adjustment.get_value()
+        page = adjustment.get_page_size() or self.scrolled_window.get_allocated_height()
+        if page <= 1:
+            # Not allocated yet: fill a typical page
+            page = self._default_height * 12
+        first = max(0, bisect_right(self._offsets, top, 0, count) - 1 - self.overscan)
+        last = min(count, bisect_right(self._offsets, top + page, 0, count) + self.overscan)
+        return first, last
+
+    def _layout(self):
+        first, last = self._visible_range()
+        items = self.items
+
+        # Keep rows already showing an item in view, free the others
+        bound = {}
+        free: Dict[str, List[Gtk.Widget]] = {}
+        for index, row in self._bound.items():
+            if first <= index < last and row.item is items[index]:
+                bound[index] = row
+            else:
+                free.setdefault(row.kind, []).append(row)
+        used = set(map(id, self._bound.values()))
+        for kind, rows in self._pool.items():
+            free.setdefault(kind, []).extend(row for row in rows if id(row) not in used)
+
+        for index in range(first, last):
+            if index in bound:
+                continue
+            kind = self._kinds[index]
+            rows = free.get(kind)
+            row = rows.pop() if rows else self._new_row(kind)
+            row.item = items[index]
+            row.index = index
+            self.bind_row(row, items[index])
+            bound[index] = row
+
+        for rows in free.values():
+            for row in rows:
+                row.item = None
+                row.index = -1
+                row.set_visible(False)
+
+        # Rows stay in the box between the spacers, in item order
+        for position, index in enumerate(range(first, last), start=1):
+            row = bound[index]
+            self.reorder_child(row, position)
+            self._set_selected_class(row, index == self._selected)
+            row.set_visible(True)
+        self._bound = bound
+
+        spacing = self._spacing
+        top = self._offsets[first] - spacing if first > 0 else 0
+        bottom = self._offsets[-1] - self._offsets[last] if last < len(items) else 0
+        self._top_spacer.set_size_request(-1, max(0, top))
+        self._top_spacer.set_visible(top > 0)
+        self._bottom_spacer.set_size_request(-1, max(0, bottom))
+        self._bottom_spacer.set_visible(bottom > 0)
+
+    def _new_row(self, kind: str) -> Gtk.Widget:
+        row = self.create_row(kind)
+        row.kind = kind
+        row.item = None
+        row.index = -1
+        row.set_no_show_all(True)
+        row.connect("size-allocate", self._on_row_allocated)
+        self._pool.setdefault(kind, []).append(row)
+        self.add(row)
+        return row
+
+    def _on_row_allocated(self, row, allocation):
+        if row.item is None or allocation.height <= 1:
+            return
+        if self._heights.get(row.kind) != allocation.height:
+            self._heights[row.kind] = allocation.height
+            if self._relayout_id is None:
+                self._relayout_id = GLib.idle_add(self._relayout)
+
+    def _relayout(self):
+        self._relayout_id = None
+        self._compute_offsets()
+        self._layout()
+        return False
+
+    @staticmethod
+    def _set_selected_class(row, selected: bool):
+        context = row.get_style_context()
+        if selected:
+            context.add_class("selected")
+        else:
+            context.remove_class("selected")
+
+    def get_row(self, index: int) -> Optional[Gtk.Widget]:
+        """Row currently bound to item `index`, if it is in view."""
+        return self._bound.get(index)
+
+    def select(self, index: int):
+        """Mark item `index` as selected (-1 for none) and scroll it into view."""
+        previous = self._bound.get(self._selected)
+        if previous is not None:
+            self._set_selected_class(previous, False)
+        self._selected = index if 0 <= index < len(self.items) else -1
+        if self._selected == -1:
+            return
+        row = self._bound.get(self._selected)
+        if row is not None:
+            self._set_selected_class(row, True)
+        self.scroll_to(self._selected)
+
+    def scroll_to(self, index: int):
+        """Scroll so item `index` is fully visible."""
+        def scroll():
+            # The items may have changed since this was queued
+            if not 0 <= index < len(self._kinds):
+                return False
+            adj = self.scrolled_window.get_vadjustment()
+            y = self._offsets[index]
+            height = self._height(self._kinds[index])
+            page_size = adj.get_page_size()
+            current_value = adj.get_value()
+
+            if y < current_value:
+                adj.set_value(y)
+            elif y + height > current_value + page_size:
+                adj.set_value(y + height - page_size)
+            return False
+
+        if 0 <= index < len(self.items):
+            GLib.idle_add(scroll)